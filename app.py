@@ -2,29 +2,50 @@ import os
 import uvicorn
 from fastapi import FastAPI, File, UploadFile, Form, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from typing import List, Dict, Any, Optional
-import shutil
 from datetime import datetime
 
 # Import the shared logic
 from core.logic import (
     configure_ai,
-    read_requirement_file,
-    generate_test_cases,
+    agenerate_test_cases,
     configure_jira,
     create_jira_issues,
     configure_azure_devops,
     create_azure_devops_work_items,
     configure_github,
-    create_github_issues,
     configure_gitlab,
-    create_gitlab_issues,
+    acreate_github_issues,
+    acreate_gitlab_issues,
+    synced_ids,
     generate_traceability_matrix
 )
-from core.context_manager import get_context_manager
-from core.feature_analyzer import analyze_feature_gaps, export_analysis_report
-from core.export_manager import ExportManager
+from core.context_manager import get_context_manager, reused_test_data
+from core.feature_analyzer import aanalyze_feature_gaps
+from core.export_manager import (
+    ExportManager, STREAMABLE_FORMATS, BINARY_FORMATS, EXPORT_MEDIA_TYPES, EXPORT_EXTENSIONS, DEFAULT_BUNDLE_FORMATS
+)
+from core.cache import get_response_cache
+from core.concurrency import run_blocking
+from core.chunking import (
+    agenerate_test_cases_chunked,
+    agenerate_test_cases_from_segments,
+    astream_test_cases_chunked,
+    should_chunk
+)
+from core.document_cache import get_document_cache, iter_cached_segments
+from core.ingestion import (
+    SpooledUpload,
+    UploadTooLargeError,
+    get_max_upload_bytes,
+    get_upload_spool_max_bytes
+)
+from core.streaming import astream_test_cases, format_sse
+from core.job_queue import get_job_queue
+from core.singleflight import single_flight_stats
+from core.http_client import close_http_client
 
 # --- Pydantic Models for Request Bodies ---
 
@@ -73,6 +94,14 @@ class ExportRequest(BaseModel):
     test_cases: List[Dict[str, Any]]
     format: str = "json"
     output_path: Optional[str] = None
+    stream: Optional[bool] = False
+
+class ExportBundleRequest(BaseModel):
+    test_cases: List[Dict[str, Any]]
+    formats: List[str] = list(DEFAULT_BUNDLE_FORMATS)
+    requirement_text: Optional[str] = None
+    gap_analysis: Optional[Dict[str, Any]] = None
+    domain: Optional[str] = "Healthcare"
 
 class TextGenerationRequest(BaseModel):
     requirement_text: str
@@ -80,6 +109,9 @@ class TextGenerationRequest(BaseModel):
     include_traceability: Optional[bool] = False
     create_context: Optional[bool] = False
     analyze_gaps: Optional[bool] = False
+    chunked: Optional[bool] = True
+    max_parallel: Optional[int] = None
+    use_prior_contexts: Optional[bool] = True
 
 # --- FastAPI Application ---
 
@@ -98,29 +130,89 @@ app.add_middleware(
     allow_headers=["*"],  # Allows all headers
 )
 
-UPLOAD_FOLDER = 'uploads'
+@app.on_event("startup")
+async def start_job_workers():
+    await get_job_queue().start()
+
+@app.on_event("shutdown")
+async def stop_job_workers():
+    await get_job_queue().stop()
+    await close_http_client()
+    await run_blocking(get_context_manager().flush)
+
+UPLOAD_FOLDER = 'uploads'  # only used for uploads too large to keep in memory
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
+async def _receive_upload(upload: UploadFile) -> SpooledUpload:
+    """
+    Reads an upload into memory (spilling large files to a uniquely named temp file),
+    computing its digest and enforcing MAX_UPLOAD_BYTES as it goes. Caller must close it.
+    """
+    spooled = SpooledUpload(
+        upload.filename,
+        spool_max_bytes=get_upload_spool_max_bytes(),
+        max_bytes=get_max_upload_bytes(),
+        spool_dir=UPLOAD_FOLDER
+    )
+    try:
+        return await run_blocking(spooled.receive, upload.file)
+    except UploadTooLargeError as e:
+        spooled.close()
+        raise HTTPException(status_code=413, detail=str(e))
+    except Exception:
+        spooled.close()
+        raise
+
+def _read_cached_requirement(spooled: SpooledUpload) -> str:
+    """Reads an uploaded requirement's text, reusing the parsed-document cache (blocking)."""
+    return "\n".join(iter_cached_segments(spooled.source, spooled.digest, spooled.filename))
+
+async def _generate(requirement_text: str, domain: str, chunked: bool = True, max_parallel: Optional[int] = None,
+                    prior_contexts: Optional[List[Dict[str, Any]]] = None):
+    """Generates test cases, splitting large documents into concurrently generated chunks when enabled."""
+    if not chunked:
+        return await agenerate_test_cases(requirement_text, domain, prior_contexts=prior_contexts)
+    return await agenerate_test_cases_chunked(requirement_text, domain, max_parallel=max_parallel,
+                                              prior_contexts=prior_contexts)
+
+async def _retrieve_prior_work(requirement_text: str, domain: str, context_id: Optional[str] = None):
+    """
+    (match to reuse or None, similar prior contexts) for a requirement, excluding the request's
+    own new context. Retrieval problems only disable reuse; generation still proceeds.
+    """
+    try:
+        return await run_blocking(get_context_manager().retrieve_prior_work, requirement_text, domain,
+                                  (context_id,) if context_id else ())
+    except Exception as e:
+        print(f"Prior context retrieval failed: {e}")
+        return None, []
+
 @app.post("/api/generate")
-async def generate_api_from_file(domain: str = Form("healthcare software"), requirement_file: UploadFile = File(...)):
+async def generate_api_from_file(domain: str = Form("healthcare software"), requirement_file: UploadFile = File(...),
+                                 chunked: bool = Form(True), max_parallel: Optional[int] = Form(None)):
     """
     Receives a requirement file and domain, then generates test cases using AI.
     """
-    file_path = os.path.join(UPLOAD_FOLDER, requirement_file.filename)
+    spooled = await _receive_upload(requirement_file)
     try:
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(requirement_file.file, buffer)
         configure_ai()
-        requirement_text = read_requirement_file(file_path)
-        test_data = generate_test_cases(requirement_text, domain)
+        if chunked:
+            # Chunks are generated while the rest of the file is still being parsed
+            test_data = await agenerate_test_cases_from_segments(
+                iter_cached_segments(spooled.source, spooled.digest, spooled.filename),
+                domain,
+                max_parallel=max_parallel
+            )
+        else:
+            requirement_text = await run_blocking(_read_cached_requirement, spooled)
+            test_data = await _generate(requirement_text, domain, chunked, max_parallel)
         if "error" in test_data:
             raise HTTPException(status_code=500, detail=test_data["error"])
         return test_data
     except Exception as e:
         raise HTTPException(status_code=500, detail=f'An unexpected error occurred: {e}')
     finally:
-        if os.path.exists(file_path):
-            os.remove(file_path)
+        spooled.close()
 
 @app.post("/api/generate-from-text")
 async def generate_api_from_text(request: TextGenerationRequest):
@@ -135,27 +227,38 @@ async def generate_api_from_text(request: TextGenerationRequest):
         context_id = None
         if request.create_context:
             ctx_manager = get_context_manager()
-            context_id = ctx_manager.create_context(request.requirement_text, request.domain)
+            context_id = await run_blocking(ctx_manager.create_context, request.requirement_text, request.domain)
         
-        # Generate test cases
-        test_data = generate_test_cases(request.requirement_text, request.domain)
+        # Reuse the test cases of a near-identical prior requirement, or generate with similar ones as examples
+        match, prior_contexts = None, []
+        if request.use_prior_contexts:
+            match, prior_contexts = await _retrieve_prior_work(request.requirement_text, request.domain, context_id)
+        if match:
+            test_data = reused_test_data(match)
+        else:
+            test_data = await _generate(request.requirement_text, request.domain, request.chunked,
+                                        request.max_parallel, prior_contexts)
         if "error" in test_data:
             raise HTTPException(status_code=500, detail=test_data["error"])
         
+        if context_id and test_data.get('test_cases'):
+            ctx_manager = get_context_manager()
+            await run_blocking(ctx_manager.record_test_cases, context_id, test_data['test_cases'])
+        
         # Add traceability matrix if requested
         if request.include_traceability:
-            traceability = generate_traceability_matrix(request.requirement_text, test_data.get('test_cases', []))
+            traceability = await run_blocking(generate_traceability_matrix, request.requirement_text, test_data.get('test_cases', []))
             test_data['traceability_matrix'] = traceability
         
         # Analyze feature gaps if requested
         if request.analyze_gaps and test_data.get('test_cases'):
-            gaps = analyze_feature_gaps(request.requirement_text, test_data['test_cases'], request.domain)
+            gaps = await aanalyze_feature_gaps(request.requirement_text, test_data['test_cases'], request.domain)
             test_data['feature_gap_analysis'] = gaps
             
             # Store in context if context was created
             if context_id:
                 ctx_manager = get_context_manager()
-                ctx_manager.build_context(context_id, {"gap_analysis": gaps})
+                await run_blocking(ctx_manager.build_context, context_id, {"gap_analysis": gaps})
         
         # Add context ID to response if context was created
         if context_id:
@@ -167,6 +270,134 @@ async def generate_api_from_text(request: TextGenerationRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f'An unexpected error occurred: {e}')
 
+async def _stream_generation(requirement_text: str, domain: str, chunked: bool = True,
+                             max_parallel: Optional[int] = None, include_traceability: bool = False,
+                             analyze_gaps: bool = False, context_id: Optional[str] = None,
+                             use_prior_contexts: bool = False):
+    """
+    Yields Server-Sent Events: one 'test_case' event per test case as soon as it is parsed,
+    then optional 'traceability_matrix' / 'feature_gap_analysis' events, then 'done' (or 'error').
+    With use_prior_contexts, a near-identical prior requirement's test cases are replayed instead
+    of generating ('done' then carries reused_from).
+    """
+    test_cases = []
+    reused_from = None
+    try:
+        match, prior_contexts = None, []
+        if use_prior_contexts:
+            match, prior_contexts = await _retrieve_prior_work(requirement_text, domain, context_id)
+        if match:
+            reused = reused_test_data(match)
+            reused_from = reused["reused_from"]
+            for test_case in reused["test_cases"]:
+                test_cases.append(test_case)
+                yield format_sse("test_case", test_case)
+        else:
+            if chunked and should_chunk(requirement_text):
+                stream = astream_test_cases_chunked(requirement_text, domain, max_parallel=max_parallel,
+                                                    prior_contexts=prior_contexts)
+            else:
+                stream = astream_test_cases(requirement_text, domain, prior_contexts=prior_contexts)
+            async for test_case in stream:
+                test_cases.append(test_case)
+                yield format_sse("test_case", test_case)
+        
+        if context_id and test_cases:
+            ctx_manager = get_context_manager()
+            await run_blocking(ctx_manager.record_test_cases, context_id, test_cases)
+        
+        if include_traceability:
+            yield format_sse("traceability_matrix", await run_blocking(generate_traceability_matrix, requirement_text, test_cases))
+        
+        if analyze_gaps and test_cases:
+            gaps = await aanalyze_feature_gaps(requirement_text, test_cases, domain)
+            yield format_sse("feature_gap_analysis", gaps)
+            if context_id:
+                ctx_manager = get_context_manager()
+                await run_blocking(ctx_manager.build_context, context_id, {"gap_analysis": gaps})
+        
+        yield format_sse("done", {"total": len(test_cases), "context_id": context_id, "reused_from": reused_from})
+    except Exception as e:
+        yield format_sse("error", {"detail": f'An unexpected error occurred: {e}'})
+
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+@app.post("/api/generate/stream")
+async def generate_stream_from_file(domain: str = Form("healthcare software"), requirement_file: UploadFile = File(...),
+                                    chunked: bool = Form(True), max_parallel: Optional[int] = Form(None)):
+    """
+    Streaming variant of /api/generate: test cases are pushed as Server-Sent Events as they are generated.
+    """
+    spooled = await _receive_upload(requirement_file)
+    try:
+        configure_ai()
+        requirement_text = await run_blocking(_read_cached_requirement, spooled)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f'An unexpected error occurred: {e}')
+    finally:
+        spooled.close()
+    
+    return StreamingResponse(
+        _stream_generation(requirement_text, domain, chunked, max_parallel),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
+
+@app.post("/api/generate-from-text/stream")
+async def generate_stream_from_text(request: TextGenerationRequest):
+    """
+    Streaming variant of /api/generate-from-text: test cases are pushed as Server-Sent Events
+    as they are generated, followed by the optional traceability matrix and gap analysis.
+    """
+    try:
+        configure_ai()
+        context_id = None
+        if request.create_context:
+            ctx_manager = get_context_manager()
+            context_id = await run_blocking(ctx_manager.create_context, request.requirement_text, request.domain)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f'An unexpected error occurred: {e}')
+    
+    return StreamingResponse(
+        _stream_generation(
+            request.requirement_text,
+            request.domain,
+            request.chunked,
+            request.max_parallel,
+            include_traceability=request.include_traceability,
+            analyze_gaps=request.analyze_gaps,
+            context_id=context_id,
+            use_prior_contexts=request.use_prior_contexts
+        ),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
+
+@app.post("/api/jobs", status_code=202)
+async def submit_generation_job(request: TextGenerationRequest):
+    """
+    Queues a generation job (test cases, optional traceability and gap analysis) and returns its ID at once.
+    Poll GET /api/jobs/{job_id} for status and partial results.
+    """
+    try:
+        job_id = await get_job_queue().submit(request.dict())
+        return {"job_id": job_id, "status": "queued"}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/api/jobs/{job_id}")
+async def get_generation_job(job_id: str):
+    """Returns the status, current step and (partial) results of a generation job."""
+    try:
+        job = await get_job_queue().get(job_id)
+        if not job:
+            raise HTTPException(status_code=404, detail="Job not found")
+        return job
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.post("/api/jira")
 async def jira_api(request_data: JiraRequest):
     """
@@ -174,12 +405,10 @@ async def jira_api(request_data: JiraRequest):
     """
     try:
         creds = request_data.credentials
-        gherkin_texts = [tc['gherkin_feature'] for tc in request_data.test_cases]
-        full_gherkin_output = "\n\n".join(gherkin_texts)
-        if not full_gherkin_output.strip():
+        if not any(tc.get('gherkin_feature', '').strip() for tc in request_data.test_cases):
             raise HTTPException(status_code=400, detail="No Gherkin content found to create issues from")
-        jira_client = configure_jira(server=creds.server, user=creds.user, api_token=creds.api_token)
-        created_issues = create_jira_issues(jira_client, full_gherkin_output, project_key=creds.project_key)
+        jira_client = await run_blocking(configure_jira, server=creds.server, user=creds.user, api_token=creds.api_token)
+        created_issues = await run_blocking(create_jira_issues, jira_client, request_data.test_cases, project_key=creds.project_key)
         return {"message": "Jira issues created successfully", "issues": created_issues}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -191,13 +420,12 @@ async def azure_devops_api(request_data: AzureDevOpsRequest):
     """
     try:
         creds = request_data.credentials
-        gherkin_texts = [tc['gherkin_feature'] for tc in request_data.test_cases]
-        full_gherkin_output = "\n\n".join(gherkin_texts)
-        if not full_gherkin_output.strip():
+        if not any(tc.get('gherkin_feature', '').strip() for tc in request_data.test_cases):
             raise HTTPException(status_code=400, detail="No Gherkin content found to create work items from")
         connection = configure_azure_devops(organization=creds.organization, personal_access_token=creds.personal_access_token)
-        created_items = create_azure_devops_work_items(connection, full_gherkin_output, project=creds.project)
-        return {"message": "Azure DevOps work items created successfully", "items": created_items}
+        results = await run_blocking(create_azure_devops_work_items, connection, request_data.test_cases, project=creds.project)
+        created_items = synced_ids(results)
+        return {"message": "Azure DevOps work items created successfully", "items": created_items, "results": results}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -211,21 +439,23 @@ async def github_api(request_data: GitHubRequest):
         if not request_data.test_cases:
             raise HTTPException(status_code=400, detail="No test cases provided")
         github_config = configure_github(token=creds.token)
-        created_items = create_github_issues(
+        results = await acreate_github_issues(
             github_config, 
             request_data.test_cases, 
             owner=creds.owner, 
             repo=creds.repo
         )
+        created_items = synced_ids(results, "number")
         
         if len(created_items) == 0:
             return {
                 "message": "No issues were created due to errors. Check server logs for details.",
                 "issues": [],
+                "results": results,
                 "error": "All issue creations failed. Likely token permission issue. See troubleshooting guide."
             }
         
-        return {"message": "GitHub issues created successfully", "issues": created_items}
+        return {"message": "GitHub issues created successfully", "issues": created_items, "results": results}
     except HTTPException:
         raise
     except Exception as e:
@@ -241,12 +471,13 @@ async def gitlab_api(request_data: GitLabRequest):
         if not request_data.test_cases:
             raise HTTPException(status_code=400, detail="No test cases provided")
         gitlab_config = configure_gitlab(url=creds.url, token=creds.token)
-        created_items = create_gitlab_issues(
+        results = await acreate_gitlab_issues(
             gitlab_config, 
             request_data.test_cases, 
             project_id=creds.project_id
         )
-        return {"message": "GitLab issues created successfully", "issues": created_items}
+        created_items = synced_ids(results, "iid")
+        return {"message": "GitLab issues created successfully", "issues": created_items, "results": results}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -271,6 +502,18 @@ async def health_check():
         ]
     }
 
+@app.get("/api/metrics")
+async def metrics():
+    """Cache and runtime counters for monitoring."""
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "response_cache": get_response_cache().stats(),
+        "job_queue": get_job_queue().stats(),
+        "coalesced_requests": single_flight_stats(),
+        "document_cache": get_document_cache().stats(),
+        "context_cache": get_context_manager().cache_stats()
+    }
+
 @app.post("/api/feedback")
 async def submit_feedback(request: FeedbackRequest):
     """
@@ -279,7 +522,7 @@ async def submit_feedback(request: FeedbackRequest):
     """
     try:
         ctx_manager = get_context_manager()
-        updated_context = ctx_manager.add_feedback(request.context_id, request.feedback)
+        updated_context = await run_blocking(ctx_manager.add_feedback, request.context_id, request.feedback)
         return {
             "message": "Feedback submitted successfully",
             "context_id": request.context_id,
@@ -292,17 +535,46 @@ async def submit_feedback(request: FeedbackRequest):
 async def analyze_gaps(requirement_text: str, test_cases: List[Dict[str, Any]], domain: str = "Healthcare"):
     """Standalone feature gap analysis endpoint."""
     try:
-        analysis = analyze_feature_gaps(requirement_text, test_cases, domain)
+        analysis = await aanalyze_feature_gaps(requirement_text, test_cases, domain)
         return analysis
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+def _attachment_headers(format: str) -> Dict[str, str]:
+    return {"Content-Disposition": f'attachment; filename="test_cases.{EXPORT_EXTENSIONS[format]}"'}
+
 @app.post("/api/export")
 async def export_test_cases(request: ExportRequest):
-    """Export test cases in multiple formats."""
+    """
+    Export test cases in multiple formats.
+    With stream=true the file itself is streamed as the response body, written test case by
+    test case (json, gherkin, xml) instead of being wrapped in a JSON envelope.
+    Binary formats (docx) without output_path are rendered in memory and always streamed.
+    """
+    if request.format in BINARY_FORMATS and not request.output_path:
+        try:
+            buffer = await run_blocking(ExportManager().render, request.test_cases, request.format)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+        return StreamingResponse(
+            iter(lambda: buffer.read(EXPORT_CHUNK_BYTES), b""),
+            media_type=EXPORT_MEDIA_TYPES[request.format],
+            headers=_attachment_headers(request.format)
+        )
+    if request.stream and not request.output_path:
+        if request.format not in STREAMABLE_FORMATS:
+            raise HTTPException(status_code=400, detail=f"Format {request.format} cannot be streamed. Streamable: {list(STREAMABLE_FORMATS)}")
+        # Starlette iterates the synchronous writer on its thread pool
+        return StreamingResponse(
+            ExportManager().iter_export(request.test_cases, request.format),
+            media_type=EXPORT_MEDIA_TYPES[request.format],
+            headers=_attachment_headers(request.format)
+        )
     try:
         export_mgr = ExportManager()
-        result = export_mgr.export(request.test_cases, request.format, request.output_path)
+        result = await run_blocking(export_mgr.export, request.test_cases, request.format, request.output_path)
         return {
             "message": "Export completed successfully",
             "format": request.format,
@@ -312,22 +584,55 @@ async def export_test_cases(request: ExportRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/export/bundle")
+async def export_bundle(request: ExportBundleRequest):
+    """
+    Export several formats at once as one ZIP download, rendered concurrently.
+    The gap report uses gap_analysis if given, otherwise it is analyzed from requirement_text.
+    """
+    gap_analysis = request.gap_analysis
+    if "gap_analysis" in request.formats and gap_analysis is None and request.requirement_text:
+        gap_analysis = await aanalyze_feature_gaps(request.requirement_text, request.test_cases, request.domain)
+    try:
+        buffer = await run_blocking(
+            ExportManager().export_bundle, request.test_cases, request.formats,
+            requirement_text=request.requirement_text, gap_analysis=gap_analysis
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return StreamingResponse(
+        iter(lambda: buffer.read(EXPORT_CHUNK_BYTES), b""),
+        media_type="application/zip",
+        headers={"Content-Disposition": 'attachment; filename="export_bundle.zip"'}
+    )
+
 @app.get("/api/contexts")
-async def list_contexts():
-    """List all stored contexts."""
+async def list_contexts(domain: Optional[str] = None, created_after: Optional[str] = None,
+                        created_before: Optional[str] = None, limit: Optional[int] = None, offset: int = 0):
+    """
+    List stored contexts, newest first. Filter by domain and an ISO-8601 created_at range
+    (created_after/created_before), and page with limit/offset. total counts all matches.
+    """
     try:
         ctx_manager = get_context_manager()
-        contexts = ctx_manager.list_contexts()
-        return {"contexts": contexts, "total": len(contexts)}
+        filters = {"domain": domain, "created_after": created_after, "created_before": created_before}
+        contexts = await run_blocking(ctx_manager.list_contexts, limit=limit, offset=offset, **filters)
+        total = await run_blocking(ctx_manager.count_contexts, **filters)
+        return {"contexts": contexts, "total": total, "limit": limit, "offset": offset}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/context/{context_id}")
-async def get_context(context_id: str):
-    """Retrieve a specific context."""
+async def get_context(context_id: str, version: Optional[int] = None):
+    """Retrieve a specific context, optionally as it was at an earlier version."""
     try:
         ctx_manager = get_context_manager()
-        context = ctx_manager.get_context(context_id)
+        try:
+            context = await run_blocking(ctx_manager.get_context, context_id, version=version)
+        except ValueError as e:
+            raise HTTPException(status_code=404, detail=str(e))
         if not context:
             raise HTTPException(status_code=404, detail="Context not found")
         return context
@@ -17,45 +17,76 @@ chrome.contextMenus.onClicked.addListener((info, tab) => {
   if (info.menuItemId === "generate-test-cases" && info.selectionText) {
     const requirementText = info.selectionText;
 
-    // Define the API endpoint
-    const apiUrl = 'https://ai-testcase-generator-583h.onrender.com/api/generate-from-text';
-
-    // Make the API call to the backend
-    fetch(apiUrl, {
-      method: 'POST',
-      headers: {
-        'Content-Type': 'application/json',
-      },
-      body: JSON.stringify({ 
-        requirement_text: requirementText,
-        domain: 'General' // Using a generic domain for the extension
-      }),
-    })
-    .then(response => {
-      if (!response.ok) {
-        throw new Error(`HTTP error! status: ${response.status}`);
-      }
-      return response.json();
-    })
-    .then(data => {
-      if (data.error) {
-        throw new Error(data.error);
+    // Define the streaming API endpoint (Server-Sent Events, one event per test case)
+    const apiUrl = 'https://ai-testcase-generator-583h.onrender.com/api/generate-from-text/stream';
+
+    // Open the results tab right away and append each test case as it arrives
+    openResultsTab(async (tabId) => {
+      let count = 0;
+      try {
+        const response = await fetch(apiUrl, {
+          method: 'POST',
+          headers: {
+            'Content-Type': 'application/json',
+          },
+          body: JSON.stringify({ 
+            requirement_text: requirementText,
+            domain: 'General' // Using a generic domain for the extension
+          }),
+        });
+        if (!response.ok) {
+          throw new Error(`HTTP error! status: ${response.status}`);
+        }
+
+        await readEventStream(response, (eventName, data) => {
+          if (eventName === 'test_case') {
+            count += 1;
+            appendToResults(tabId, formatTestCaseCard(data));
+          } else if (eventName === 'error') {
+            throw new Error(data.detail);
+          }
+        });
+
+        setResultsStatus(tabId, count > 0 ? `${count} test case(s) generated.` : 'No test cases were generated.');
+      } catch (error) {
+        console.error('Error generating test cases:', error);
+        setResultsStatus(tabId, `Error: ${error.message}`);
       }
-      // Format the results into a simple HTML string
-      const resultsHtml = formatResultsToHtml(data.test_cases);
-      displayResultsInNewTab(resultsHtml);
-    })
-    .catch(error => {
-      console.error('Error generating test cases:', error);
-      const errorHtml = `<h1>Error</h1><p>${error.message}</p>`;
-      displayResultsInNewTab(errorHtml);
     });
   }
 });
 
-// Helper function to format the JSON data into an HTML string
-function formatResultsToHtml(testCases) {
-  let html = `
+// Helper function to read a Server-Sent Events response, calling onEvent(eventName, data) per event
+async function readEventStream(response, onEvent) {
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+
+    let boundary = buffer.indexOf('\n\n');
+    while (boundary !== -1) {
+      const rawEvent = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+      boundary = buffer.indexOf('\n\n');
+
+      let eventName = 'message';
+      let data = '';
+      rawEvent.split('\n').forEach(line => {
+        if (line.startsWith('event:')) eventName = line.substring(6).trim();
+        else if (line.startsWith('data:')) data += line.substring(5).trim();
+      });
+      if (data) onEvent(eventName, JSON.parse(data));
+    }
+  }
+}
+
+// Helper function that returns the page skeleton test case cards are appended to
+function resultsPageHtml() {
+  return `
     <style>
       body { font-family: sans-serif; line-height: 1.6; padding: 2em; background-color: #f4f6f8; }
       .card { background-color: white; border: 1px solid #ddd; border-radius: 8px; margin-bottom: 1.5em; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }
@@ -66,41 +97,61 @@ function formatResultsToHtml(testCases) {
       .chip { display: inline-block; background-color: #e0e0e0; padding: 0.4em 0.8em; border-radius: 16px; margin-right: 0.5em; font-size: 0.9em; }
     </style>
     <h1>Generated Test Cases</h1>
+    <p id="status">Generating test cases…</p>
+    <div id="results"></div>
   `;
+}
 
-  if (!testCases || testCases.length === 0) {
-    return html + '<p>No test cases were generated.</p>';
-  }
-
-  testCases.forEach(test => {
-    html += `
+// Helper function to format a single test case into an HTML card
+function formatTestCaseCard(test) {
+  const tags = test.compliance_tags || [];
+  return `
       <div class="card">
-        <div class="header">Test ID: ${test.test_id}</div>
+        <div class="header">Test ID: ${escapeHtml(String(test.test_id))}</div>
         <div class="content">
-          <p><strong>Source:</strong> ${test.requirement_source}</p>
-          <pre><code>${escapeHtml(test.gherkin_feature)}</code></pre>
+          <p><strong>Source:</strong> ${escapeHtml(test.requirement_source || '')}</p>
+          <pre><code>${escapeHtml(test.gherkin_feature || '')}</code></pre>
         </div>
         <div class="tags">
           <strong>Compliance Tags:</strong> 
-          ${test.compliance_tags.length > 0 ? test.compliance_tags.map(tag => `<span class="chip">${tag}</span>`).join('') : 'None'}
+          ${tags.length > 0 ? tags.map(tag => `<span class="chip">${escapeHtml(tag)}</span>`).join('') : 'None'}
         </div>
       </div>
     `;
-  });
-
-  return html;
 }
 
-// Helper function to open a new tab and inject the HTML content
-function displayResultsInNewTab(htmlContent) {
+// Helper function to open a new tab with the results skeleton, then hand its id to the callback
+function openResultsTab(callback) {
   chrome.tabs.create({ url: "about:blank" }, (newTab) => {
     chrome.scripting.executeScript({
       target: { tabId: newTab.id },
       func: (content) => {
         document.body.innerHTML = content;
       },
-      args: [htmlContent]
-    });
+      args: [resultsPageHtml()]
+    }, () => callback(newTab.id));
+  });
+}
+
+// Helper function to append HTML to the results container of an open results tab
+function appendToResults(tabId, htmlContent) {
+  chrome.scripting.executeScript({
+    target: { tabId: tabId },
+    func: (content) => {
+      document.getElementById('results').insertAdjacentHTML('beforeend', content);
+    },
+    args: [htmlContent]
+  });
+}
+
+// Helper function to update the status line of an open results tab
+function setResultsStatus(tabId, message) {
+  chrome.scripting.executeScript({
+    target: { tabId: tabId },
+    func: (text) => {
+      document.getElementById('status').textContent = text;
+    },
+    args: [message]
   });
 }
 
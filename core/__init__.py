@@ -7,6 +7,7 @@ from .logic import (
     configure_ai,
     read_requirement_file,
     generate_test_cases,
+    agenerate_test_cases,
     configure_jira,
     create_jira_issues,
     configure_azure_devops,
@@ -15,6 +16,8 @@ from .logic import (
     create_github_issues,
     configure_gitlab,
     create_gitlab_issues,
+    acreate_github_issues,
+    acreate_gitlab_issues,
     generate_traceability_matrix
 )
 
@@ -23,28 +26,143 @@ from .context_manager import (
     get_context_manager
 )
 
+from .context_store import (
+    ContextStore,
+    JSONContextStore,
+    SQLiteContextStore,
+    context_at_version,
+    migrate_json_contexts
+)
+
 from .feature_analyzer import (
     analyze_feature_gaps,
+    aanalyze_feature_gaps,
     export_analysis_report
 )
 
-from .export_manager import ExportManager
+from .export_manager import ExportManager, BUNDLE_MEMBERS, DEFAULT_BUNDLE_FORMATS
+
+from .cache import (
+    ResponseCache,
+    get_response_cache
+)
+
+from .concurrency import run_blocking
+
+from .chunking import (
+    split_requirement_document,
+    pack_segments,
+    agenerate_test_cases_chunked,
+    agenerate_test_cases_from_segments,
+    astream_test_cases_chunked,
+    generate_test_cases_chunked
+)
+
+from .ingestion import iter_requirement_segments
+
+from .document_cache import (
+    DocumentCache,
+    get_document_cache
+)
+
+from .streaming import (
+    TestCaseStreamParser,
+    astream_test_cases
+)
+
+from .singleflight import (
+    SingleFlight,
+    get_single_flight
+)
+
+from .job_queue import (
+    JobQueue,
+    JobStore,
+    get_job_queue
+)
+
+from .gherkin import (
+    Feature,
+    Scenario,
+    parse_gherkin,
+    iter_scenarios
+)
+
+from .sync_ledger import (
+    SyncLedger,
+    get_sync_ledger
+)
+
+from .http_client import (
+    AdaptiveThrottle,
+    get_http_client
+)
+
+from .retrieval import BM25Index
+
+from .traceability import (
+    TraceabilityIndex,
+    segment_requirements,
+    build_traceability_matrix
+)
 
 __all__ = [
     "configure_ai",
     "read_requirement_file",
     "generate_test_cases",
+    "agenerate_test_cases",
     "configure_jira",
     "create_jira_issues",
     "configure_azure_devops",
     "create_azure_devops_work_items",
+    "acreate_github_issues",
+    "acreate_gitlab_issues",
     "configure_polarion",
     "create_polarion_test_cases",
     "generate_traceability_matrix",
     "ContextManager",
     "get_context_manager",
+    "ContextStore",
+    "JSONContextStore",
+    "SQLiteContextStore",
+    "context_at_version",
+    "migrate_json_contexts",
     "analyze_feature_gaps",
+    "aanalyze_feature_gaps",
     "export_analysis_report",
-    "ExportManager"
+    "ExportManager",
+    "BUNDLE_MEMBERS",
+    "DEFAULT_BUNDLE_FORMATS",
+    "ResponseCache",
+    "get_response_cache",
+    "run_blocking",
+    "split_requirement_document",
+    "pack_segments",
+    "agenerate_test_cases_chunked",
+    "agenerate_test_cases_from_segments",
+    "astream_test_cases_chunked",
+    "generate_test_cases_chunked",
+    "iter_requirement_segments",
+    "DocumentCache",
+    "get_document_cache",
+    "TestCaseStreamParser",
+    "astream_test_cases",
+    "JobQueue",
+    "JobStore",
+    "get_job_queue",
+    "SingleFlight",
+    "get_single_flight",
+    "Feature",
+    "Scenario",
+    "parse_gherkin",
+    "iter_scenarios",
+    "SyncLedger",
+    "get_sync_ledger",
+    "AdaptiveThrottle",
+    "get_http_client",
+    "BM25Index",
+    "TraceabilityIndex",
+    "segment_requirements",
+    "build_traceability_matrix"
 ]
 
@@ -0,0 +1,272 @@
+"""
+Response Cache Module
+Content-addressed caching of AI responses so repeated generations skip the LLM call.
+Provides a bounded in-process LRU tier and an optional SQLite tier that survives restarts.
+"""
+
+import os
+import copy
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text for hashing so whitespace-only differences map to the same key."""
+    return " ".join((text or "").split())
+
+
+def make_cache_key(*parts: Any) -> str:
+    """Build a content-addressed key from the given parts (SHA-256 of their JSON form)."""
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate memory footprint of JSON-like data in bytes (string lengths plus a small per-item overhead)."""
+    if isinstance(value, str):
+        return len(value) + 16
+    if isinstance(value, dict):
+        return 64 + sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return 56 + sum(estimate_size(item) for item in value)
+    return 16
+
+
+class LRUCache:
+    """
+    Thread-safe in-memory LRU cache with optional TTL expiry.
+    Bounded by entry count and, when max_bytes is set, by the total size of the values
+    as measured by sizeof. Tracks hit/miss/eviction counters for monitoring.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: Optional[float] = None,
+                 max_bytes: Optional[int] = None, sizeof: Callable[[Any], int] = estimate_size):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self._entries = OrderedDict()  # key -> (stored_at, value, size)
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            stored_at, value, size = entry
+            if self.ttl_seconds is not None and time.time() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self._total_bytes -= size
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: Any, stored_at: Optional[float] = None):
+        """
+        Store a value, evicting least recently used entries beyond max_entries or max_bytes.
+        A value larger than max_bytes on its own is not kept.
+        """
+        size = self.sizeof(value) if self.max_bytes is not None else 0
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._total_bytes -= previous[2]
+            self._entries[key] = (stored_at or time.time(), value, size)
+            self._total_bytes += size
+            while self._entries and (
+                len(self._entries) > self.max_entries
+                or (self.max_bytes is not None and self._total_bytes > self.max_bytes)
+            ):
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self._total_bytes -= evicted_size
+                self.evictions += 1
+
+    def delete(self, key: str):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._total_bytes -= entry[2]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "bytes": self._total_bytes if self.max_bytes is not None else None,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations
+        }
+
+
+class SQLiteCacheTier:
+    """Persistent cache tier backed by a single SQLite file."""
+
+    def __init__(self, db_path: str, ttl_seconds: Optional[float] = None):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache_entries ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str):
+        """Return (stored_at, value) or None if missing or expired."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, stored_at FROM cache_entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, stored_at = row
+            if self.ttl_seconds is not None and time.time() - stored_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+        return stored_at, json.loads(value)
+
+    def set(self, key: str, value: Any, stored_at: Optional[float] = None):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache_entries (key, value, stored_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value), stored_at or time.time())
+            )
+            self._conn.commit()
+
+    def delete(self, key: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM cache_entries")
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0]
+
+
+class ResponseCache:
+    """
+    Two-tier cache for AI responses.
+    Lookups hit the in-memory LRU first, then the optional SQLite tier,
+    promoting disk hits back into memory. Values are copied on the way in and out
+    so callers can freely mutate the results they get back.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: Optional[float] = None,
+                 disk_path: Optional[str] = None):
+        self.memory = LRUCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+        self.disk = SQLiteCacheTier(disk_path, ttl_seconds=ttl_seconds) if disk_path else None
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self.memory.get(key)
+        if value is not None:
+            self._count(hit=True)
+            return copy.deepcopy(value)
+
+        if self.disk is not None:
+            entry = self.disk.get(key)
+            if entry is not None:
+                stored_at, value = entry
+                self.memory.set(key, value, stored_at=stored_at)
+                self._count(hit=True, disk=True)
+                return copy.deepcopy(value)
+
+        self._count(hit=False)
+        return None
+
+    def set(self, key: str, value: Any):
+        stored_at = time.time()
+        self.memory.set(key, copy.deepcopy(value), stored_at=stored_at)
+        if self.disk is not None:
+            self.disk.set(key, value, stored_at=stored_at)
+
+    def delete(self, key: str):
+        self.memory.delete(key)
+        if self.disk is not None:
+            self.disk.delete(key)
+
+    def clear(self):
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "disk_hits": self.disk_hits,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "memory": self.memory.stats(),
+            "disk_entries": len(self.disk) if self.disk is not None else None
+        }
+
+    def _count(self, hit: bool, disk: bool = False):
+        with self._lock:
+            if hit:
+                self.hits += 1
+                if disk:
+                    self.disk_hits += 1
+            else:
+                self.misses += 1
+
+
+# Global response cache instance
+_response_cache = None
+
+def get_response_cache() -> ResponseCache:
+    """
+    Factory function to get the global response cache, configured from environment variables:
+    RESPONSE_CACHE_SIZE (entries), RESPONSE_CACHE_TTL (seconds, 0 disables expiry)
+    and RESPONSE_CACHE_PATH (SQLite file; unset keeps the cache in memory only).
+    """
+    global _response_cache
+    if _response_cache is None:
+        ttl = float(os.environ.get("RESPONSE_CACHE_TTL", 24 * 60 * 60))
+        _response_cache = ResponseCache(
+            max_entries=int(os.environ.get("RESPONSE_CACHE_SIZE", 256)),
+            ttl_seconds=ttl or None,
+            disk_path=os.environ.get("RESPONSE_CACHE_PATH") or None
+        )
+    return _response_cache
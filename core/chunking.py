@@ -0,0 +1,333 @@
+"""
+Chunked Generation Module
+Map-reduce test case generation for large requirement documents.
+Splits a document on its structure (headings, numbered requirements, XML elements),
+generates test cases for each chunk concurrently, then merges and renumbers the results.
+"""
+
+import os
+import re
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, AsyncIterator, Iterable, Iterator, Optional, Tuple
+
+from .logic import generate_test_cases, agenerate_test_cases
+from .concurrency import run_blocking
+from .gherkin import Scenario, parse_gherkin
+
+# Lines that start a new requirement section
+_SECTION_BOUNDARY = re.compile(
+    r"^\s*("
+    r"#{1,6}\s+\S"                               # Markdown headings
+    r"|(?i:section|chapter|article)\s+\d+"        # "Section 4", "Chapter 2"
+    r"|\d+(?:\.\d+)*[.)]?\s+[A-Z]"               # "3.1 Login", "4) Audit trail"
+    r"|[A-Z]{2,}[-_]\d+\b"                       # "REQ-001", "FR_12"
+    r"|<[A-Za-z][\w:.-]*[\s>]"                   # Raw XML elements
+    r"|[A-Z][A-Z0-9 /&-]{3,}:?\s*$"              # ALL CAPS HEADINGS
+    r")"
+)
+
+
+def get_chunk_max_chars() -> int:
+    """Maximum characters per chunk, configured with GENERATION_CHUNK_CHARS."""
+    return int(os.environ.get("GENERATION_CHUNK_CHARS", 12000))
+
+
+def get_max_parallel() -> int:
+    """Maximum concurrent chunk generations, configured with GENERATION_MAX_PARALLEL."""
+    return int(os.environ.get("GENERATION_MAX_PARALLEL", 4))
+
+
+def should_chunk(requirement_text: str, max_chars: Optional[int] = None) -> bool:
+    """Whether a document is large enough to need chunked generation."""
+    return len(requirement_text or "") > (max_chars or get_chunk_max_chars())
+
+
+def split_requirement_document(requirement_text: str, max_chars: Optional[int] = None) -> List[str]:
+    """
+    Split a requirement document into chunks of at most max_chars, on structural boundaries.
+
+    Sections start at headings, numbered requirements or XML element lines and are packed
+    greedily into chunks. Sections that are too large on their own are split on blank lines,
+    then on lines, and only as a last resort mid-line.
+
+    Args:
+        requirement_text: The full requirement document text
+        max_chars: Chunk size limit (defaults to GENERATION_CHUNK_CHARS)
+
+    Returns:
+        List of non-empty chunk strings in document order
+    """
+    max_chars = max_chars or get_chunk_max_chars()
+    text = (requirement_text or "").strip()
+    if not text:
+        return []
+    if len(text) <= max_chars:
+        return [text]
+
+    sections = []
+    current = []
+    for line in text.splitlines():
+        if current and _SECTION_BOUNDARY.match(line):
+            sections.append("\n".join(current))
+            current = []
+        current.append(line)
+    if current:
+        sections.append("\n".join(current))
+
+    pieces = []
+    for section in sections:
+        pieces.extend(_split_oversized(section, max_chars))
+
+    chunks = []
+    buffer = ""
+    for piece in pieces:
+        if not piece.strip():
+            continue
+        if buffer and len(buffer) + len(piece) + 1 > max_chars:
+            chunks.append(buffer.strip())
+            buffer = ""
+        buffer = f"{buffer}\n{piece}" if buffer else piece
+    if buffer.strip():
+        chunks.append(buffer.strip())
+    return chunks
+
+
+def pack_segments(segments: Iterable[str], max_chars: Optional[int] = None) -> Iterator[str]:
+    """
+    Pack a stream of text segments (e.g. from iter_requirement_segments) into chunks,
+    yielding each chunk as soon as it is full so generation can start before parsing ends.
+    """
+    max_chars = max_chars or get_chunk_max_chars()
+    buffer = ""
+    for segment in segments:
+        buffer = f"{buffer}\n{segment}" if buffer else segment
+        if len(buffer) > max_chars:
+            pieces = split_requirement_document(buffer, max_chars)
+            # The last piece may continue in the next segment, so keep it buffered
+            yield from pieces[:-1]
+            buffer = pieces[-1] if pieces else ""
+    if buffer.strip():
+        yield from split_requirement_document(buffer, max_chars)
+
+
+def _split_oversized(section: str, max_chars: int) -> List[str]:
+    """Break a single section into pieces no longer than max_chars."""
+    if len(section) <= max_chars:
+        return [section]
+
+    for separator in ("\n\n", "\n"):
+        parts = section.split(separator)
+        if len(parts) > 1:
+            pieces = []
+            for part in parts:
+                pieces.extend(_split_oversized(part, max_chars))
+            return pieces
+
+    return [section[i:i + max_chars] for i in range(0, len(section), max_chars)]
+
+
+def merge_chunk_results(chunk_results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Merge per-chunk generation results into a single result.
+    Scenarios already generated by an earlier chunk are dropped (see _keep_new_scenarios),
+    and test IDs are renumbered sequentially (TC-001, TC-002, ...).
+    """
+    merged = []
+    seen = set()
+    errors = []
+
+    for index, result in enumerate(chunk_results):
+        if "error" in result:
+            errors.append({"chunk": index + 1, "error": result["error"]})
+            continue
+        for tc in result.get("test_cases", []):
+            if _keep_new_scenarios(tc, seen):
+                merged.append(tc)
+
+    for number, tc in enumerate(merged, 1):
+        tc["test_id"] = f"TC-{number:03d}"
+
+    if errors and not merged:
+        return {
+            "error": "Failed to generate test cases for any chunk",
+            "chunk_errors": errors
+        }
+
+    result = {"test_cases": merged, "chunks": len(chunk_results)}
+    if errors:
+        result["chunk_errors"] = errors
+    return result
+
+
+def _normalize(text: str) -> str:
+    return " ".join((text or "").lower().split())
+
+
+def _scenario_fingerprint(scenario: Scenario) -> Tuple[str, ...]:
+    """Scenario name plus normalized steps and examples; the enclosing Feature is ignored."""
+    parts = [_normalize(scenario.name)]
+    parts.extend(_normalize(f"{step.keyword} {step.text}") for step in scenario.steps)
+    for examples in scenario.examples:
+        parts.extend(_normalize(" | ".join(row)) for row in [examples.header] + examples.rows)
+    return tuple(parts)
+
+
+def _keep_new_scenarios(test_case: Dict[str, Any], seen: set) -> bool:
+    """
+    Remove the scenarios of a test case that were already seen (overlapping chunks often
+    produce the same scenario under a different Feature header) and record the rest.
+    A test case left with some duplicates is rewritten to its new scenarios only; False
+    means nothing new is left. Text without scenarios is compared as a whole.
+    """
+    features = parse_gherkin(test_case.get("gherkin_feature") or "")
+    if not any(feature.scenarios for feature in features):
+        fingerprint = _normalize(test_case.get("gherkin_feature") or test_case.get("requirement_source") or "")
+        if fingerprint in seen:
+            return False
+        seen.add(fingerprint)
+        return True
+
+    kept_features, dropped = [], False
+    for feature in features:
+        kept = []
+        for scenario in feature.scenarios:
+            fingerprint = _scenario_fingerprint(scenario)
+            if fingerprint in seen:
+                dropped = True
+                continue
+            seen.add(fingerprint)
+            kept.append(scenario)
+        if kept:
+            kept_features.append((feature, kept))
+    if not kept_features:
+        return False
+    if dropped:
+        test_case["gherkin_feature"] = "\n".join(feature.render(kept) for feature, kept in kept_features)
+    return True
+
+
+async def _generate_chunk(chunk: str, domain: str, semaphore: asyncio.Semaphore,
+                          prior_contexts: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """Generate one chunk once the semaphore allows; a failure becomes an error result for the merge."""
+    async with semaphore:
+        try:
+            return await agenerate_test_cases(chunk, domain, prior_contexts=prior_contexts)
+        except Exception as e:
+            return {"error": str(e)}
+
+
+async def agenerate_test_cases_chunked(requirement_text: str, domain: str = "healthcare software",
+                                       max_parallel: Optional[int] = None,
+                                       max_chars: Optional[int] = None,
+                                       prior_contexts: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """
+    Generate test cases for a large document by generating per chunk concurrently.
+    Small documents fall through to a single agenerate_test_cases call.
+
+    Args:
+        requirement_text: The full requirement document text
+        domain: Domain context
+        max_parallel: Concurrent model calls allowed (defaults to GENERATION_MAX_PARALLEL)
+        max_chars: Chunk size limit (defaults to GENERATION_CHUNK_CHARS)
+        prior_contexts: Similar prior contexts shown as examples; only used for the single-call
+                        path, since they were retrieved for the whole document rather than a chunk
+    """
+    chunks = split_requirement_document(requirement_text, max_chars)
+    if len(chunks) <= 1:
+        return await agenerate_test_cases(requirement_text, domain, prior_contexts=prior_contexts)
+
+    semaphore = asyncio.Semaphore(max_parallel or get_max_parallel())
+    results = await asyncio.gather(*(_generate_chunk(chunk, domain, semaphore) for chunk in chunks))
+    return merge_chunk_results(list(results))
+
+
+async def agenerate_test_cases_from_segments(segments: Iterable[str], domain: str = "healthcare software",
+                                             max_parallel: Optional[int] = None,
+                                             max_chars: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Generate test cases from a stream of document segments, starting each chunk's model call
+    as soon as the chunk has been parsed rather than after the whole file is read.
+    A document that fits in one chunk is generated with a single call.
+    """
+    semaphore = asyncio.Semaphore(max_parallel or get_max_parallel())
+    chunk_iter = pack_segments(segments, max_chars)
+    tasks = []
+    try:
+        while True:
+            # Parsing is blocking, so pull each chunk on the thread pool
+            chunk = await run_blocking(next, chunk_iter, None)
+            if chunk is None:
+                break
+            tasks.append(asyncio.ensure_future(_generate_chunk(chunk, domain, semaphore)))
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+
+    results = await asyncio.gather(*tasks)
+    if len(results) == 1:
+        return results[0]
+    return merge_chunk_results(list(results))
+
+
+async def astream_test_cases_chunked(requirement_text: str, domain: str = "healthcare software",
+                                     max_parallel: Optional[int] = None,
+                                     max_chars: Optional[int] = None,
+                                     prior_contexts: Optional[List[Dict[str, Any]]] = None
+                                     ) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Yield deduplicated, renumbered test cases as each chunk finishes generating.
+    Used by the streaming endpoints for documents too large for a single streamed call.
+    Closing or cancelling the generator cancels the chunks still in progress.
+
+    As in agenerate_test_cases_chunked, prior_contexts are only used when the document fits
+    in one chunk, since they were retrieved for the whole document rather than a chunk.
+    """
+    chunks = split_requirement_document(requirement_text, max_chars)
+    semaphore = asyncio.Semaphore(max_parallel or get_max_parallel())
+    chunk_contexts = prior_contexts if len(chunks) <= 1 else None
+
+    seen = set()
+    emitted = 0
+    errors = []
+    tasks = [asyncio.ensure_future(_generate_chunk(chunk, domain, semaphore, chunk_contexts)) for chunk in chunks]
+    try:
+        for next_result in asyncio.as_completed(tasks):
+            result = await next_result
+            if "error" in result:
+                errors.append(result["error"])
+                continue
+            for tc in result.get("test_cases", []):
+                if not _keep_new_scenarios(tc, seen):
+                    continue
+                emitted += 1
+                tc["test_id"] = f"TC-{emitted:03d}"
+                yield tc
+    finally:
+        # The consumer went away (client disconnect, generator closed or cancelled):
+        # stop the chunks that are still waiting for or calling the model
+        for task in tasks:
+            task.cancel()
+
+    if errors and not emitted:
+        raise ValueError(f"Failed to generate test cases for any chunk: {errors[0]}")
+
+
+def generate_test_cases_chunked(requirement_text: str, domain: str = "healthcare software",
+                                max_parallel: Optional[int] = None,
+                                max_chars: Optional[int] = None) -> Dict[str, Any]:
+    """Synchronous variant of agenerate_test_cases_chunked using a thread pool (for the CLI)."""
+    chunks = split_requirement_document(requirement_text, max_chars)
+    if len(chunks) <= 1:
+        return generate_test_cases(requirement_text, domain)
+
+    def generate_chunk(chunk: str) -> Dict[str, Any]:
+        try:
+            return generate_test_cases(chunk, domain)
+        except Exception as e:
+            return {"error": str(e)}
+
+    with ThreadPoolExecutor(max_workers=max_parallel or get_max_parallel()) as executor:
+        results = list(executor.map(generate_chunk, chunks))
+    return merge_chunk_results(results)
@@ -0,0 +1,50 @@
+"""
+Concurrency Helpers Module
+Offloads blocking work (file parsing, ALM SDK calls, disk I/O) from the event loop
+onto a bounded thread pool so a single API worker can serve many requests at once,
+and provides a shared process pool for CPU-bound work.
+"""
+
+import os
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from typing import Any, Callable
+
+# Global executors for blocking and CPU-bound work
+_blocking_executor = None
+_process_executor = None
+
+def get_blocking_executor() -> ThreadPoolExecutor:
+    """
+    Factory function to get the shared thread pool for blocking work.
+    Pool size is configured with BLOCKING_WORKERS (default 8).
+    """
+    global _blocking_executor
+    if _blocking_executor is None:
+        _blocking_executor = ThreadPoolExecutor(
+            max_workers=int(os.environ.get("BLOCKING_WORKERS", 8)),
+            thread_name_prefix="blocking"
+        )
+    return _blocking_executor
+
+
+async def run_blocking(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run a blocking callable on the shared pool and await its result."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_blocking_executor(), functools.partial(func, *args, **kwargs)
+    )
+
+
+def get_process_executor() -> ProcessPoolExecutor:
+    """
+    Factory function to get the shared process pool for CPU-bound work (e.g. PDF text extraction).
+    Pool size is configured with PROCESS_WORKERS (default: number of CPUs).
+    """
+    global _process_executor
+    if _process_executor is None:
+        _process_executor = ProcessPoolExecutor(
+            max_workers=int(os.environ.get("PROCESS_WORKERS", 0)) or os.cpu_count()
+        )
+    return _process_executor
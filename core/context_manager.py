@@ -5,21 +5,59 @@ Implements a scalable, memory-efficient context management system.
 """
 
 import os
-import json
-from typing import List, Dict, Any, Optional
+import threading
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 import hashlib
 
+from .cache import LRUCache, normalize_text
+from .retrieval import BM25Index
+from .context_store import (
+    ContextStore,
+    JSONContextStore,
+    SQLiteContextStore,
+    context_at_version,
+    context_metadata,
+    migrate_json_contexts
+)
+
 class ContextManager:
     """
     Manages context storage, retrieval, and versioning for test case generation.
     Supports both in-memory and persistent storage for scalability.
     """
     
-    def __init__(self, storage_path: str = "context_storage"):
+    def __init__(self, storage_path: str = "context_storage", store: Optional[ContextStore] = None,
+                 cache_max_entries: int = 256, cache_max_bytes: Optional[int] = 64 * 1024 * 1024,
+                 metadata_only: bool = False, retrieval_limit: int = 3, min_similarity: float = 0.2,
+                 min_reuse_rating: float = 3):
+        """
+        Args:
+            storage_path: Directory for the JSON backend (and default SQLite location)
+            store: Storage backend; defaults to JSON files in storage_path
+            cache_max_entries: Contexts kept in the in-memory LRU cache
+            cache_max_bytes: Approximate memory budget of the cache (None for no byte limit)
+            metadata_only: Cache only id/domain/created_at/version and load bodies from
+                           storage on each get_context, for large contexts
+            retrieval_limit: Similar prior contexts returned by retrieve_prior_work
+            min_similarity: Similarity (0-1) below which a prior context is not considered relevant
+            min_reuse_rating: Contexts whose average feedback rating is below this are never retrieved
+        """
         self.storage_path = storage_path
         os.makedirs(storage_path, exist_ok=True)
-        self.context_cache = {}  # In-memory cache for quick access
+        self.store = store or JSONContextStore(storage_path)
+        self.metadata_only = metadata_only
+        # Bounded in-memory LRU cache for quick access: context_id -> (store revision, context).
+        # Entries are revalidated against the store's revision, so writes by other worker
+        # processes are never served stale.
+        self.context_cache = LRUCache(max_entries=cache_max_entries, max_bytes=cache_max_bytes)
+        self.retrieval_limit = retrieval_limit
+        self.min_similarity = min_similarity
+        self.min_reuse_rating = min_reuse_rating
+        # Requirement text search index, filled from storage on first use and then incrementally
+        self.retrieval_index = BM25Index()
+        self._index_cursor = None
+        self._index_lock = threading.Lock()
     
     def create_context(self, requirement_text: str, domain: str, 
                       metadata: Optional[Dict[str, Any]] = None) -> str:
@@ -47,11 +85,12 @@ class ContextManager:
             "version": 1
         }
         
-        # Store in memory cache
-        self.context_cache[context_id] = context_data
-        
         # Persist to storage
-        self._save_context(context_id, context_data)
+        self.store.create(context_data)
+        
+        # Store in memory cache
+        self._cache_context(context_data, revision=0)
+        self.retrieval_index.add(context_id, requirement_text, domain)
         
         return context_id
     
@@ -60,99 +99,223 @@ class ContextManager:
         Build and enhance context with additional information (feature updates, feedback, etc.).
         Implements the "Build and Store Context" step from the architecture.
         """
-        existing_context = self.get_context(context_id)
-        if not existing_context:
-            raise ValueError(f"Context {context_id} not found")
-        
-        # Enhance context with additional information
-        if "updates" not in existing_context:
-            existing_context["updates"] = []
-        
-        existing_context["updates"].append({
-            "timestamp": datetime.now().isoformat(),
-            "info": additional_info,
-            "version": existing_context["version"] + 1
-        })
-        
-        existing_context["version"] += 1
+        # Enhance context with additional information (appended to storage, not rewritten)
+        update_entry = self.store.append_update(context_id, additional_info, datetime.now().isoformat())
+        return self._apply_entry(context_id, "updates", update_entry, update_entry["version"])
+    
+    def record_test_cases(self, context_id: str, test_cases: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Store the test cases generated for a context so later similar requirements can reuse them."""
+        return self.build_context(context_id, {"test_cases": test_cases})
+    
+    def find_similar_contexts(self, requirement_text: str, domain: Optional[str] = None,
+                              limit: Optional[int] = None,
+                              exclude: Tuple[str, ...] = ()) -> List[Dict[str, Any]]:
+        """
+        Prior contexts in the same domain whose requirements resemble requirement_text and that
+        have stored test cases, best first. Contexts rated below min_reuse_rating are skipped.
         
-        # Update cache and storage
-        self.context_cache[context_id] = existing_context
-        self._save_context(context_id, existing_context)
+        Returns:
+            Dicts with context_id, similarity (0-1), exact_match (same requirement text up to
+            whitespace), test_cases and feedback
+        """
+        limit = limit or self.retrieval_limit
+        normalized = normalize_text(requirement_text)
+        self._refresh_index()
+        # Over-fetch: some hits have no test cases yet or were rated poorly
+        hits = self.retrieval_index.search(requirement_text, limit=limit * 3, domain=domain, exclude=exclude)
+        matches = []
+        for context_id, _, similarity in hits:
+            if similarity < self.min_similarity or len(matches) >= limit:
+                continue
+            context = self.get_context(context_id)
+            test_cases = latest_test_cases(context) if context else None
+            if not test_cases or not self._is_accepted(context):
+                continue
+            matches.append({
+                "context_id": context_id,
+                "similarity": similarity,
+                "exact_match": normalize_text(context.get("requirement_text", "")) == normalized,
+                "test_cases": test_cases,
+                "feedback": [entry["feedback"] for entry in context.get("feedback", [])]
+            })
+        matches.sort(key=lambda match: match["similarity"], reverse=True)
+        return matches
+    
+    def retrieve_prior_work(self, requirement_text: str, domain: Optional[str] = None,
+                            exclude: Tuple[str, ...] = ()) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Look up prior work for a new requirement.
         
-        return existing_context
+        Returns:
+            (match, prior_contexts): match is a prior context with the same requirement text
+            (its test cases can be returned as is), otherwise None; prior_contexts are the
+            similar contexts to show the model as examples. Similarity alone never leads to
+            reuse: a negated requirement or a changed number can score close to 1.0.
+        """
+        matches = self.find_similar_contexts(requirement_text, domain, exclude=exclude)
+        match = next((match for match in matches if match["exact_match"]), None)
+        return match, matches
+    
+    def get_context(self, context_id: str, version: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """
+        Retrieve context by ID, with caching for performance.
+        With version, the context is rebuilt as it was at that version (ValueError if it never existed).
+        """
+        context_data = self._get_current_context(context_id)
+        if context_data and version is not None:
+            return context_at_version(context_data, version)
+        return context_data
     
-    def get_context(self, context_id: str) -> Optional[Dict[str, Any]]:
-        """Retrieve context by ID, with caching for performance."""
-        if context_id in self.context_cache:
-            return self.context_cache[context_id]
+    def _get_current_context(self, context_id: str) -> Optional[Dict[str, Any]]:
+        revision = self.store.revision(context_id)
+        if revision is None:
+            self.context_cache.delete(context_id)
+            return None
+        if not self.metadata_only:
+            cached = self.context_cache.get(context_id)
+            if cached is not None and cached[0] == revision:
+                return cached[1]
         
-        # Load from storage if not in cache
-        context_file = os.path.join(self.storage_path, f"{context_id}.json")
-        if os.path.exists(context_file):
-            with open(context_file, 'r', encoding='utf-8') as f:
-                context_data = json.load(f)
-                self.context_cache[context_id] = context_data
-                return context_data
+        # Load from storage if not cached or changed by another process
+        context_data = self.store.load(context_id)
+        if context_data:
+            self._cache_context(context_data, revision)
+            return context_data
         
         return None
     
+    def get_context_metadata(self, context_id: str) -> Optional[Dict[str, Any]]:
+        """Retrieve only id, domain, created_at and version, served from the cache when current."""
+        cached = self.context_cache.get(context_id)
+        if cached is not None and cached[0] == self.store.revision(context_id):
+            return context_metadata(cached[1])
+        context_data = self.get_context(context_id)
+        return context_metadata(context_data) if context_data else None
+    
     def add_feedback(self, context_id: str, feedback: Dict[str, Any]) -> Dict[str, Any]:
         """
         Add user feedback to context for continuous improvement.
         Implements feedback loop from architecture diagram.
         """
-        context = self.get_context(context_id)
-        if not context:
-            raise ValueError(f"Context {context_id} not found")
-        
-        if "feedback" not in context:
-            context["feedback"] = []
-        
-        feedback_entry = {
-            "timestamp": datetime.now().isoformat(),
-            "feedback": feedback,
-            "processed": False
-        }
-        
-        context["feedback"].append(feedback_entry)
-        
-        # Update context
-        self.context_cache[context_id] = context
-        self._save_context(context_id, context)
-        
-        return context
+        feedback_entry = self.store.append_feedback(context_id, feedback, datetime.now().isoformat())
+        return self._apply_entry(context_id, "feedback", feedback_entry)
+    
+    def list_contexts(self, domain: Optional[str] = None, created_after: Optional[str] = None,
+                      created_before: Optional[str] = None, limit: Optional[int] = None,
+                      offset: int = 0) -> List[Dict[str, Any]]:
+        """
+        List context metadata (id, domain, created_at, version), newest first.
+        Optionally filtered by domain and an inclusive ISO-8601 created_at range, and paginated.
+        """
+        return self.store.list(domain=domain, created_after=created_after, created_before=created_before,
+                               limit=limit, offset=offset)
+    
+    def count_contexts(self, domain: Optional[str] = None, created_after: Optional[str] = None,
+                       created_before: Optional[str] = None) -> int:
+        """Number of contexts matching the same filters as list_contexts."""
+        return self.store.count(domain=domain, created_after=created_after, created_before=created_before)
+    
+    def flush(self):
+        """Make journaled writes durable (e.g. on shutdown)."""
+        self.store.flush()
     
-    def list_contexts(self) -> List[Dict[str, Any]]:
-        """List all available contexts."""
-        contexts = []
-        for filename in os.listdir(self.storage_path):
-            if filename.endswith('.json'):
-                context_id = filename.replace('.json', '')
-                context = self.get_context(context_id)
-                if context:
-                    contexts.append({
-                        "context_id": context_id,
-                        "domain": context.get("domain"),
-                        "created_at": context.get("created_at"),
-                        "version": context.get("version")
-                    })
-        return contexts
-    
-    def _save_context(self, context_id: str, context_data: Dict[str, Any]):
-        """Internal method to persist context to storage."""
-        context_file = os.path.join(self.storage_path, f"{context_id}.json")
-        with open(context_file, 'w', encoding='utf-8') as f:
-            json.dump(context_data, f, indent=2)
+    def cache_stats(self) -> Dict[str, Any]:
+        stats = self.context_cache.stats()
+        stats["metadata_only"] = self.metadata_only
+        return stats
+    
+    def _refresh_index(self):
+        """Index contexts created since the last refresh, including those written by other processes."""
+        with self._index_lock:
+            rows, self._index_cursor = self.store.requirements_since(self._index_cursor)
+            for context_id, domain, requirement_text in rows:
+                if context_id not in self.retrieval_index:
+                    self.retrieval_index.add(context_id, requirement_text, domain)
+    
+    def _is_accepted(self, context: Dict[str, Any]) -> bool:
+        ratings = [
+            entry["feedback"]["rating"] for entry in context.get("feedback", [])
+            if isinstance(entry.get("feedback"), dict) and isinstance(entry["feedback"].get("rating"), (int, float))
+        ]
+        return not ratings or sum(ratings) / len(ratings) >= self.min_reuse_rating
+    
+    def _cache_context(self, context_data: Dict[str, Any], revision: int):
+        value = context_metadata(context_data) if self.metadata_only else context_data
+        self.context_cache.set(context_data["context_id"], (revision, value))
+    
+    def _apply_entry(self, context_id: str, key: str, entry: Dict[str, Any],
+                     version: Optional[int] = None) -> Dict[str, Any]:
+        """Mirror an entry just appended in storage onto the cached context and return the context."""
+        revision = self.store.revision(context_id)
+        cached = None if self.metadata_only else self.context_cache.get(context_id)
+        if cached is not None and cached[0] + 1 == revision:
+            # Our append is the only change since the context was cached
+            context = cached[1]
+            context.setdefault(key, []).append(entry)
+            if version is not None:
+                context["version"] = version
+        else:
+            # Not resident, or another process wrote too: storage already includes the new entry
+            context = self.store.load(context_id)
+        self._cache_context(context, revision)
+        return context
+
+
+def latest_test_cases(context: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+    """The test cases most recently recorded for a context, or None."""
+    for update in reversed(context.get("updates", [])):
+        test_cases = update.get("info", {}).get("test_cases")
+        if test_cases:
+            return test_cases
+    return None
+
+
+def reused_test_data(match: Dict[str, Any]) -> Dict[str, Any]:
+    """Generation result built from a prior context's test cases (see retrieve_prior_work)."""
+    return {
+        "test_cases": [dict(tc) for tc in match["test_cases"]],
+        "reused_from": {"context_id": match["context_id"], "similarity": match["similarity"]}
+    }
 
 
 # Global context manager instance
 _context_manager = None
 
 def get_context_manager() -> ContextManager:
-    """Factory function to get global context manager instance."""
+    """
+    Factory function to get global context manager instance.
+    CONTEXT_BACKEND selects the storage: "sqlite" (default, CONTEXT_DB_PATH) or "json";
+    the cache is sized with CONTEXT_CACHE_SIZE / CONTEXT_CACHE_MAX_BYTES and
+    CONTEXT_CACHE_METADATA_ONLY=true keeps only metadata resident.
+    Retrieval of prior work is tuned with CONTEXT_RETRIEVAL_LIMIT, CONTEXT_RETRIEVAL_MIN_SIMILARITY
+    and CONTEXT_REUSE_MIN_RATING.
+    On first use of a new SQLite database, existing JSON contexts are imported.
+    """
     global _context_manager
     if _context_manager is None:
-        _context_manager = ContextManager()
+        storage_path = os.environ.get("CONTEXT_STORAGE_PATH", "context_storage")
+        if os.environ.get("CONTEXT_BACKEND", "sqlite").lower() == "json":
+            store = JSONContextStore(
+                storage_path,
+                compact_every=int(os.environ.get("CONTEXT_JOURNAL_COMPACT_EVERY", 100)),
+                fsync_interval=float(os.environ.get("CONTEXT_JOURNAL_FSYNC_INTERVAL", 0.05))
+            )
+        else:
+            db_path = os.environ.get("CONTEXT_DB_PATH", os.path.join(storage_path, "contexts.db"))
+            is_new = not os.path.exists(db_path)
+            store = SQLiteContextStore(db_path)
+            if is_new:
+                imported, _ = migrate_json_contexts(storage_path, store)
+                if imported:
+                    print(f"Imported {imported} JSON contexts into {db_path}")
+        _context_manager = ContextManager(
+            storage_path,
+            store=store,
+            cache_max_entries=int(os.environ.get("CONTEXT_CACHE_SIZE", 256)),
+            cache_max_bytes=int(os.environ.get("CONTEXT_CACHE_MAX_BYTES", 64 * 1024 * 1024)),
+            metadata_only=os.environ.get("CONTEXT_CACHE_METADATA_ONLY", "false").lower() == "true",
+            retrieval_limit=int(os.environ.get("CONTEXT_RETRIEVAL_LIMIT", 3)),
+            min_similarity=float(os.environ.get("CONTEXT_RETRIEVAL_MIN_SIMILARITY", 0.2)),
+            min_reuse_rating=float(os.environ.get("CONTEXT_REUSE_MIN_RATING", 3))
+        )
     return _context_manager
-
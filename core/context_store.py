@@ -0,0 +1,730 @@
+"""
+Context Storage Module
+Storage backends for ContextManager: JSON snapshots with an append-only delta journal per
+context, or SQLite with indexed metadata columns and append-only update/feedback rows.
+Includes a migration tool that imports existing context_storage/*.json files into SQLite.
+"""
+
+import os
+import copy
+import json
+import time
+import sqlite3
+import argparse
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class ContextStore:
+    """
+    Interface implemented by the context storage backends.
+
+    Contexts are dicts with context_id, requirement_text, domain, metadata, created_at and
+    version, plus "updates" and "feedback" lists once something has been appended.
+    """
+
+    def create(self, context: Dict[str, Any]):
+        raise NotImplementedError
+
+    def load(self, context_id: str) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def append_update(self, context_id: str, info: Dict[str, Any], timestamp: str) -> Dict[str, Any]:
+        """Append an update, bump the context version and return the stored update entry."""
+        raise NotImplementedError
+
+    def append_feedback(self, context_id: str, feedback: Dict[str, Any], timestamp: str) -> Dict[str, Any]:
+        """Append a feedback entry and return it."""
+        raise NotImplementedError
+
+    def revision(self, context_id: str) -> Optional[int]:
+        """
+        Change counter of a context, 0 on creation and bumped by exactly one per append by any
+        process; None if the context does not exist. Cheap enough to check on every cache hit.
+        """
+        raise NotImplementedError
+
+    def list(self, domain: Optional[str] = None, created_after: Optional[str] = None,
+             created_before: Optional[str] = None, limit: Optional[int] = None,
+             offset: int = 0) -> List[Dict[str, Any]]:
+        """
+        Metadata (context_id, domain, created_at, version) of matching contexts, newest first.
+        created_after/created_before are inclusive ISO-8601 bounds.
+        """
+        raise NotImplementedError
+
+    def count(self, domain: Optional[str] = None, created_after: Optional[str] = None,
+              created_before: Optional[str] = None) -> int:
+        raise NotImplementedError
+
+    def requirements_since(self, cursor: Any = None) -> Tuple[List[Tuple[str, Optional[str], str]], Any]:
+        """
+        (context_id, domain, requirement_text) of contexts created since cursor (None for all),
+        plus the cursor to pass next time. Used to keep a search index in step with storage.
+        """
+        raise NotImplementedError
+
+    def flush(self):
+        """Make buffered writes durable (no-op for backends that sync on commit)."""
+
+
+def context_metadata(context: Dict[str, Any]) -> Dict[str, Any]:
+    """The lightweight listing fields of a context."""
+    return {
+        "context_id": context.get("context_id"),
+        "domain": context.get("domain"),
+        "created_at": context.get("created_at"),
+        "version": context.get("version")
+    }
+
+
+def _matches(context: Dict[str, Any], domain: Optional[str], created_after: Optional[str],
+             created_before: Optional[str]) -> bool:
+    created_at = context.get("created_at") or ""
+    return ((domain is None or context.get("domain") == domain)
+            and (created_after is None or created_at >= created_after)
+            and (created_before is None or created_at <= created_before))
+
+
+class _FsyncBatcher:
+    """
+    Group commit for journal appends: paths written since the last sync are fsynced together
+    by a background thread at most every interval seconds (0 syncs on every append).
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def mark(self, path: str):
+        if self.interval <= 0:
+            self._sync(path)
+            return
+        with self._lock:
+            self._pending.add(path)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="context-journal-fsync", daemon=True)
+                self._thread.start()
+
+    def flush(self):
+        with self._lock:
+            paths, self._pending = self._pending, set()
+        for path in paths:
+            self._sync(path)
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            self.flush()
+
+    @staticmethod
+    def _sync(path: str):
+        try:
+            with open(path, 'ab') as f:
+                os.fsync(f.fileno())
+        except OSError:
+            pass
+
+
+class _FileLock:
+    """
+    Advisory lock on a lock file shared by all processes: fcntl.flock (shared or exclusive),
+    or msvcrt.locking on Windows, where every lock is exclusive.
+    """
+
+    def __init__(self, path: str, shared: bool = False):
+        self.path = path
+        self.shared = shared
+        self._file = None
+
+    def __enter__(self):
+        self._file = open(self.path, 'a+b')
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_SH if self.shared else fcntl.LOCK_EX)
+        else:
+            self._file.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    pass  # LK_LOCK gives up after ~10 seconds; keep waiting
+        return self
+
+    def __exit__(self, *exc_info):
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            else:
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            self._file.close()
+            self._file = None
+
+
+def _last_journal_seq(journal_path: str) -> int:
+    """Seq of the last complete journal line, read backwards from the end (0 if there is none)."""
+    try:
+        f = open(journal_path, 'rb')
+    except FileNotFoundError:
+        return 0
+    with f:
+        position = f.seek(0, os.SEEK_END)
+        buffer = b""
+        skip_tail = True
+        while position > 0:
+            step = min(4096, position)
+            position -= step
+            f.seek(position)
+            lines = (f.read(step) + buffer).split(b"\n")
+            # The first piece may continue in the next block back; keep it for the next read
+            buffer = lines.pop(0) if position > 0 else b""
+            if skip_tail and lines:
+                lines.pop()  # after the last newline: empty, or a line torn by a crash
+                skip_tail = False
+            for line in reversed(lines):
+                try:
+                    return json.loads(line)["seq"]
+                except (ValueError, KeyError):
+                    continue
+        return 0
+
+
+def _truncate_torn_tail(journal_path: str):
+    """
+    Cut a line torn by a crashed writer off the end of a journal, so the next append starts
+    on a fresh line instead of merging into the torn bytes (which would hide it on replay).
+    """
+    try:
+        f = open(journal_path, 'rb+')
+    except FileNotFoundError:
+        return
+    with f:
+        end = position = f.seek(0, os.SEEK_END)
+        valid = 0
+        while position > 0:
+            step = min(4096, position)
+            position -= step
+            f.seek(position)
+            newline = f.read(step).rfind(b"\n")
+            if newline != -1:
+                valid = position + newline + 1
+                break
+        if valid < end:
+            f.truncate(valid)
+
+
+class JSONContextStore(ContextStore):
+    """
+    File backend: a JSON snapshot per context in storage_path (the original layout) plus an
+    append-only <context_id>.journal of deltas (one JSON line per update or feedback entry).
+
+    A write appends one line, so its cost does not grow with the context; fsyncs are batched
+    (fsync_interval). Once a journal holds compact_every entries it is folded into a new
+    snapshot. Snapshots keep the full update/feedback history, so any version can be rebuilt.
+
+    Several processes can share the directory: each context has a <context_id>.lock file that
+    is held exclusively for writes and shared for reads, snapshots and compacted journals are
+    replaced by atomic rename, and cached per-context state is revalidated against the
+    journal's last seq (its revision) before every append.
+    """
+
+    def __init__(self, storage_path: str = "context_storage", compact_every: int = 100,
+                 fsync_interval: float = 0.05):
+        self.storage_path = storage_path
+        self.compact_every = compact_every
+        os.makedirs(storage_path, exist_ok=True)
+        self._state = {}  # context_id -> {"version", "seq", "journal_entries"}
+        self._fsync = _FsyncBatcher(fsync_interval)
+
+    def create(self, context: Dict[str, Any]):
+        context_id = context["context_id"]
+        with self._file_lock(context_id):
+            # IDs are derived from content and creation second, so a repeat is the same context
+            if os.path.exists(self._path(context_id)):
+                return
+            self._write_snapshot(context, journal_seq=0)
+            if os.path.exists(self._journal_path(context_id)):
+                os.remove(self._journal_path(context_id))
+            self._state[context_id] = {"version": context.get("version", 1), "seq": 0, "journal_entries": 0}
+
+    def load(self, context_id: str) -> Optional[Dict[str, Any]]:
+        if not os.path.exists(self._path(context_id)):
+            return None
+        # Shared lock: a concurrent compaction swaps snapshot and journal as a pair
+        with self._file_lock(context_id, shared=True):
+            loaded = self._load(context_id)
+        return loaded[0] if loaded else None
+
+    def revision(self, context_id: str) -> Optional[int]:
+        if not os.path.exists(self._path(context_id)):
+            return None
+        return _last_journal_seq(self._journal_path(context_id))
+
+    def append_update(self, context_id: str, info: Dict[str, Any], timestamp: str) -> Dict[str, Any]:
+        with self._file_lock(context_id):
+            state = self._require_state(context_id)
+            entry = {"timestamp": timestamp, "info": info, "version": state["version"] + 1}
+            self._append(context_id, state, {"op": "update", "entry": entry})
+            state["version"] = entry["version"]
+        return entry
+
+    def append_feedback(self, context_id: str, feedback: Dict[str, Any], timestamp: str) -> Dict[str, Any]:
+        with self._file_lock(context_id):
+            state = self._require_state(context_id)
+            entry = {"timestamp": timestamp, "feedback": feedback, "processed": False}
+            self._append(context_id, state, {"op": "feedback", "entry": entry})
+        return entry
+
+    def compact(self, context_id: str):
+        """Fold the context's journal into a fresh snapshot and reset the journal."""
+        with self._file_lock(context_id):
+            self._compact(context_id)
+
+    def flush(self):
+        self._fsync.flush()
+
+    def list(self, domain: Optional[str] = None, created_after: Optional[str] = None,
+             created_before: Optional[str] = None, limit: Optional[int] = None,
+             offset: int = 0) -> List[Dict[str, Any]]:
+        matching = [
+            context_metadata(context) for context in self.iter_contexts()
+            if _matches(context, domain, created_after, created_before)
+        ]
+        matching.sort(key=lambda context: context["created_at"] or "", reverse=True)
+        return matching[offset:offset + limit if limit is not None else None]
+
+    def count(self, domain: Optional[str] = None, created_after: Optional[str] = None,
+              created_before: Optional[str] = None) -> int:
+        return sum(1 for context in self.iter_contexts() if _matches(context, domain, created_after, created_before))
+
+    def requirements_since(self, cursor: Any = None) -> Tuple[List[Tuple[str, Optional[str], str]], Any]:
+        # The cursor is the set of context IDs already returned; only new snapshots are read
+        seen = cursor or frozenset()
+        rows, new_ids = [], set()
+        for filename in os.listdir(self.storage_path):
+            if not filename.endswith('.json') or filename[:-len('.json')] in seen:
+                continue
+            context_id = filename[:-len('.json')]
+            try:
+                with open(os.path.join(self.storage_path, filename), 'r', encoding='utf-8') as f:
+                    snapshot = json.load(f)
+            except (OSError, ValueError):
+                continue  # removed, or not a context file
+            rows.append((context_id, snapshot.get("domain"), snapshot.get("requirement_text", "")))
+            new_ids.add(context_id)
+        return rows, seen | new_ids
+
+    def iter_contexts(self) -> Iterator[Dict[str, Any]]:
+        for filename in os.listdir(self.storage_path):
+            if filename.endswith('.json'):
+                context = self.load(filename[:-len('.json')])
+                if context:
+                    yield context
+
+    def _load(self, context_id: str, for_write: bool = False) -> Optional[Tuple[Dict[str, Any], int, int]]:
+        """Snapshot plus replayed journal: (context, last journal seq, journal entries)."""
+        snapshot_path = self._path(context_id)
+        if not os.path.exists(snapshot_path):
+            return None
+        with open(snapshot_path, 'r', encoding='utf-8') as f:
+            context = json.load(f)
+        last_seq = context.pop("journal_seq", 0)
+        journal_entries = 0
+
+        journal_path = self._journal_path(context_id)
+        if os.path.exists(journal_path):
+            with open(journal_path, 'rb') as f:
+                valid_bytes = 0
+                for line in f:
+                    try:
+                        if not line.endswith(b"\n"):
+                            raise ValueError("unterminated journal line")
+                        record = json.loads(line)
+                    except ValueError:
+                        # Torn final line from a crash mid-append: drop it before appending again
+                        if for_write:
+                            f.close()
+                            os.truncate(journal_path, valid_bytes)
+                        break
+                    valid_bytes += len(line)
+                    if record["seq"] <= last_seq:
+                        continue  # already folded into the snapshot
+                    last_seq = record["seq"]
+                    journal_entries += 1
+                    if record["op"] == "update":
+                        context.setdefault("updates", []).append(record["entry"])
+                        context["version"] = record["entry"]["version"]
+                    elif record["op"] == "feedback":
+                        context.setdefault("feedback", []).append(record["entry"])
+        return context, last_seq, journal_entries
+
+    def _require_state(self, context_id: str) -> Dict[str, int]:
+        """Version/seq/entry count for appending (caller holds the exclusive file lock)."""
+        state = self._state.get(context_id)
+        if state is not None and state["seq"] == _last_journal_seq(self._journal_path(context_id)):
+            return state
+        # Unknown here, or another process appended since: rebuild from disk
+        loaded = self._load(context_id, for_write=True)
+        if not loaded:
+            raise ValueError(f"Context {context_id} not found")
+        context, last_seq, journal_entries = loaded
+        if not journal_entries and last_seq:
+            # Journal emptied by an older compaction: record the seq so the revision survives
+            self._reset_journal(context_id, last_seq)
+        state = {"version": context["version"], "seq": last_seq, "journal_entries": journal_entries}
+        self._state[context_id] = state
+        return state
+
+    def _append(self, context_id: str, state: Dict[str, int], record: Dict[str, Any]):
+        record["seq"] = state["seq"] + 1
+        journal_path = self._journal_path(context_id)
+        _truncate_torn_tail(journal_path)
+        with open(journal_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record) + "\n")
+        self._fsync.mark(journal_path)
+        state["seq"] = record["seq"]
+        state["journal_entries"] += 1
+        if state["journal_entries"] >= self.compact_every:
+            self._compact(context_id)
+
+    def _compact(self, context_id: str):
+        loaded = self._load(context_id)
+        if not loaded:
+            return
+        context, last_seq, _ = loaded
+        # The snapshot records the last folded seq, so a crash before the journal is
+        # truncated cannot replay entries twice
+        self._write_snapshot(context, journal_seq=last_seq)
+        self._reset_journal(context_id, last_seq)
+        if context_id in self._state:
+            self._state[context_id]["journal_entries"] = 0
+
+    def _reset_journal(self, context_id: str, last_seq: int):
+        """
+        Replace the journal with a single marker holding the last folded seq, so the
+        revision is still readable from the journal's tail.
+        """
+        journal_path = self._journal_path(context_id)
+        temp_path = f"{journal_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({"op": "compacted", "seq": last_seq}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, journal_path)
+
+    def _path(self, context_id: str) -> str:
+        return os.path.join(self.storage_path, f"{context_id}.json")
+
+    def _journal_path(self, context_id: str) -> str:
+        return os.path.join(self.storage_path, f"{context_id}.journal")
+
+    def _file_lock(self, context_id: str, shared: bool = False) -> _FileLock:
+        return _FileLock(os.path.join(self.storage_path, f"{context_id}.lock"), shared=shared)
+
+    def _write_snapshot(self, context: Dict[str, Any], journal_seq: int):
+        """Write the snapshot to a temp file, fsync it and rename it into place."""
+        path = self._path(context["context_id"])
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(dict(context, journal_seq=journal_seq), f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+
+
+def context_at_version(context: Dict[str, Any], version: int) -> Dict[str, Any]:
+    """
+    Rebuild a context as it was at the given version: updates up to that version and the
+    feedback recorded before the next update.
+    """
+    if version < 1 or version > context.get("version", 1):
+        raise ValueError(f"Context {context.get('context_id')} has no version {version}")
+    updates = context.get("updates", [])
+    next_update = next((update for update in updates if update["version"] > version), None)
+    historical = {key: value for key, value in context.items() if key not in ("updates", "feedback")}
+    historical["version"] = version
+
+    past_updates = [update for update in updates if update["version"] <= version]
+    if past_updates:
+        historical["updates"] = past_updates
+    past_feedback = [
+        entry for entry in context.get("feedback", [])
+        if next_update is None or entry["timestamp"] < next_update["timestamp"]
+    ]
+    if past_feedback:
+        historical["feedback"] = past_feedback
+    return copy.deepcopy(historical)
+
+
+class SQLiteContextStore(ContextStore):
+    """
+    SQLite backend. Context metadata lives in indexed columns so listing never reads
+    requirement text; updates and feedback are append-only rows, so a write costs the
+    size of the new entry rather than the whole context.
+
+    Safe to share between worker processes: writes run in BEGIN IMMEDIATE transactions (a
+    busy database is waited on for busy_timeout seconds) and every append bumps the
+    context's revision column, which other processes use to invalidate their caches.
+    """
+
+    def __init__(self, db_path: str = "context_storage/contexts.db", busy_timeout: float = 30.0):
+        self.db_path = db_path
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, timeout=busy_timeout, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # WAL with NORMAL sync batches fsyncs at checkpoints instead of every commit
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS contexts ("
+            "context_id TEXT PRIMARY KEY, domain TEXT, created_at TEXT NOT NULL, "
+            "version INTEGER NOT NULL, requirement_text TEXT NOT NULL, metadata TEXT NOT NULL, "
+            "revision INTEGER NOT NULL DEFAULT 0);"
+            "CREATE INDEX IF NOT EXISTS idx_contexts_created ON contexts (created_at);"
+            "CREATE INDEX IF NOT EXISTS idx_contexts_domain ON contexts (domain, created_at);"
+            "CREATE TABLE IF NOT EXISTS context_updates ("
+            "seq INTEGER PRIMARY KEY AUTOINCREMENT, context_id TEXT NOT NULL, "
+            "version INTEGER NOT NULL, timestamp TEXT NOT NULL, info TEXT NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS idx_updates_context ON context_updates (context_id, seq);"
+            "CREATE TABLE IF NOT EXISTS context_feedback ("
+            "seq INTEGER PRIMARY KEY AUTOINCREMENT, context_id TEXT NOT NULL, "
+            "timestamp TEXT NOT NULL, feedback TEXT NOT NULL, processed INTEGER NOT NULL DEFAULT 0);"
+            "CREATE INDEX IF NOT EXISTS idx_feedback_context ON context_feedback (context_id, seq);"
+        )
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(contexts)")]
+        if "revision" not in columns:
+            # Databases created before revisions were tracked
+            try:
+                self._conn.execute("ALTER TABLE contexts ADD COLUMN revision INTEGER NOT NULL DEFAULT 0")
+            except sqlite3.OperationalError:
+                pass  # another worker added it first
+        self._conn.commit()
+
+    def create(self, context: Dict[str, Any]):
+        # IDs are derived from content and creation second, so a repeat is the same context
+        with self._lock:
+            self._insert_context(context, if_absent=True)
+            self._conn.commit()
+
+    def load(self, context_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            # One read transaction, so a commit from another process cannot land between the queries
+            self._conn.execute("BEGIN")
+            try:
+                row = self._conn.execute(
+                    "SELECT context_id, requirement_text, domain, metadata, created_at, version "
+                    "FROM contexts WHERE context_id = ?", (context_id,)
+                ).fetchone()
+                if row is None:
+                    return None
+                updates = self._conn.execute(
+                    "SELECT timestamp, info, version FROM context_updates WHERE context_id = ? ORDER BY seq",
+                    (context_id,)
+                ).fetchall()
+                feedback = self._conn.execute(
+                    "SELECT timestamp, feedback, processed FROM context_feedback WHERE context_id = ? ORDER BY seq",
+                    (context_id,)
+                ).fetchall()
+            finally:
+                self._conn.commit()
+
+        context = {
+            "context_id": row[0],
+            "requirement_text": row[1],
+            "domain": row[2],
+            "metadata": json.loads(row[3]),
+            "created_at": row[4],
+            "version": row[5]
+        }
+        if updates:
+            context["updates"] = [
+                {"timestamp": timestamp, "info": json.loads(info), "version": version}
+                for timestamp, info, version in updates
+            ]
+        if feedback:
+            context["feedback"] = [
+                {"timestamp": timestamp, "feedback": json.loads(entry), "processed": bool(processed)}
+                for timestamp, entry, processed in feedback
+            ]
+        return context
+
+    def revision(self, context_id: str) -> Optional[int]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT revision FROM contexts WHERE context_id = ?", (context_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def append_update(self, context_id: str, info: Dict[str, Any], timestamp: str) -> Dict[str, Any]:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                cursor = self._conn.execute(
+                    "UPDATE contexts SET version = version + 1, revision = revision + 1 WHERE context_id = ?",
+                    (context_id,)
+                )
+                if cursor.rowcount == 0:
+                    raise ValueError(f"Context {context_id} not found")
+                version = self._conn.execute(
+                    "SELECT version FROM contexts WHERE context_id = ?", (context_id,)
+                ).fetchone()[0]
+                self._conn.execute(
+                    "INSERT INTO context_updates (context_id, version, timestamp, info) VALUES (?, ?, ?, ?)",
+                    (context_id, version, timestamp, json.dumps(info))
+                )
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                raise
+        return {"timestamp": timestamp, "info": info, "version": version}
+
+    def append_feedback(self, context_id: str, feedback: Dict[str, Any], timestamp: str) -> Dict[str, Any]:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                cursor = self._conn.execute(
+                    "UPDATE contexts SET revision = revision + 1 WHERE context_id = ?", (context_id,)
+                )
+                if cursor.rowcount == 0:
+                    raise ValueError(f"Context {context_id} not found")
+                self._conn.execute(
+                    "INSERT INTO context_feedback (context_id, timestamp, feedback, processed) VALUES (?, ?, ?, 0)",
+                    (context_id, timestamp, json.dumps(feedback))
+                )
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                raise
+        return {"timestamp": timestamp, "feedback": feedback, "processed": False}
+
+    def list(self, domain: Optional[str] = None, created_after: Optional[str] = None,
+             created_before: Optional[str] = None, limit: Optional[int] = None,
+             offset: int = 0) -> List[Dict[str, Any]]:
+        where, params = self._filters(domain, created_after, created_before)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT context_id, domain, created_at, version FROM contexts{where} "
+                f"ORDER BY created_at DESC LIMIT ? OFFSET ?",
+                (*params, limit if limit is not None else -1, offset)
+            ).fetchall()
+        return [
+            {"context_id": row[0], "domain": row[1], "created_at": row[2], "version": row[3]}
+            for row in rows
+        ]
+
+    def count(self, domain: Optional[str] = None, created_after: Optional[str] = None,
+              created_before: Optional[str] = None) -> int:
+        where, params = self._filters(domain, created_after, created_before)
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM contexts{where}", params).fetchone()[0]
+
+    def requirements_since(self, cursor: Any = None) -> Tuple[List[Tuple[str, Optional[str], str]], Any]:
+        # Contexts are never deleted, so the rowid only grows; the cursor is the last rowid seen
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT rowid, context_id, domain, requirement_text FROM contexts WHERE rowid > ? ORDER BY rowid",
+                (cursor or 0,)
+            ).fetchall()
+        if not rows:
+            return [], cursor or 0
+        return [(row[1], row[2], row[3]) for row in rows], rows[-1][0]
+
+    def import_context(self, context: Dict[str, Any]) -> bool:
+        """Insert a full context with its updates and feedback; False if it already exists."""
+        with self._lock:
+            # IMMEDIATE: workers importing the same directory at startup must not both insert
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                if self._conn.execute(
+                    "SELECT 1 FROM contexts WHERE context_id = ?", (context["context_id"],)
+                ).fetchone():
+                    self._conn.rollback()
+                    return False
+                self._insert_context(context)
+                self._conn.executemany(
+                    "INSERT INTO context_updates (context_id, version, timestamp, info) VALUES (?, ?, ?, ?)",
+                    [(context["context_id"], update.get("version", 0), update.get("timestamp", ""),
+                      json.dumps(update.get("info", {})))
+                     for update in context.get("updates", [])]
+                )
+                self._conn.executemany(
+                    "INSERT INTO context_feedback (context_id, timestamp, feedback, processed) VALUES (?, ?, ?, ?)",
+                    [(context["context_id"], entry.get("timestamp", ""), json.dumps(entry.get("feedback", {})),
+                      int(bool(entry.get("processed"))))
+                     for entry in context.get("feedback", [])]
+                )
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                raise
+        return True
+
+    def _insert_context(self, context: Dict[str, Any], if_absent: bool = False):
+        self._conn.execute(
+            f"INSERT {'OR IGNORE ' if if_absent else ''}INTO contexts "
+            "(context_id, domain, created_at, version, requirement_text, metadata) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (context["context_id"], context.get("domain"), context.get("created_at", ""),
+             context.get("version", 1), context.get("requirement_text", ""),
+             json.dumps(context.get("metadata") or {}))
+        )
+
+    @staticmethod
+    def _filters(domain: Optional[str], created_after: Optional[str],
+                 created_before: Optional[str]) -> Tuple[str, Tuple[Any, ...]]:
+        clauses, params = [], []
+        if domain is not None:
+            clauses.append("domain = ?")
+            params.append(domain)
+        if created_after is not None:
+            clauses.append("created_at >= ?")
+            params.append(created_after)
+        if created_before is not None:
+            clauses.append("created_at <= ?")
+            params.append(created_before)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), tuple(params)
+
+
+def migrate_json_contexts(source_dir: str, store: SQLiteContextStore) -> Tuple[int, int]:
+    """
+    Import every <context_id>.json file in source_dir into the SQLite store.
+    Contexts already present are skipped, so the migration can be re-run safely.
+
+    Returns:
+        (imported, skipped) counts
+    """
+    imported = skipped = 0
+    json_store = JSONContextStore(source_dir)
+    for context in json_store.iter_contexts():
+        if store.import_context(context):
+            imported += 1
+        else:
+            skipped += 1
+    return imported, skipped
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import JSON context files into the SQLite context store.")
+    parser.add_argument("--source", default="context_storage", help="Directory containing <context_id>.json files.")
+    parser.add_argument("--db", default=os.environ.get("CONTEXT_DB_PATH", "context_storage/contexts.db"),
+                        help="SQLite database to import into.")
+    args = parser.parse_args()
+
+    imported, skipped = migrate_json_contexts(args.source, SQLiteContextStore(args.db))
+    print(f"Imported {imported} contexts into {args.db} ({skipped} already present).")
+
+
+if __name__ == "__main__":
+    main()
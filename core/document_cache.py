@@ -0,0 +1,156 @@
+"""
+Document Cache Module
+Caches extracted requirement text by file digest so re-uploaded documents skip parsing.
+Entries are stored as sharded JSON files of text segments with bounded disk usage and LRU eviction.
+"""
+
+import os
+import json
+import threading
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Union
+
+from .ingestion import iter_requirement_segments
+
+# Bump when extraction output changes so stale entries are not reused
+PARSER_VERSION = "1"
+
+
+class DocumentCache:
+    """
+    Disk cache of parsed documents keyed by content digest.
+
+    Each entry lives at <root>/<digest[:2]>/<key>.json and holds the document's text segments.
+    Access time is tracked with the file mtime; when the total size exceeds max_bytes the
+    least recently used entries are removed.
+    """
+
+    def __init__(self, root: str = "document_cache", max_bytes: int = 256 * 1024 * 1024):
+        self.root = root
+        self.max_bytes = max_bytes
+        os.makedirs(root, exist_ok=True)
+        self._lock = threading.Lock()
+        self._sizes = {}  # path -> size in bytes
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._load_index()
+
+    def get_segments(self, digest: str, extension: str) -> Optional[List[str]]:
+        """Return the cached segments for a document, or None on a miss."""
+        path = self._path(digest, extension)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                segments = json.load(f)
+            os.utime(path)  # mark as recently used
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return segments
+
+    def set_segments(self, digest: str, extension: str, segments: List[str]):
+        """Store a document's segments, then evict least recently used entries over budget."""
+        path = self._path(digest, extension)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(segments, f)
+        os.replace(temp_path, path)
+
+        size = os.path.getsize(path)
+        with self._lock:
+            self._total_bytes += size - self._sizes.get(path, 0)
+            self._sizes[path] = size
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._sizes),
+            "bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions
+        }
+
+    def _path(self, digest: str, extension: str) -> str:
+        key = f"{digest}-{extension.lstrip('.').lower()}-v{PARSER_VERSION}"
+        return os.path.join(self.root, digest[:2], f"{key}.json")
+
+    def _load_index(self):
+        for shard in os.scandir(self.root):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.endswith('.json'):
+                    size = entry.stat().st_size
+                    self._sizes[entry.path] = size
+                    self._total_bytes += size
+
+    def _evict(self):
+        """Remove least recently used entries until under budget (caller holds the lock)."""
+        by_age = []
+        for path in self._sizes:
+            try:
+                by_age.append((os.path.getmtime(path), path))
+            except OSError:
+                by_age.append((0, path))
+        by_age.sort()
+
+        for _, path in by_age:
+            if self._total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            self._total_bytes -= self._sizes.pop(path)
+            self.evictions += 1
+
+
+def iter_cached_segments(source: Union[str, BinaryIO], digest: str, filename: Optional[str] = None,
+                         cache: Optional[DocumentCache] = None) -> Iterator[str]:
+    """
+    Yield a document's text segments, from the cache when the digest is known,
+    otherwise by parsing the source (and caching the result once parsing completes).
+
+    Args:
+        source: File path or binary file-like object (see iter_requirement_segments)
+        digest: SHA-256 of the document content
+        filename: Name used for type detection when source is a file-like object
+    """
+    cache = cache or get_document_cache()
+    extension = os.path.splitext(filename or (source if isinstance(source, str) else ""))[1]
+    cached = cache.get_segments(digest, extension)
+    if cached is not None:
+        yield from cached
+        return
+
+    segments = []
+    for segment in iter_requirement_segments(source, filename):
+        segments.append(segment)
+        yield segment
+    cache.set_segments(digest, extension, segments)
+
+
+# Global document cache instance
+_document_cache = None
+
+def get_document_cache() -> DocumentCache:
+    """
+    Factory function to get the global document cache, configured with
+    DOCUMENT_CACHE_PATH (default document_cache) and DOCUMENT_CACHE_MAX_BYTES (default 256 MB).
+    """
+    global _document_cache
+    if _document_cache is None:
+        _document_cache = DocumentCache(
+            root=os.environ.get("DOCUMENT_CACHE_PATH", "document_cache"),
+            max_bytes=int(os.environ.get("DOCUMENT_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+        )
+    return _document_cache
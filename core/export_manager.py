@@ -3,13 +3,65 @@ Export Manager Module
 Handles export of test cases in multiple formats for integration with external systems.
 """
 
+import io
+import re
 import json
-import os
-from typing import List, Dict, Any, Optional
+import zipfile
+from concurrent.futures import Executor, as_completed
+from copy import deepcopy
+from typing import List, Dict, Any, BinaryIO, Iterable, Iterator, Optional, Union
 from datetime import datetime
-import xml.etree.ElementTree as ET
+from xml.sax.saxutils import XMLGenerator, escape
 import docx
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
 from docx.shared import Pt
+import openpyxl
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+from openpyxl.styles import Font
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.platypus import Paragraph, Preformatted, SimpleDocTemplate, Spacer
+
+from .concurrency import get_process_executor
+from .feature_analyzer import export_analysis_report
+from .gherkin import parse_gherkin
+from .traceability import build_traceability_matrix
+
+# Formats written incrementally: output is produced test case by test case with constant memory
+STREAMABLE_FORMATS = ("json", "gherkin", "xml")
+
+# Formats rendered into an in-memory buffer (see ExportManager.render)
+BINARY_FORMATS = ("docx", "excel", "pdf")
+
+EXPORT_MEDIA_TYPES = {
+    "json": "application/json",
+    "gherkin": "text/plain; charset=utf-8",
+    "xml": "application/xml",
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "excel": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "pdf": "application/pdf"
+}
+
+EXPORT_EXTENSIONS = {"json": "json", "gherkin": "feature", "xml": "xml", "docx": "docx", "excel": "xlsx", "pdf": "pdf"}
+
+# File name of each member of an export bundle (see ExportManager.export_bundle)
+BUNDLE_MEMBERS = {
+    "json": "test_cases.json",
+    "gherkin": "test_cases.feature",
+    "xml": "test_cases.xml",
+    "docx": "test_cases.docx",
+    "excel": "test_cases.xlsx",
+    "pdf": "test_cases.pdf",
+    "traceability": "traceability_matrix.json",
+    "gap_analysis": "gap_analysis.md"
+}
+
+DEFAULT_BUNDLE_FORMATS = ("json", "gherkin", "xml", "docx", "traceability", "gap_analysis")
+
+# Streamed output is coalesced into chunks of about this many characters
+EXPORT_CHUNK_CHARS = 64 * 1024
 
 class ExportManager:
     """Manages export of test cases in various formats for enterprise integration."""
@@ -17,145 +69,416 @@ class ExportManager:
     def __init__(self):
         self.supported_formats = ["json", "gherkin", "xml", "excel", "docx", "pdf"]
     
-    def export(self, test_cases: List[Dict[str, Any]], format: str, 
-               output_path: Optional[str] = None) -> str:
+    def export(self, test_cases: Iterable[Dict[str, Any]], format: str, 
+               output_path: Optional[str] = None) -> Union[str, bytes]:
         """
         Export test cases to specified format.
         
         Args:
-            test_cases: List of test case dictionaries
+            test_cases: List (or any iterable) of test case dictionaries
             format: Export format (json, gherkin, xml, excel, docx, pdf)
             output_path: Optional output file path
         
         Returns:
-            Exported content as string or file path
+            Exported content as string (bytes for BINARY_FORMATS) or file path
         """
         if format not in self.supported_formats:
             raise ValueError(f"Unsupported format: {format}. Supported: {self.supported_formats}")
         
-        if format == "json":
-            return self._export_json(test_cases, output_path)
-        elif format == "gherkin":
-            return self._export_gherkin(test_cases, output_path)
-        elif format == "xml":
-            return self._export_xml(test_cases, output_path)
-        elif format == "docx":
-            return self._export_docx(test_cases, output_path)
-        else:
-            raise NotImplementedError(f"Format {format} not yet implemented")
-    
-    def _export_json(self, test_cases: List[Dict[str, Any]], output_path: Optional[str]) -> str:
-        """Export as JSON."""
-        content = json.dumps({
-            "test_cases": test_cases,
-            "export_timestamp": datetime.now().isoformat(),
-            "total_tests": len(test_cases)
-        }, indent=2)
-        
+        if format in STREAMABLE_FORMATS:
+            chunks = self.iter_export(test_cases, format)
+            if output_path:
+                with open(output_path, 'w', encoding='utf-8') as f:
+                    for chunk in chunks:
+                        f.write(chunk)
+                return output_path
+            return "".join(chunks)
         if output_path:
-            with open(output_path, 'w') as f:
-                f.write(content)
+            self._write_binary(test_cases, format, output_path)
             return output_path
-        return content
+        return self.render(test_cases, format).getvalue()
     
-    def _export_gherkin(self, test_cases: List[Dict[str, Any]], output_path: Optional[str]) -> str:
-        """Export as Gherkin feature files."""
-        gherkin_content = []
+    def iter_export(self, test_cases: Iterable[Dict[str, Any]], format: str) -> Iterator[str]:
+        """
+        Yield the export in chunks of about EXPORT_CHUNK_CHARS characters, rendering one test
+        case at a time, so a file or StreamingResponse never holds the whole document.
+        Only STREAMABLE_FORMATS are supported.
+        """
+        writers = {"json": self._iter_json, "gherkin": self._iter_gherkin, "xml": self._iter_xml}
+        if format not in writers:
+            raise ValueError(f"Format {format} cannot be streamed. Streamable: {list(STREAMABLE_FORMATS)}")
+        return _coalesce(writers[format](test_cases))
+    
+    def _iter_json(self, test_cases: Iterable[Dict[str, Any]]) -> Iterator[str]:
+        """JSON array encoder: {"test_cases": [...], "export_timestamp": ..., "total_tests": n}."""
+        yield '{\n  "test_cases": ['
+        total = 0
         for tc in test_cases:
-            gherkin_content.append(tc.get('gherkin_feature', ''))
-        
-        content = "\n\n".join(gherkin_content)
-        
-        if output_path:
-            with open(output_path, 'w') as f:
-                f.write(content)
-            return output_path
-        return content
+            body = json.dumps(tc, indent=2).replace("\n", "\n    ")
+            yield f'{"," if total else ""}\n    {body}'
+            total += 1
+        yield '\n  ]' if total else ']'
+        yield f',\n  "export_timestamp": {json.dumps(datetime.now().isoformat())},\n  "total_tests": {total}\n}}'
+    
+    def _iter_gherkin(self, test_cases: Iterable[Dict[str, Any]]) -> Iterator[str]:
+        """Gherkin feature text, one test case after another."""
+        for i, tc in enumerate(test_cases):
+            yield ("\n\n" if i else "") + tc.get('gherkin_feature', '')
     
-    def _export_xml(self, test_cases: List[Dict[str, Any]], output_path: Optional[str]) -> str:
-        """Export as XML for requirements tools."""
-        root = ET.Element("testcases")
-        root.set("version", "1.0")
-        root.set("timestamp", datetime.now().isoformat())
+    def _iter_xml(self, test_cases: Iterable[Dict[str, Any]]) -> Iterator[str]:
+        """XML for requirements tools, written element by element with an XMLGenerator."""
+        buffer = io.StringIO()
+        xml = _IndentingXMLGenerator(buffer)
+        xml.startDocument()
+        xml.start("testcases", {"version": "1.0", "timestamp": datetime.now().isoformat()})
         
         for tc in test_cases:
-            tc_elem = ET.SubElement(root, "testcase")
-            tc_elem.set("id", tc.get('test_id', ''))
+            xml.start("testcase", {"id": tc.get('test_id', '')})
+            xml.element("requirement", tc.get('requirement_source', ''))
+            xml.element("gherkin", tc.get('gherkin_feature', ''))
             
-            ET.SubElement(tc_elem, "requirement").text = tc.get('requirement_source', '')
-            ET.SubElement(tc_elem, "gherkin").text = tc.get('gherkin_feature', '')
+            # Parsed scenarios
+            xml.start("scenarios")
+            for feature in parse_gherkin(tc.get('gherkin_feature', '')):
+                for scenario in feature.scenarios:
+                    attributes = {"feature": feature.name, "name": scenario.name}
+                    if scenario.tags:
+                        attributes["tags"] = " ".join(scenario.tags)
+                    xml.start("scenario", attributes)
+                    for step in scenario.background_steps(feature) + scenario.steps:
+                        xml.element("step", step.text, {"keyword": step.keyword})
+                    xml.end("scenario")
+            xml.end("scenarios")
             
             # Compliance
-            compliance_elem = ET.SubElement(tc_elem, "compliance")
-            compliance_elem.set("status", tc.get('compliance_assessment', {}).get('status', 'Unknown'))
-            
-            tags_elem = ET.SubElement(compliance_elem, "tags")
+            xml.start("compliance", {"status": tc.get('compliance_assessment', {}).get('status', 'Unknown')})
+            xml.start("tags")
             for tag in tc.get('compliance_tags', []):
-                ET.SubElement(tags_elem, "tag").text = tag
+                xml.element("tag", tag)
+            xml.end("tags")
+            xml.end("compliance")
             
             # Risk
-            risk_elem = ET.SubElement(tc_elem, "risk")
-            risk_elem.set("score", str(tc.get('risk_and_priority', {}).get('score', 0)))
+            xml.element("risk", None, {"score": str(tc.get('risk_and_priority', {}).get('score', 0))})
+            xml.end("testcase")
+            
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
         
-        tree = ET.ElementTree(root)
+        xml.end("testcases")
+        xml.endDocument()
+        yield buffer.getvalue() + "\n"
+    
+    def render(self, test_cases: Iterable[Dict[str, Any]], format: str) -> io.BytesIO:
+        """Render a binary format (see BINARY_FORMATS) into an in-memory buffer positioned at the start."""
+        if format not in BINARY_FORMATS:
+            raise ValueError(f"Format {format} is not a binary format. Binary: {list(BINARY_FORMATS)}")
+        buffer = io.BytesIO()
+        self._write_binary(test_cases, format, buffer)
+        buffer.seek(0)
+        return buffer
+    
+    def export_bundle(self, test_cases: Iterable[Dict[str, Any]], formats: Iterable[str] = DEFAULT_BUNDLE_FORMATS,
+                      requirement_text: Optional[str] = None, gap_analysis: Optional[Dict[str, Any]] = None,
+                      target: Optional[BinaryIO] = None, executor: Optional[Executor] = None) -> BinaryIO:
+        """
+        Render several formats at once into a single ZIP archive (see BUNDLE_MEMBERS).
         
-        if output_path:
-            tree.write(output_path, encoding='utf-8', xml_declaration=True)
-            return output_path
+        The test cases are encoded once and every format is rendered concurrently in the
+        shared process pool, so the bundle takes about as long as its slowest format.
+        Members are added to the archive as they finish.
+        
+        Args:
+            test_cases: List (or any iterable) of test case dictionaries
+            formats: Bundle members to include (keys of BUNDLE_MEMBERS)
+            requirement_text: Requirement document, needed for "traceability"
+            gap_analysis: Result of analyze_feature_gaps(), needed for "gap_analysis"
+            target: Binary file object to write the ZIP to (default: a new in-memory buffer)
+            executor: Executor to render on (default: the shared process pool)
+        
+        Returns:
+            The target, or the in-memory buffer positioned at the start
+        """
+        formats = list(dict.fromkeys(formats))
+        unknown = [format for format in formats if format not in BUNDLE_MEMBERS]
+        if unknown:
+            raise ValueError(f"Unsupported bundle formats: {unknown}. Supported: {list(BUNDLE_MEMBERS)}")
+        if "traceability" in formats and requirement_text is None:
+            raise ValueError("The traceability matrix needs requirement_text")
+        if "gap_analysis" in formats and gap_analysis is None:
+            raise ValueError("The gap report needs gap_analysis")
+        
+        # One JSON encoding shared by every task instead of pickling the dicts per format
+        payload = json.dumps(list(test_cases))
+        executor = executor or get_process_executor()
+        futures = {
+            executor.submit(_render_bundle_member, format, payload,
+                            requirement_text if format == "traceability" else None): format
+            for format in formats if format != "gap_analysis"
+        }
+        
+        output = target if target is not None else io.BytesIO()
+        try:
+            with zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED) as bundle:
+                if "gap_analysis" in formats:
+                    bundle.writestr(BUNDLE_MEMBERS["gap_analysis"], export_analysis_report(gap_analysis, "markdown"))
+                for future in as_completed(futures):
+                    format = futures[future]
+                    # DOCX and XLSX are ZIP files already
+                    compress_type = zipfile.ZIP_STORED if format in ("docx", "excel") else None
+                    bundle.writestr(BUNDLE_MEMBERS[format], future.result(), compress_type=compress_type)
+        finally:
+            for future in futures:
+                future.cancel()
+        if target is None:
+            output.seek(0)
+        return output
+    
+    def _write_binary(self, test_cases: Iterable[Dict[str, Any]], format: str, target: Union[str, BinaryIO]):
+        """Write a binary format to a file path or a binary file object."""
+        if format == "docx":
+            self._render_docx(list(test_cases)).save(target)
+        elif format == "excel":
+            self._write_excel(test_cases, target)
+        elif format == "pdf":
+            self._write_pdf(list(test_cases), target)
+        else:
+            raise ValueError(f"Unsupported format: {format}. Supported: {self.supported_formats}")
+    
+    def _write_excel(self, test_cases: Iterable[Dict[str, Any]], target: Union[str, BinaryIO]):
+        """
+        Excel workbook with one row per test case, written with openpyxl's write-only mode:
+        rows are streamed to disk as they are appended, so memory stays flat for 50k+ rows.
+        """
+        workbook = openpyxl.Workbook(write_only=True)
+        sheet = workbook.create_sheet("Test Cases")
+        sheet.freeze_panes = "A2"
+        for column, width in zip("ABCDEFGHI", (12, 50, 70, 16, 60, 30, 10, 60, 12)):
+            sheet.column_dimensions[column].width = width
+        
+        header = []
+        for title in EXCEL_COLUMNS:
+            cell = WriteOnlyCell(sheet, value=title)
+            cell.font = Font(bold=True)
+            header.append(cell)
+        sheet.append(header)
+        
+        for tc in test_cases:
+            compliance = tc.get('compliance_assessment', {})
+            risk = tc.get('risk_and_priority', {})
+            gdpr = tc.get('gdpr_compliance') or {}
+            sheet.append([
+                _excel_text(tc.get('test_id', '')),
+                _excel_text(tc.get('requirement_source', '')),
+                _excel_text(tc.get('gherkin_feature', '').rstrip("\n")),
+                _excel_text(compliance.get('status', 'Unknown')),
+                _excel_text(compliance.get('reasoning', '')),
+                _excel_text(', '.join(tc.get('compliance_tags', []))),
+                risk.get('score', 0),
+                _excel_text(risk.get('reasoning', '')),
+                "Yes" if gdpr.get('applies') else "No"
+            ])
+        workbook.save(target)
+    
+    def _write_pdf(self, test_cases: List[Dict[str, Any]], target: Union[str, BinaryIO]):
+        """
+        PDF laid out with reportlab's platypus: one small flowable per field, so pages break
+        between paragraphs and Gherkin lines instead of drawing one giant text object.
+        """
+        styles = getSampleStyleSheet()
+        code_style = ParagraphStyle('Gherkin', parent=styles['Code'], fontSize=8, leading=10)
+        document = SimpleDocTemplate(target, pagesize=letter, title="Test Cases Export",
+                                     leftMargin=54, rightMargin=54, topMargin=54, bottomMargin=54)
         
-        # Return as string
-        ET.indent(tree, space="  ")
-        return ET.tostring(root, encoding='unicode')
+        story = [
+            Paragraph('Test Cases Export', styles['Title']),
+            Paragraph(f'Generated: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}', styles['Normal']),
+            Paragraph(f'Total Test Cases: {len(test_cases)}', styles['Normal'])
+        ]
+        for tc in test_cases:
+            compliance = tc.get('compliance_assessment', {})
+            risk = tc.get('risk_and_priority', {})
+            story.append(Spacer(1, 12))
+            story.append(Paragraph(_pdf_text(f"Test ID: {tc.get('test_id')}"), styles['Heading2']))
+            fields = (
+                ("Requirement Source", tc.get('requirement_source', '')),
+                ("Compliance", f"{compliance.get('status', 'Unknown')} - {compliance.get('reasoning', '')}"),
+                ("Compliance Tags", ', '.join(tc.get('compliance_tags', []))),
+                ("Risk", f"{risk.get('score', 0)}/10 - {risk.get('reasoning', '')}")
+            )
+            for label, value in fields:
+                story.append(Paragraph(f"<b>{label}:</b> {_pdf_text(value)}", styles['Normal']))
+            gherkin = tc.get('gherkin_feature', '').rstrip("\n")
+            if gherkin:
+                story.append(Preformatted(_XML_INVALID.sub("", gherkin), code_style, maxLineLength=110))
+        document.build(story)
     
-    def _export_docx(self, test_cases: List[Dict[str, Any]], output_path: Optional[str]) -> str:
-        """Export as Word document with proper formatting."""
+    def _render_docx(self, test_cases: List[Dict[str, Any]]) -> "docx.document.Document":
+        """
+        Word document with a heading and a two-column field table per test case.
+        The heading and table are built once through python-docx and then cloned per test
+        case, which is far cheaper than styling a dozen paragraphs for each one.
+        """
         doc = docx.Document()
         
         # Title
-        title = doc.add_heading('Test Cases Export', 0)
+        doc.add_heading('Test Cases Export', 0)
         
         # Metadata
         doc.add_paragraph(f'Generated: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}')
         doc.add_paragraph(f'Total Test Cases: {len(test_cases)}')
         
+        heading, table = _docx_prototypes(doc)
+        anchor = doc.element.body.find(qn('w:sectPr'))
         for tc in test_cases:
-            doc.add_page_break()
-            
-            # Test Case Header
-            doc.add_heading(f"Test ID: {tc.get('test_id')}", level=1)
-            
-            # Requirement Source
-            doc.add_paragraph('Requirement Source:', style='Heading 2')
-            doc.add_paragraph(tc.get('requirement_source', ''))
-            
-            # Gherkin
-            doc.add_paragraph('Gherkin Feature:', style='Heading 2')
-            doc.add_paragraph(tc.get('gherkin_feature', ''), style='Preformatted')
-            
-            # Compliance
-            doc.add_paragraph('Compliance Assessment:', style='Heading 2')
             compliance = tc.get('compliance_assessment', {})
-            doc.add_paragraph(f"Status: {compliance.get('status', 'Unknown')}")
-            doc.add_paragraph(f"Reasoning: {compliance.get('reasoning', '')}")
+            risk = tc.get('risk_and_priority', {})
+            values = (
+                tc.get('requirement_source', ''),
+                tc.get('gherkin_feature', '').rstrip("\n"),
+                compliance.get('status', 'Unknown'),
+                compliance.get('reasoning', ''),
+                ', '.join(tc.get('compliance_tags', [])),
+                f"{risk.get('score', 0)}/10",
+                risk.get('reasoning', '')
+            )
             
-            # Tags
-            tags = tc.get('compliance_tags', [])
-            if tags:
-                doc.add_paragraph('Compliance Tags:', style='Heading 2')
-                doc.add_paragraph(', '.join(tags))
+            heading_element = deepcopy(heading)
+            _set_run_text(heading_element.find(qn('w:r')), f"Test ID: {tc.get('test_id')}")
+            anchor.addprevious(heading_element)
             
-            # Risk
-            risk = tc.get('risk_and_priority', {})
-            doc.add_paragraph('Risk Assessment:', style='Heading 2')
-            doc.add_paragraph(f"Score: {risk.get('score', 0)}/10")
-            doc.add_paragraph(f"Reasoning: {risk.get('reasoning', '')}")
+            table_element = deepcopy(table)
+            for row, value in zip(table_element.iterfind(qn('w:tr')), values):
+                value_cell = row.findall(qn('w:tc'))[1]
+                _set_run_text(value_cell.find(qn('w:p')).find(qn('w:r')), str(value))
+            anchor.addprevious(table_element)
         
-        if output_path:
-            doc.save(output_path)
-            return output_path
-        
-        # For string return, save to temp file
-        temp_path = f"temp_export_{int(datetime.now().timestamp())}.docx"
-        doc.save(temp_path)
-        return temp_path
+        return doc
+
+
+class _IndentingXMLGenerator(XMLGenerator):
+    """XMLGenerator that indents nested elements by two spaces, like ElementTree.indent."""
+
+    def __init__(self, out):
+        super().__init__(out, encoding="utf-8", short_empty_elements=True)
+        self._depth = 0
+        self._has_children = []
+
+    def start(self, name: str, attributes: Optional[Dict[str, str]] = None):
+        if self._has_children:
+            self._has_children[-1] = True
+        if self._depth:
+            self.ignorableWhitespace("\n" + "  " * self._depth)
+        self.startElement(name, attributes or {})
+        self._depth += 1
+        self._has_children.append(False)
+
+    def end(self, name: str):
+        self._depth -= 1
+        if self._has_children.pop():
+            self.ignorableWhitespace("\n" + "  " * self._depth)
+        self.endElement(name)
+
+    def element(self, name: str, text: Optional[str], attributes: Optional[Dict[str, str]] = None):
+        """A leaf element with optional text content."""
+        self.start(name, attributes)
+        if text:
+            self.characters(text)
+        self._depth -= 1
+        self._has_children.pop()
+        self.endElement(name)
+
+
+# Field rows of the per-test-case DOCX table, in order
+DOCX_FIELDS = (
+    "Requirement Source",
+    "Gherkin Feature",
+    "Compliance Status",
+    "Compliance Reasoning",
+    "Compliance Tags",
+    "Risk Score",
+    "Risk Reasoning"
+)
+
+# Characters Word cannot store in XML
+_XML_INVALID = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+def _docx_prototypes(doc):
+    """Build the per-test-case heading and field table once, detached from the document."""
+    heading = doc.add_heading("Test ID", level=1)._p
+    table = doc.add_table(rows=len(DOCX_FIELDS), cols=2)
+    table.style = 'Table Grid'
+    for row, label in zip(table.rows, DOCX_FIELDS):
+        row.cells[0].paragraphs[0].add_run(label).bold = True
+        value_run = row.cells[1].paragraphs[0].add_run("")
+        if label == "Gherkin Feature":
+            value_run.font.name = "Courier New"
+            value_run.font.size = Pt(9)
+    for element in (heading, table._tbl):
+        element.getparent().remove(element)
+    return heading, table._tbl
+
+
+def _set_run_text(run, text: str):
+    """Replace a run's content with text, keeping its formatting; newlines become line breaks."""
+    for child in list(run):
+        if child.tag != qn('w:rPr'):
+            run.remove(child)
+    for i, line in enumerate(_XML_INVALID.sub("", text).split("\n")):
+        if i:
+            run.append(OxmlElement('w:br'))
+        text_element = OxmlElement('w:t')
+        text_element.text = line
+        text_element.set(qn('xml:space'), 'preserve')
+        run.append(text_element)
+
+
+# Columns of the Excel export, in order
+EXCEL_COLUMNS = (
+    "Test ID",
+    "Requirement Source",
+    "Gherkin Feature",
+    "Compliance Status",
+    "Compliance Reasoning",
+    "Compliance Tags",
+    "Risk Score",
+    "Risk Reasoning",
+    "GDPR Applies"
+)
+
+# Excel rejects longer cell values
+EXCEL_MAX_CELL_CHARS = 32767
+
+
+def _excel_text(value: Any) -> str:
+    return ILLEGAL_CHARACTERS_RE.sub("", str(value))[:EXCEL_MAX_CELL_CHARS]
+
+
+def _pdf_text(value: Any) -> str:
+    """Escape text for a reportlab Paragraph, which parses inline markup."""
+    return escape(_XML_INVALID.sub("", str(value))).replace("\n", "<br/>")
+
+
+def _render_bundle_member(format: str, payload: str, requirement_text: Optional[str] = None) -> bytes:
+    """Render one bundle member from JSON-encoded test cases (runs in a worker process)."""
+    test_cases = json.loads(payload)
+    if format == "traceability":
+        return json.dumps(build_traceability_matrix(requirement_text, test_cases), indent=2).encode("utf-8")
+    if format in STREAMABLE_FORMATS:
+        return ExportManager().export(test_cases, format).encode("utf-8")
+    return ExportManager().render(test_cases, format).getvalue()
+
 
+def _coalesce(chunks: Iterator[str], size: int = EXPORT_CHUNK_CHARS) -> Iterator[str]:
+    """Join small chunks into pieces of about size characters."""
+    pending, pending_size = [], 0
+    for chunk in chunks:
+        pending.append(chunk)
+        pending_size += len(chunk)
+        if pending_size >= size:
+            yield "".join(pending)
+            pending, pending_size = [], 0
+    if pending:
+        yield "".join(pending)
@@ -4,35 +4,218 @@ Provides AI-powered feature gap analysis to identify missing functionality.
 """
 
 import google.generativeai as genai
+import os
 import json
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 
+from .cache import get_response_cache, make_cache_key, normalize_text
+from .singleflight import get_single_flight
+
+MODEL_NAME = 'gemini-2.5-flash'
+
+# Bump when the gap analysis prompts change so cached analyses are not reused
+GAP_PROMPT_VERSION = "1"
+
+# Metadata attached to an analysis after the model call, left out of incremental prompts
+_ANALYSIS_METADATA = ("timestamp", "total_tests", "analysis_mode", "delta")
+
+
+def get_incremental_max_delta() -> float:
+    """
+    Largest change, as a fraction of the test set, re-analyzed incrementally rather than
+    from scratch; configured with GAP_INCREMENTAL_MAX_DELTA (0 disables incremental analysis).
+    """
+    return float(os.environ.get("GAP_INCREMENTAL_MAX_DELTA", 0.5))
+
+
 def analyze_feature_gaps(requirement_text: str, generated_tests: List[Dict[str, Any]], 
-                         domain: str = "healthcare software") -> Dict[str, Any]:
+                         domain: str = "healthcare software", use_cache: bool = True,
+                         incremental: bool = True) -> Dict[str, Any]:
     """
     AI-powered feature gap analysis to identify missing functionality in test coverage.
     
     Implements the "Provide Feature Gap Analysis" step from the architecture.
     
+    Results are cached by requirement hash plus test-set hash. When the same requirement was
+    analyzed before with a slightly different test set, only the added and removed tests are
+    sent along with the previous analysis, and the model's changes are merged into it.
+    
     Args:
         requirement_text: Original requirement text
         generated_tests: List of generated test cases
         domain: Domain context
+        use_cache: Serve and store results in the response cache
+        incremental: Allow re-analysis from the previous analysis of the same requirement
     
     Returns:
         Analysis results including gaps, recommendations, and coverage metrics
     """
-    # Extract features from generated tests
-    test_features = []
+    cache = get_response_cache() if use_cache else None
+    cache_key, baseline_key, summaries = _gap_analysis_keys(requirement_text, generated_tests, domain)
+    if cache is not None:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+    
+    try:
+        prompt, delta = _plan_gap_analysis(requirement_text, generated_tests, domain, summaries,
+                                           cache.get(baseline_key) if cache is not None and incremental else None)
+        model = genai.GenerativeModel(MODEL_NAME)
+        response = model.generate_content(prompt)
+        analysis = _finish_gap_analysis(response, generated_tests, delta)
+    
+    except Exception as e:
+        return {
+            "error": f"Failed to analyze feature gaps: {str(e)}",
+            "overall_coverage_score": 0
+        }
+    
+    if cache is not None:
+        _store_gap_analysis(cache, cache_key, baseline_key, summaries, analysis)
+    return analysis
+
+
+async def aanalyze_feature_gaps(requirement_text: str, generated_tests: List[Dict[str, Any]],
+                                domain: str = "healthcare software", use_cache: bool = True,
+                                incremental: bool = True) -> Dict[str, Any]:
+    """
+    Async variant of analyze_feature_gaps using the SDK's async client,
+    so API handlers don't block the event loop while the model runs.
+    Concurrent calls for the same requirement and test set are coalesced into one model call.
+    """
+    cache = get_response_cache() if use_cache else None
+    cache_key, baseline_key, summaries = _gap_analysis_keys(requirement_text, generated_tests, domain)
+    if cache is not None:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+    
+    async def analyze():
+        prompt, delta = _plan_gap_analysis(requirement_text, generated_tests, domain, summaries,
+                                           cache.get(baseline_key) if cache is not None and incremental else None)
+        model = genai.GenerativeModel(MODEL_NAME)
+        response = await model.generate_content_async(prompt)
+        return _finish_gap_analysis(response, generated_tests, delta)
+    
+    try:
+        analysis = await get_single_flight("gap_analysis").do(cache_key, analyze)
+    
+    except Exception as e:
+        return {
+            "error": f"Failed to analyze feature gaps: {str(e)}",
+            "overall_coverage_score": 0
+        }
+    
+    if cache is not None:
+        _store_gap_analysis(cache, cache_key, baseline_key, summaries, analysis)
+    return analysis
+
+
+def _test_summary(test: Dict[str, Any]) -> Dict[str, Any]:
+    """The part of a test case the model sees."""
+    return {
+        "test_id": test.get("test_id"),
+        "requirement_source": test.get("requirement_source"),
+        "description": test.get("gherkin_feature", "")[:200]  # First 200 chars
+    }
+
+
+def _gap_analysis_keys(requirement_text: str, generated_tests: List[Dict[str, Any]],
+                       domain: str) -> Tuple[str, str, Dict[str, Dict[str, Any]]]:
+    """
+    Cache keys for an analysis and for the latest analysis of the same requirement (the
+    baseline for incremental re-analysis), plus the test summaries keyed by their hash.
+    Tests are hashed by content (requirement source and scenario text) only, so the test-set
+    hash ignores test order and renumbered or regenerated IDs.
+    """
+    summaries = {}
     for test in generated_tests:
-        test_features.append({
-            "test_id": test.get("test_id"),
-            "requirement_source": test.get("requirement_source"),
-            "description": test.get("gherkin_feature", "")[:200]  # First 200 chars
-        })
+        digest = make_cache_key(test.get("requirement_source"), test.get("gherkin_feature", ""))
+        summaries[digest] = _test_summary(test)
+    scope = (make_cache_key(normalize_text(requirement_text)), normalize_text(domain).lower(), GAP_PROMPT_VERSION, MODEL_NAME)
+    return (
+        make_cache_key("gap_analysis", *scope, sorted(summaries)),
+        make_cache_key("gap_analysis_baseline", *scope),
+        summaries
+    )
+
+
+def _plan_gap_analysis(requirement_text: str, generated_tests: List[Dict[str, Any]], domain: str,
+                       summaries: Dict[str, Dict[str, Any]],
+                       baseline: Optional[Dict[str, Any]]) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """
+    Choose between a full and an incremental analysis.
+    Returns the prompt and, for an incremental one, the previous analysis and the delta.
+    """
+    if baseline is not None:
+        previous_tests = baseline["tests"]
+        added = [summary for digest, summary in summaries.items() if digest not in previous_tests]
+        removed = [summary for digest, summary in previous_tests.items() if digest not in summaries]
+        if len(added) + len(removed) <= get_incremental_max_delta() * len(summaries):
+            previous = {key: value for key, value in baseline["analysis"].items() if key not in _ANALYSIS_METADATA}
+            delta = {"previous": previous, "added": added, "removed": removed}
+            return _build_incremental_gap_prompt(requirement_text, delta, domain), delta
+    return _build_gap_analysis_prompt(requirement_text, generated_tests, domain), None
+
+
+def _finish_gap_analysis(response, generated_tests: List[Dict[str, Any]],
+                         delta: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    analysis = _parse_gap_analysis_response(response, generated_tests)
+    if delta is None:
+        analysis["analysis_mode"] = "full"
+        return analysis
+    merged = _merge_gap_analysis(delta["previous"], analysis)
+    merged["analysis_mode"] = "incremental"
+    merged["delta"] = {"added_tests": len(delta["added"]), "removed_tests": len(delta["removed"])}
+    return merged
+
+
+def _store_gap_analysis(cache, cache_key: str, baseline_key: str,
+                        summaries: Dict[str, Dict[str, Any]], analysis: Dict[str, Any]):
+    """Cache a successful analysis and make it the baseline for the next incremental one."""
+    cache.set(cache_key, analysis)
+    cache.set(baseline_key, {"tests": summaries, "analysis": analysis})
+
+
+def _merge_gap_analysis(previous: Dict[str, Any], changes: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Apply an incremental response to the previous analysis. The result is the new analysis
+    (score and any summary fields), with the previous findings carried over into its
+    finding lists: findings reported as resolved are dropped and ones already listed are skipped.
+    """
+    resolved_features = {str(name).lower() for name in changes.get("resolved_features", [])}
+    resolved_gaps = {str(gap).lower() for gap in changes.get("resolved_compliance_gaps", [])}
+    
+    def merge(items, new_items, identity, resolved=frozenset()):
+        kept = [item for item in items if identity(item) not in resolved]
+        seen = {identity(item) for item in kept}
+        for item in new_items:
+            if identity(item) not in seen:
+                seen.add(identity(item))
+                kept.append(item)
+        return kept
     
-    prompt = f"""You are a senior QA architect specializing in {domain} with expertise in FDA, HIPAA, GDPR compliance.
+    merged = {key: value for key, value in changes.items()
+              if key not in ("resolved_features", "resolved_compliance_gaps")}
+    merged["missing_features"] = merge(previous.get("missing_features", []), changes.get("missing_features", []),
+                                       lambda item: str(item.get("feature", "")).lower(), resolved_features)
+    merged["compliance_gaps"] = merge(previous.get("compliance_gaps", []), changes.get("compliance_gaps", []),
+                                      lambda item: str(item.get("gap", "")).lower(), resolved_gaps)
+    merged["recommendations"] = merge(previous.get("recommendations", []), changes.get("recommendations", []),
+                                      lambda item: str(item).lower())
+    merged["priority_actions"] = merge(previous.get("priority_actions", []), changes.get("priority_actions", []),
+                                       lambda item: str(item.get("action", "")).lower())
+    return merged
+
+
+def _build_gap_analysis_prompt(requirement_text: str, generated_tests: List[Dict[str, Any]],
+                               domain: str) -> str:
+    """Build the gap analysis prompt from the requirements and a summary of each test."""
+    # Extract features from generated tests
+    test_features = [_test_summary(test) for test in generated_tests]
+    
+    return f"""You are a senior QA architect specializing in {domain} with expertise in FDA, HIPAA, GDPR compliance.
 
 Your task is to analyze the requirements and generated test cases to identify FEATURE GAPS - functionality that may not have adequate test coverage.
 
@@ -84,25 +267,77 @@ Your output MUST be a single, valid JSON object with this structure:
 
 Produce the JSON output now.
 """
+
+
+def _build_incremental_gap_prompt(requirement_text: str, delta: Dict[str, Any], domain: str) -> str:
+    """Build a prompt that updates a previous analysis for added and removed tests only."""
+    return f"""You are a senior QA architect specializing in {domain} with expertise in FDA, HIPAA, GDPR compliance.
+
+A feature gap analysis was already done for these requirements. Since then test cases were added
+and removed. Update the analysis for this change only.
+
+--- ORIGINAL REQUIREMENTS ---
+{requirement_text}
+
+--- PREVIOUS ANALYSIS ---
+{json.dumps(delta["previous"])}
+
+--- ADDED TEST CASES ---
+{json.dumps(delta["added"], indent=2)}
+
+--- REMOVED TEST CASES ---
+{json.dumps(delta["removed"], indent=2)}
+
+--- ANALYSIS REQUIRED ---
+1. Which previous missing features and compliance gaps do the added tests now cover?
+2. Which new gaps do the removed tests leave open?
+3. What is the overall coverage score now?
+
+Your output MUST be a single, valid JSON object with this structure, listing only changes:
+{{
+  "overall_coverage_score": <integer 0-100>,
+  "resolved_features": ["<feature name from the previous analysis that is now covered>"],
+  "resolved_compliance_gaps": ["<gap text from the previous analysis that is now covered>"],
+  "missing_features": [
+    {{
+      "feature": "<new feature name>",
+      "severity": "high|medium|low",
+      "reason": "<explanation>",
+      "recommended_test_type": "<test type>"
+    }}
+  ],
+  "compliance_gaps": [
+    {{
+      "standard": "FDA|HIPAA|GDPR|ISO 13485|IEC 62304",
+      "gap": "<new specific gap>",
+      "risk": "<risk description>"
+    }}
+  ],
+  "recommendations": [
+    "<new specific recommendation>"
+  ],
+  "priority_actions": [
+    {{
+      "action": "<new specific action>",
+      "priority": "P0|P1|P2|P3"
+    }}
+  ]
+}}
+
+Produce the JSON output now.
+"""
+
+
+def _parse_gap_analysis_response(response, generated_tests: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Decode the model's JSON analysis and attach metadata."""
+    cleaned_response = response.text.strip().replace("```json", "").replace("```", "").strip()
+    analysis = json.loads(cleaned_response)
     
-    try:
-        model = genai.GenerativeModel('gemini-2.5-flash')
-        response = model.generate_content(prompt)
-        
-        cleaned_response = response.text.strip().replace("```json", "").replace("```", "").strip()
-        analysis = json.loads(cleaned_response)
-        
-        # Add metadata
-        analysis["timestamp"] = datetime.now().isoformat()
-        analysis["total_tests"] = len(generated_tests)
-        
-        return analysis
+    # Add metadata
+    analysis["timestamp"] = datetime.now().isoformat()
+    analysis["total_tests"] = len(generated_tests)
     
-    except Exception as e:
-        return {
-            "error": f"Failed to analyze feature gaps: {str(e)}",
-            "overall_coverage_score": 0
-        }
+    return analysis
 
 
 def export_analysis_report(analysis: Dict[str, Any], format: str = "json") -> str:
@@ -0,0 +1,299 @@
+"""
+Gherkin Module
+Parses generated Gherkin once into a compact feature/scenario/step model shared by
+the ALM sinks and exports, so scenarios stay attached to their own feature and background.
+"""
+
+import re
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+FEATURE_KEYWORDS = ("Feature",)
+BACKGROUND_KEYWORDS = ("Background",)
+SCENARIO_KEYWORDS = ("Scenario Outline", "Scenario Template", "Scenario", "Example")
+EXAMPLES_KEYWORDS = ("Examples", "Scenarios")
+RULE_KEYWORDS = ("Rule",)
+STEP_KEYWORDS = ("Given", "When", "Then", "And", "But", "*")
+
+_HEADER = re.compile(
+    r"^(%s)\s*:\s*(.*)$" % "|".join(
+        re.escape(keyword) for keyword in
+        FEATURE_KEYWORDS + BACKGROUND_KEYWORDS + SCENARIO_KEYWORDS + EXAMPLES_KEYWORDS + RULE_KEYWORDS
+    )
+)
+_STEP = re.compile(r"^(%s)\s+(.*)$" % "|".join(re.escape(keyword) for keyword in STEP_KEYWORDS))
+_DOC_STRING = re.compile(r'^("""|```)')
+
+
+class Step:
+    __slots__ = ("keyword", "text", "doc_string", "data_table")
+
+    def __init__(self, keyword: str, text: str):
+        self.keyword = keyword
+        self.text = text
+        self.doc_string: Optional[str] = None
+        self.data_table: Optional[List[List[str]]] = None
+
+
+class Examples:
+    __slots__ = ("keyword", "name", "tags", "header", "rows")
+
+    def __init__(self, keyword: str, name: str, tags: List[str]):
+        self.keyword = keyword
+        self.name = name
+        self.tags = tags
+        self.header: List[str] = []
+        self.rows: List[List[str]] = []
+
+
+class Scenario:
+    __slots__ = ("keyword", "name", "tags", "steps", "examples", "source", "rule_source", "rule_background")
+
+    def __init__(self, keyword: str, name: str, tags: List[str]):
+        self.keyword = keyword
+        self.name = name
+        self.tags = tags
+        self.steps: List[Step] = []
+        self.examples: List[Examples] = []
+        # Original text of the scenario (tags, comments and description included) and of the
+        # enclosing Rule block header, if any
+        self.source = ""
+        self.rule_source: Optional[str] = None
+        # Background steps of the enclosing Rule; they run after the feature's own background
+        self.rule_background: Optional[List[Step]] = None
+
+    @property
+    def title(self) -> str:
+        """The scenario line as written, e.g. "Scenario: Login succeeds"."""
+        return f"{self.keyword}: {self.name}".rstrip()
+
+    def background_steps(self, feature: "Feature") -> List[Step]:
+        """Steps run before this scenario: the feature background, then the Rule background."""
+        return (feature.background or []) + (self.rule_background or [])
+
+
+class Feature:
+    __slots__ = ("name", "description", "tags", "background", "scenarios", "source", "header_source")
+
+    def __init__(self, name: str, tags: List[str]):
+        self.name = name
+        self.description = ""
+        self.tags = tags
+        self.background: Optional[List[Step]] = None
+        self.scenarios: List[Scenario] = []
+        # Original text of the whole feature, and of everything before its first scenario or
+        # rule (tags, Feature line, description, Background)
+        self.source = ""
+        self.header_source = ""
+
+    def render(self, scenarios: Optional[List[Scenario]] = None) -> str:
+        """
+        Gherkin text for the feature as written, limited to the given scenarios if provided:
+        the feature header, then each scenario preceded by the header of its Rule.
+        """
+        if scenarios is None:
+            return self.source + "\n"
+        parts = [self.header_source] if self.header_source else []
+        rule_source = None
+        for scenario in scenarios:
+            if scenario.rule_source and scenario.rule_source != rule_source:
+                parts.append(scenario.rule_source)
+            rule_source = scenario.rule_source
+            parts.append(scenario.source)
+        return "\n\n".join(parts) + "\n"
+
+    def render_scenario(self, scenario: Scenario) -> str:
+        return self.render([scenario])
+
+
+def _source(lines: List[str]) -> str:
+    """Join original lines, dropping trailing blank lines."""
+    end = len(lines)
+    while end and not lines[end - 1].strip():
+        end -= 1
+    return "\n".join(lines[:end])
+
+
+def _table_cells(line: str) -> List[str]:
+    return [cell.strip() for cell in line.strip()[1:-1].split("|")]
+
+
+def parse_gherkin(text: str) -> Tuple[Feature, ...]:
+    """
+    Parse Gherkin text into features (one text may hold several).
+
+    Scenarios that appear before any Feature line get an unnamed feature. Scenarios inside a
+    Rule stay on the feature and keep the Rule's background. Comments and a Markdown code
+    fence around the text are ignored. Results are cached, so
+    parsing the same test case again is free; treat the returned model as read-only.
+    """
+    return _parse_cached(text or "")
+
+
+@lru_cache(maxsize=1024)
+def _parse_cached(text: str) -> Tuple[Feature, ...]:
+    features: List[Feature] = []
+    feature: Optional[Feature] = None
+    scenario: Optional[Scenario] = None
+    examples: Optional[Examples] = None
+    steps: Optional[List[Step]] = None
+    pending_tags: List[str] = []
+    in_description = False
+    doc_string: Optional[Tuple[str, List[str], int]] = None
+    # Source tracking: the open block ("feature" header, "rule" header or "scenario") and
+    # where it starts; tags and comments right above a header belong to that header
+    lines = _strip_code_fence(text.splitlines())
+    block: Optional[Tuple[str, Any, int]] = None
+    feature_start = 0
+    prelude_start: Optional[int] = None
+    rule_source: Optional[str] = None
+    in_rule = False
+    rule_background: Optional[List[Step]] = None
+
+    for index, raw_line in enumerate(lines):
+        line = raw_line.strip()
+
+        if doc_string is not None:
+            delimiter, doc_lines, indent = doc_string
+            if line.startswith(delimiter):
+                steps[-1].doc_string = "\n".join(doc_lines)
+                doc_string = None
+            else:
+                doc_lines.append(raw_line[indent:] if raw_line[:indent].isspace() else raw_line.strip())
+            continue
+
+        if not line or line.startswith("#"):
+            if not line and in_description and feature.description:
+                feature.description += "\n"
+            if line and prelude_start is None:
+                prelude_start = index
+            continue
+
+        if line.startswith("@"):
+            pending_tags.extend(tag for tag in line.split() if tag.startswith("@"))
+            if prelude_start is None:
+                prelude_start = index
+            continue
+
+        header = _HEADER.match(line)
+        start = index if prelude_start is None else prelude_start
+        prelude_start = None
+
+        if _DOC_STRING.match(line):
+            if steps:
+                doc_string = (line[:3], [], len(raw_line) - len(raw_line.lstrip()))
+            continue
+
+        if line.startswith("|") and line.endswith("|"):
+            cells = _table_cells(line)
+            if examples is not None:
+                if examples.header:
+                    examples.rows.append(cells)
+                else:
+                    examples.header = cells
+            elif steps:
+                if steps[-1].data_table is None:
+                    steps[-1].data_table = []
+                steps[-1].data_table.append(cells)
+            continue
+
+        if header:
+            keyword, name = header.group(1), header.group(2).strip()
+            tags, pending_tags = pending_tags, []
+            in_description = False
+            if keyword in FEATURE_KEYWORDS or keyword in SCENARIO_KEYWORDS or keyword in RULE_KEYWORDS:
+                rule_source = _close_block(block, lines, start, rule_source)
+                block = None
+            if keyword in FEATURE_KEYWORDS:
+                if feature is not None:
+                    feature.source = _source(lines[feature_start:start])
+                feature = Feature(name, tags)
+                features.append(feature)
+                feature_start, block, rule_source = start, ("feature", feature, start), None
+                in_rule, rule_background = False, None
+                scenario = examples = steps = None
+                in_description = True
+                continue
+            if feature is None:
+                feature = Feature("", [])
+                features.append(feature)
+                feature.header_source = _source(lines[:start])
+            if keyword in BACKGROUND_KEYWORDS:
+                if in_rule:
+                    rule_background = steps = []
+                else:
+                    feature.background = steps = []
+                scenario = examples = None
+            elif keyword in SCENARIO_KEYWORDS:
+                scenario = Scenario(keyword, name, tags)
+                scenario.rule_source = rule_source
+                scenario.rule_background = rule_background
+                feature.scenarios.append(scenario)
+                block = ("scenario", scenario, start)
+                steps = scenario.steps
+                examples = None
+            elif keyword in EXAMPLES_KEYWORDS and scenario is not None:
+                examples = Examples(keyword, name, tags)
+                scenario.examples.append(examples)
+                steps = None
+            else:
+                # Rule: scenarios below still belong to the feature
+                block = ("rule", None, start)
+                in_rule, rule_background = True, None
+                scenario = examples = steps = None
+            continue
+
+        step = _STEP.match(line)
+        if step and steps is not None:
+            steps.append(Step(step.group(1), step.group(2).strip()))
+            continue
+
+        if in_description:
+            feature.description = (feature.description + "\n" + line) if feature.description else line
+
+    _close_block(block, lines, len(lines), rule_source)
+    if feature is not None:
+        feature.source = _source(lines[feature_start:])
+    for feature in features:
+        feature.description = feature.description.strip("\n")
+    return tuple(features)
+
+
+def _close_block(block: Optional[Tuple[str, Any, int]], lines: List[str], end: int,
+                 rule_source: Optional[str]) -> Optional[str]:
+    """Record the source of the block ending at line end; returns the current Rule header source."""
+    if block is None:
+        return rule_source
+    kind, owner, start = block
+    if kind == "scenario":
+        owner.source = _source(lines[start:end])
+    elif kind == "feature":
+        owner.header_source = _source(lines[start:end])
+    else:
+        return _source(lines[start:end])
+    return rule_source
+
+
+def _strip_code_fence(lines: List[str]) -> List[str]:
+    """Drop a Markdown code fence wrapped around the whole text (```gherkin ... ```)."""
+    content = [i for i, line in enumerate(lines) if line.strip()]
+    if content and lines[content[0]].strip().startswith("```"):
+        end = content[-1] if len(content) > 1 and lines[content[-1]].strip() == "```" else len(lines)
+        return lines[content[0] + 1:end]
+    return lines
+
+
+def iter_scenarios(test_cases: List[Dict[str, Any]]) -> Iterator[Tuple[Dict[str, Any], Feature, Scenario]]:
+    """Yield (test case, feature, scenario) for every scenario of every test case, in order."""
+    for test_case in test_cases:
+        for feature in parse_gherkin(test_case.get("gherkin_feature", "")):
+            for scenario in feature.scenarios:
+                yield test_case, feature, scenario
+
+
+def as_test_cases(test_cases_or_text: Any) -> List[Dict[str, Any]]:
+    """Accept either a list of test cases or raw Gherkin text (wrapped as a single test case)."""
+    if isinstance(test_cases_or_text, str):
+        return [{"gherkin_feature": test_cases_or_text}]
+    return list(test_cases_or_text)
+
@@ -0,0 +1,147 @@
+"""
+HTTP Client Module
+Shared pooled async HTTP client (keep-alive, HTTP/2 when available) for ALM REST APIs,
+with adaptive throttling driven by the servers' rate-limit headers.
+"""
+
+import os
+import time
+import asyncio
+import hashlib
+from typing import Any, Dict, Optional
+
+import httpx
+
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+def create_http_client(**kwargs) -> httpx.AsyncClient:
+    """
+    Build a pooled async client. Pool size is configured with HTTP_MAX_CONNECTIONS (default 20)
+    and the request timeout with HTTP_TIMEOUT (seconds, default 30).
+    """
+    max_connections = int(os.environ.get("HTTP_MAX_CONNECTIONS", 20))
+    options = {
+        "http2": HTTP2_AVAILABLE,
+        "timeout": float(os.environ.get("HTTP_TIMEOUT", 30)),
+        "limits": httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+    }
+    options.update(kwargs)
+    return httpx.AsyncClient(**options)
+
+
+class AdaptiveThrottle:
+    """
+    Paces requests against one rate-limited API credential.
+
+    After each response the throttle reads Retry-After and the remaining/reset rate-limit
+    headers (GitHub's X-RateLimit-*, GitLab's RateLimit-*). A Retry-After pauses all callers
+    for that long; once the remaining quota drops to low_watermark, the rest of the window
+    is spread evenly over the remaining requests instead of bursting into a 429.
+    """
+
+    def __init__(self, low_watermark: int = 50):
+        self.low_watermark = low_watermark
+        self._resume_at = 0.0
+        self.remaining = None
+        self.throttled = 0
+
+    async def wait(self):
+        delay = self._resume_at - time.time()
+        if delay > 0:
+            self.throttled += 1
+            await asyncio.sleep(delay)
+
+    def observe(self, response: httpx.Response):
+        now = time.time()
+        retry_after = _header_float(response, "Retry-After")
+        if retry_after is not None:
+            self._resume_at = max(self._resume_at, now + retry_after)
+
+        remaining = _header_float(response, "X-RateLimit-Remaining", "RateLimit-Remaining")
+        reset_at = _header_float(response, "X-RateLimit-Reset", "RateLimit-Reset")
+        if remaining is None:
+            return
+        self.remaining = int(remaining)
+        if reset_at is not None and remaining <= self.low_watermark and reset_at > now:
+            self._resume_at = max(self._resume_at, now + (reset_at - now) / (remaining + 1))
+
+    def stats(self) -> Dict[str, Any]:
+        return {"remaining": self.remaining, "throttled": self.throttled}
+
+
+def _header_float(response: httpx.Response, *names: str) -> Optional[float]:
+    for name in names:
+        value = response.headers.get(name)
+        if value is not None:
+            try:
+                return float(value)
+            except ValueError:
+                return None
+    return None
+
+
+def is_rate_limited(response: httpx.Response) -> bool:
+    """429, or a 403 that carries Retry-After or an exhausted quota (GitHub's secondary limits)."""
+    if response.status_code == 429:
+        return True
+    if response.status_code == 403:
+        return ("Retry-After" in response.headers
+                or response.headers.get("X-RateLimit-Remaining") == "0")
+    return False
+
+
+async def send_throttled(client: httpx.AsyncClient, throttle: AdaptiveThrottle, method: str, url: str,
+                         max_retries: Optional[int] = None, **kwargs) -> httpx.Response:
+    """
+    Send a request paced by the throttle, retrying rate-limited responses with exponential
+    backoff (Retry-After takes precedence). Retries are capped by ALM_MAX_RETRIES (default 5).
+    """
+    retries = max_retries if max_retries is not None else int(os.environ.get("ALM_MAX_RETRIES", 5))
+    delay = 1.0
+    for attempt in range(retries + 1):
+        await throttle.wait()
+        response = await client.request(method, url, **kwargs)
+        throttle.observe(response)
+        if not is_rate_limited(response) or attempt == retries:
+            return response
+        if "Retry-After" not in response.headers:
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 60)
+    return response
+
+
+# Global HTTP client and per-credential throttles
+_http_client = None
+_throttles = {}
+
+def get_http_client() -> httpx.AsyncClient:
+    """Factory function to get the shared async HTTP client (use from the server's event loop)."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = create_http_client()
+    return _http_client
+
+
+async def close_http_client():
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+def get_throttle(host: str, token: str) -> AdaptiveThrottle:
+    """Factory function to get the throttle shared by all requests made with one API token."""
+    key = (host, hashlib.sha256(token.encode()).hexdigest())
+    if key not in _throttles:
+        _throttles[key] = AdaptiveThrottle(low_watermark=int(os.environ.get("ALM_RATE_LIMIT_LOW_WATERMARK", 50)))
+    return _throttles[key]
+
+
+def get_alm_max_concurrency() -> int:
+    """Concurrent issue-creation requests per sync (ALM_MAX_CONCURRENCY, default 8)."""
+    return int(os.environ.get("ALM_MAX_CONCURRENCY", 8))
@@ -0,0 +1,257 @@
+"""
+Requirement Ingestion Module
+Streaming extraction of requirement text from PDF, DOCX, XML and TXT files.
+Yields text segments as they are parsed so downstream (chunked) generation can
+start before a large document has been fully read. Sources can be file paths or
+in-memory/spooled buffers, so uploads are parsed without a temp-file round trip.
+"""
+
+import io
+import os
+import hashlib
+import shutil
+import tempfile
+import xml.etree.ElementTree as ET
+from typing import BinaryIO, Iterator, List, Optional, Union
+
+import docx
+from pypdf import PdfReader
+
+from .concurrency import get_process_executor
+
+SUPPORTED_EXTENSIONS = (".pdf", ".docx", ".xml", ".txt")
+
+
+def get_pdf_parallel_min_pages() -> int:
+    """PDFs with at least this many pages are extracted in parallel (PDF_PARALLEL_MIN_PAGES)."""
+    return int(os.environ.get("PDF_PARALLEL_MIN_PAGES", 32))
+
+
+def get_pdf_pages_per_task() -> int:
+    """Pages extracted per process-pool task (PDF_PAGES_PER_TASK)."""
+    return int(os.environ.get("PDF_PAGES_PER_TASK", 16))
+
+
+def iter_requirement_segments(source: Union[str, BinaryIO], filename: Optional[str] = None) -> Iterator[str]:
+    """
+    Yield the text of a requirement file in document order, one segment at a time.
+
+    Segments are PDF pages, batches of DOCX paragraphs, XML element texts or TXT lines.
+    Joining them with newlines gives the full document text.
+
+    Args:
+        source: File path, or a seekable binary file-like object positioned at the start
+        filename: Name used to detect the file type when source is a file-like object
+
+    Raises:
+        ValueError: If the file type is not supported
+    """
+    lower_name = (filename or (source if isinstance(source, str) else "")).lower()
+    if lower_name.endswith('.pdf'):
+        yield from _iter_pdf_pages(source)
+    elif lower_name.endswith('.docx'):
+        yield from _iter_docx_paragraphs(source)
+    elif lower_name.endswith('.xml'):
+        yield from _iter_xml_texts(source)
+    elif lower_name.endswith('.txt'):
+        yield from _iter_text_lines(source)
+    else:
+        raise ValueError("Unsupported file type")
+
+
+def _iter_pdf_pages(source: Union[str, BinaryIO]) -> Iterator[str]:
+    """
+    Yield PDF page texts in order. Large PDFs are split into page ranges that are extracted
+    concurrently in the shared process pool; results are yielded in page order as soon as
+    each leading range is done. A large in-memory upload is first spilled to a temp file so
+    the worker processes can open it; smaller PDFs are read in-process.
+    """
+    reader = PdfReader(source)
+    page_count = len(reader.pages)
+
+    if page_count < get_pdf_parallel_min_pages():
+        for page in reader.pages:
+            yield page.extract_text() or ""
+        return
+
+    if isinstance(source, str):
+        yield from _iter_pdf_page_ranges(source, page_count)
+        return
+
+    spilled = tempfile.NamedTemporaryFile(suffix=".pdf", delete=False)
+    try:
+        with spilled:
+            source.seek(0)
+            shutil.copyfileobj(source, spilled)
+        yield from _iter_pdf_page_ranges(spilled.name, page_count)
+    finally:
+        os.remove(spilled.name)
+
+
+def _iter_pdf_page_ranges(file_path: str, page_count: int) -> Iterator[str]:
+    """Extract page ranges of a PDF on disk in the process pool, yielding pages in order."""
+    pages_per_task = get_pdf_pages_per_task()
+    executor = get_process_executor()
+    futures = [
+        executor.submit(_extract_pdf_page_range, file_path, start, min(start + pages_per_task, page_count))
+        for start in range(0, page_count, pages_per_task)
+    ]
+    try:
+        for future in futures:
+            yield from future.result()
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+def _extract_pdf_page_range(file_path: str, start: int, stop: int) -> List[str]:
+    """Extract the text of pages [start, stop) of a PDF (runs in a worker process)."""
+    reader = PdfReader(file_path)
+    return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+
+def _iter_docx_paragraphs(source: Union[str, BinaryIO], batch_size: int = 200) -> Iterator[str]:
+    """Yield DOCX paragraph text in batches (python-docx has no streaming reader)."""
+    document = docx.Document(source)
+    batch = []
+    for para in document.paragraphs:
+        batch.append(para.text)
+        if len(batch) >= batch_size:
+            yield "\n".join(batch)
+            batch = []
+    if batch:
+        yield "\n".join(batch)
+
+
+def _iter_xml_texts(source: Union[str, BinaryIO]) -> Iterator[str]:
+    """
+    Yield non-empty element texts in document order using iterparse. Each element is
+    cleared and detached from its parent once it is closed, so memory stays flat on large files.
+    """
+    open_elements = []  # [element, text_emitted] for each ancestor of the current position
+    for event, elem in ET.iterparse(source, events=("start", "end")):
+        if event == "start":
+            # A child starting means the parent's leading text is complete
+            if open_elements and not open_elements[-1][1]:
+                open_elements[-1][1] = True
+                text = _element_text(open_elements[-1][0])
+                if text:
+                    yield text
+            open_elements.append([elem, False])
+        else:
+            _, emitted = open_elements.pop()
+            if not emitted:
+                text = _element_text(elem)
+                if text:
+                    yield text
+            elem.clear()
+            if open_elements:
+                # The parent holds at most this one child, since earlier ones were already removed
+                open_elements[-1][0].remove(elem)
+
+
+def _element_text(elem) -> str:
+    return elem.text.strip() if elem.text and elem.text.strip() else ""
+
+
+def _iter_text_lines(source: Union[str, BinaryIO], batch_size: int = 1000) -> Iterator[str]:
+    """Yield a plain text file in batches of lines without reading it whole."""
+    if isinstance(source, str):
+        with open(source, 'rb') as f:
+            yield from _iter_text_lines(f, batch_size)
+        return
+
+    batch = []
+    for raw_line in source:
+        batch.append(raw_line.decode('utf-8').rstrip("\r\n"))
+        if len(batch) >= batch_size:
+            yield "\n".join(batch)
+            batch = []
+    if batch:
+        yield "\n".join(batch)
+
+
+class UploadTooLargeError(ValueError):
+    """Raised when an upload exceeds the configured maximum size."""
+
+
+class SpooledUpload:
+    """
+    Receives an upload into memory, spilling to a uniquely named temp file only once it
+    grows past spool_max_bytes. Computes the SHA-256 digest and enforces max_bytes while
+    the data is written, so the content is only copied once.
+
+    Use as a context manager; any temp file is removed on exit.
+    """
+
+    def __init__(self, filename: str, spool_max_bytes: int, max_bytes: int, spool_dir: Optional[str] = None):
+        self.filename = filename
+        self.spool_max_bytes = spool_max_bytes
+        self.max_bytes = max_bytes
+        self.spool_dir = spool_dir
+        self.size = 0
+        self.path = None  # set once spilled to disk
+        self._buffer = io.BytesIO()
+        self._hash = hashlib.sha256()
+
+    def write(self, data: bytes) -> int:
+        self.size += len(data)
+        if self.size > self.max_bytes:
+            raise UploadTooLargeError(f"Upload exceeds the maximum size of {self.max_bytes} bytes")
+        self._hash.update(data)
+        if self.path is None and self.size > self.spool_max_bytes:
+            self._spill()
+        return self._buffer.write(data)
+
+    def receive(self, fileobj: BinaryIO, chunk_size: int = 1024 * 1024) -> "SpooledUpload":
+        """Copy a (blocking) file-like object into the spool in chunks."""
+        while True:
+            data = fileobj.read(chunk_size)
+            if not data:
+                break
+            self.write(data)
+        self._buffer.flush()
+        return self
+
+    @property
+    def digest(self) -> str:
+        return self._hash.hexdigest()
+
+    @property
+    def source(self) -> Union[str, BinaryIO]:
+        """Path of the spilled file, or the in-memory buffer rewound to the start."""
+        if self.path is not None:
+            return self.path
+        self._buffer.seek(0)
+        return self._buffer
+
+    def close(self):
+        self._buffer.close()
+        if self.path is not None and os.path.exists(self.path):
+            os.remove(self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _spill(self):
+        extension = os.path.splitext(self.filename or "")[1]
+        if self.spool_dir:
+            os.makedirs(self.spool_dir, exist_ok=True)
+        spilled = tempfile.NamedTemporaryFile(dir=self.spool_dir, suffix=extension, delete=False)
+        spilled.write(self._buffer.getvalue())
+        self._buffer.close()
+        self._buffer = spilled
+        self.path = spilled.name
+
+
+def get_upload_spool_max_bytes() -> int:
+    """Uploads larger than this spill from memory to a temp file (UPLOAD_SPOOL_MAX_BYTES)."""
+    return int(os.environ.get("UPLOAD_SPOOL_MAX_BYTES", 8 * 1024 * 1024))
+
+
+def get_max_upload_bytes() -> int:
+    """Largest accepted upload (MAX_UPLOAD_BYTES)."""
+    return int(os.environ.get("MAX_UPLOAD_BYTES", 50 * 1024 * 1024))
@@ -0,0 +1,381 @@
+"""
+Job Queue Module
+Background generation jobs so slow LLM calls never run inside an HTTP request.
+Jobs are persisted in SQLite (queued work survives a restart) and processed by a
+configurable pool of async workers running generation, traceability and gap analysis.
+Running jobs hold a renewable lease, so several API processes can share one job database.
+"""
+
+import os
+import json
+import time
+import uuid
+import socket
+import sqlite3
+import asyncio
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from .concurrency import run_blocking
+from .logic import configure_ai, generate_traceability_matrix
+from .chunking import astream_test_cases_chunked, should_chunk
+from .streaming import astream_test_cases
+from .feature_analyzer import aanalyze_feature_gaps
+from .context_manager import get_context_manager, reused_test_data
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+# Partial results are persisted every PROGRESS_BATCH_SIZE test cases or PROGRESS_FLUSH_SECONDS,
+# whichever comes first, instead of rewriting the result row after each test case
+PROGRESS_BATCH_SIZE = 10
+PROGRESS_FLUSH_SECONDS = 1.0
+
+
+class JobLeaseLostError(Exception):
+    """Raised when a worker tries to write progress for a job whose lease it no longer holds."""
+
+
+class JobStore:
+    """SQLite persistence for jobs, their status and (partial) results."""
+
+    def __init__(self, db_path: str = "job_storage/jobs.db"):
+        self.db_path = db_path
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "job_id TEXT PRIMARY KEY, status TEXT NOT NULL, step TEXT, "
+            "payload TEXT NOT NULL, result TEXT, error TEXT, "
+            "created_at TEXT NOT NULL, updated_at TEXT NOT NULL)"
+        )
+        for column in ("owner TEXT", "lease_expires REAL", "context_id TEXT"):
+            try:
+                self._conn.execute(f"ALTER TABLE jobs ADD COLUMN {column}")
+            except sqlite3.OperationalError:
+                pass  # Column already exists
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, created_at)")
+        self._conn.commit()
+
+    def create(self, payload: Dict[str, Any]) -> str:
+        job_id = f"job_{uuid.uuid4().hex}"
+        now = datetime.now().isoformat()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (job_id, status, step, payload, result, error, created_at, updated_at) "
+                "VALUES (?, ?, NULL, ?, NULL, NULL, ?, ?)",
+                (job_id, JOB_QUEUED, json.dumps(payload), now, now)
+            )
+            self._conn.commit()
+        return job_id
+
+    def update(self, job_id: str, status: Optional[str] = None, step: Optional[str] = None,
+               result: Optional[Dict[str, Any]] = None, error: Optional[str] = None,
+               context_id: Optional[str] = None, owner: Optional[str] = None) -> bool:
+        """
+        Update the given fields of a job; fields left as None are unchanged.
+        With owner, only updates a job still leased by that owner. Returns whether a row changed.
+        """
+        fields = {"updated_at": datetime.now().isoformat()}
+        if status is not None:
+            fields["status"] = status
+        if step is not None:
+            fields["step"] = step
+        if result is not None:
+            fields["result"] = json.dumps(result)
+        if error is not None:
+            fields["error"] = error
+        if context_id is not None:
+            fields["context_id"] = context_id
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        condition, params = "job_id = ?", [job_id]
+        if owner is not None:
+            condition += " AND owner = ?"
+            params.append(owner)
+        with self._lock:
+            cursor = self._conn.execute(
+                f"UPDATE jobs SET {assignments} WHERE {condition}",
+                (*fields.values(), *params)
+            )
+            self._conn.commit()
+            return cursor.rowcount == 1
+
+    def claim(self, job_id: str, owner: str, lease_seconds: float) -> bool:
+        """
+        Atomically lease a queued job, or a running job whose lease expired (its worker died),
+        to owner and mark it running; False if another worker holds it or it is finished.
+        """
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, owner = ?, lease_expires = ?, updated_at = ? "
+                "WHERE job_id = ? AND (status = ? OR (status = ? AND (lease_expires IS NULL OR lease_expires < ?)))",
+                (JOB_RUNNING, owner, now + lease_seconds, datetime.now().isoformat(),
+                 job_id, JOB_QUEUED, JOB_RUNNING, now)
+            )
+            self._conn.commit()
+            return cursor.rowcount == 1
+
+    def renew(self, job_id: str, owner: str, lease_seconds: float) -> bool:
+        """Extend owner's lease on a running job; False if the lease was lost to another worker."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET lease_expires = ? WHERE job_id = ? AND owner = ? AND status = ?",
+                (time.time() + lease_seconds, job_id, owner, JOB_RUNNING)
+            )
+            self._conn.commit()
+            return cursor.rowcount == 1
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT job_id, status, step, payload, result, error, created_at, updated_at, context_id "
+                "FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "job_id": row[0],
+            "status": row[1],
+            "step": row[2],
+            "request": json.loads(row[3]),
+            "result": json.loads(row[4]) if row[4] else None,
+            "error": row[5],
+            "created_at": row[6],
+            "updated_at": row[7],
+            "context_id": row[8]
+        }
+
+    def pending_job_ids(self) -> List[str]:
+        """
+        Jobs waiting to run: queued ones, and running ones whose lease expired because their
+        worker died. Jobs leased by a live worker are left alone. Oldest first.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT job_id FROM jobs WHERE status = ? "
+                "OR (status = ? AND (lease_expires IS NULL OR lease_expires < ?)) ORDER BY created_at",
+                (JOB_QUEUED, JOB_RUNNING, time.time())
+            ).fetchall()
+        return [row[0] for row in rows]
+
+
+class JobQueue:
+    """
+    Async worker pool that processes persisted generation jobs.
+    Must be started from a running event loop (e.g. the FastAPI startup hook).
+
+    A job is leased to this queue while it runs and the lease is renewed every third of
+    lease_seconds. Every lease_seconds the queue also picks up queued jobs and jobs whose lease
+    expired, so work of a crashed process is resumed without re-running jobs that are alive.
+    """
+
+    def __init__(self, store: JobStore, workers: int = 2, lease_seconds: float = 60.0):
+        self.store = store
+        self.workers = workers
+        self.lease_seconds = lease_seconds
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._queue = None
+        self._enqueued = set()
+        self._tasks = []
+
+    async def start(self):
+        """Start the workers and the sweep that re-enqueues work left over by dead workers."""
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._recover()))
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def submit(self, payload: Dict[str, Any]) -> str:
+        """Persist a new job and hand it to the workers. Returns the job ID immediately."""
+        job_id = await run_blocking(self.store.create, payload)
+        if self._queue is not None:
+            self._enqueue(job_id)
+        return job_id
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await run_blocking(self.store.get, job_id)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": len(self._tasks),
+            "queued": self._queue.qsize() if self._queue is not None else 0
+        }
+
+    def _enqueue(self, job_id: str):
+        if job_id not in self._enqueued:
+            self._enqueued.add(job_id)
+            self._queue.put_nowait(job_id)
+
+    async def _recover(self):
+        while True:
+            try:
+                for job_id in await run_blocking(self.store.pending_job_ids):
+                    self._enqueue(job_id)
+            except Exception as e:
+                print(f"Job recovery sweep failed: {e}")
+            await asyncio.sleep(self.lease_seconds)
+
+    async def _worker(self):
+        while True:
+            job_id = await self._queue.get()
+            self._enqueued.discard(job_id)
+            try:
+                await self._process(job_id)
+            except Exception as e:
+                # e.g. "database is locked": the job keeps its lease, which expires and is recovered
+                print(f"Job worker failed on job {job_id}: {e}")
+            finally:
+                self._queue.task_done()
+
+    async def _process(self, job_id: str):
+        if not await run_blocking(self.store.claim, job_id, self.owner, self.lease_seconds):
+            return
+        job = await run_blocking(self.store.get, job_id)
+        work = asyncio.ensure_future(run_generation_job(job_id, job["request"], self.store, owner=self.owner,
+                                                        context_id=job["context_id"]))
+        heartbeat = asyncio.ensure_future(self._heartbeat(job_id))
+        try:
+            await asyncio.wait((work, heartbeat), return_when=asyncio.FIRST_COMPLETED)
+        except asyncio.CancelledError:
+            work.cancel()
+            raise
+        finally:
+            heartbeat.cancel()
+        if not work.done():
+            work.cancel()
+            print(f"Lost the lease on job {job_id}; leaving it to the worker that took it over")
+            return
+        try:
+            result = work.result()
+        except JobLeaseLostError as e:
+            print(f"{e}; leaving it to the worker that took it over")
+            return
+        except Exception as e:
+            await run_blocking(self.store.update, job_id, status=JOB_FAILED, error=str(e), owner=self.owner)
+            return
+        await run_blocking(self.store.update, job_id, status=JOB_COMPLETED, step="done", result=result, owner=self.owner)
+
+    async def _heartbeat(self, job_id: str):
+        """Renew the lease on a job until it is lost (returns) or the job ends (cancelled)."""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                if not await run_blocking(self.store.renew, job_id, self.owner, self.lease_seconds):
+                    return
+            except Exception as e:
+                print(f"Could not renew the lease on job {job_id}: {e}")
+
+
+async def run_generation_job(job_id: str, request: Dict[str, Any], store: JobStore, owner: Optional[str] = None,
+                             context_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Run the generation pipeline for a job, persisting partial results (in batches, see
+    PROGRESS_BATCH_SIZE) and each step so GET /api/jobs/{id} can report progress.
+
+    With owner, progress is only written while that owner holds the job's lease
+    (JobLeaseLostError otherwise). The job's context is created once and its ID stored
+    with the job; a retried job passes that context_id back in and reuses it.
+    """
+    requirement_text = request["requirement_text"]
+    domain = request.get("domain") or "General"
+    configure_ai()
+
+    async def save(**fields):
+        if not await run_blocking(store.update, job_id, owner=owner, **fields):
+            raise JobLeaseLostError(f"Lost the lease on job {job_id}")
+
+    result = {"test_cases": []}
+
+    if not request.get("create_context"):
+        context_id = None
+    elif context_id is None:
+        ctx_manager = get_context_manager()
+        context_id = await run_blocking(ctx_manager.create_context, requirement_text, domain)
+        await save(context_id=context_id)
+    if context_id:
+        result["context_id"] = context_id
+
+    match, prior_contexts = None, []
+    if request.get("use_prior_contexts", True):
+        await save(step="retrieval")
+        ctx_manager = get_context_manager()
+        try:
+            match, prior_contexts = await run_blocking(
+                ctx_manager.retrieve_prior_work, requirement_text, domain, (context_id,) if context_id else ()
+            )
+        except Exception as e:
+            print(f"Prior context retrieval failed for job {job_id}: {e}")
+
+    await save(step="generating")
+    if match:
+        result.update(reused_test_data(match))
+        await save(result=result)
+    else:
+        if request.get("chunked", True) and should_chunk(requirement_text):
+            stream = astream_test_cases_chunked(requirement_text, domain, max_parallel=request.get("max_parallel"),
+                                                prior_contexts=prior_contexts)
+        else:
+            stream = astream_test_cases(requirement_text, domain, prior_contexts=prior_contexts)
+        last_flush, unflushed = time.monotonic(), 0
+        async for test_case in stream:
+            result["test_cases"].append(test_case)
+            unflushed += 1
+            if unflushed >= PROGRESS_BATCH_SIZE or time.monotonic() - last_flush >= PROGRESS_FLUSH_SECONDS:
+                await save(result=result)
+                last_flush, unflushed = time.monotonic(), 0
+        if unflushed:
+            await save(result=result)
+
+    if context_id and result["test_cases"]:
+        ctx_manager = get_context_manager()
+        await run_blocking(ctx_manager.record_test_cases, context_id, result["test_cases"])
+
+    if request.get("include_traceability"):
+        await save(step="traceability")
+        result["traceability_matrix"] = await run_blocking(generate_traceability_matrix, requirement_text, result["test_cases"])
+        await save(result=result)
+
+    if request.get("analyze_gaps") and result["test_cases"]:
+        await save(step="gap_analysis")
+        gaps = await aanalyze_feature_gaps(requirement_text, result["test_cases"], domain)
+        result["feature_gap_analysis"] = gaps
+        if context_id:
+            ctx_manager = get_context_manager()
+            await run_blocking(ctx_manager.build_context, context_id, {"gap_analysis": gaps})
+
+    return result
+
+
+# Global job queue instance
+_job_queue = None
+
+def get_job_queue() -> JobQueue:
+    """
+    Factory function to get the global job queue, configured with
+    JOB_WORKERS (default 2), JOB_DB_PATH (default job_storage/jobs.db) and
+    JOB_LEASE_SECONDS (default 60).
+    """
+    global _job_queue
+    if _job_queue is None:
+        store = JobStore(os.environ.get("JOB_DB_PATH", "job_storage/jobs.db"))
+        _job_queue = JobQueue(
+            store,
+            workers=int(os.environ.get("JOB_WORKERS", 2)),
+            lease_seconds=float(os.environ.get("JOB_LEASE_SECONDS", 60))
+        )
+    return _job_queue
@@ -1,17 +1,26 @@
 import os
 import json
-import re
+import asyncio
+import time
+import hashlib
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 import google.generativeai as genai
 from dotenv import load_dotenv
 from jira import JIRA
-import docx
-from pypdf import PdfReader
-import xml.etree.ElementTree as ET
 from azure.devops.connection import Connection
 from msrest.authentication import BasicAuthentication
 import requests
-from datetime import datetime
-import base64
+
+from .cache import get_response_cache, make_cache_key, normalize_text
+from .singleflight import get_single_flight
+from .ingestion import iter_requirement_segments
+from .concurrency import run_blocking
+from .gherkin import iter_scenarios, as_test_cases
+from .traceability import build_traceability_matrix
+from .sync_ledger import get_sync_ledger, sync_identities, content_hash, SYNC_CREATE, SYNC_UPDATE, SYNC_UNCHANGED
+from .http_client import create_http_client, get_http_client, get_throttle, send_throttled, is_rate_limited, get_alm_max_concurrency
 
 # Load environment variables from the .env file
 load_dotenv(encoding="utf-8")
@@ -27,8 +36,15 @@ def configure_ai():
 
 # --- Jira Configuration ---
 
+# Cached Jira clients keyed by (server, user, token digest); each reuses its HTTP session
+_jira_clients = {}
+_jira_clients_lock = threading.Lock()
+
 def configure_jira(server=None, user=None, api_token=None):
-    """Connects to Jira using provided credentials, falling back to environment variables."""
+    """
+    Connects to Jira using provided credentials, falling back to environment variables.
+    Clients are cached per server and user, so the connection test only runs on first use.
+    """
     # Prioritize provided arguments, fall back to environment variables
     final_server = server or os.environ.get("JIRA_SERVER")
     final_user = user or os.environ.get("JIRA_USER")
@@ -37,80 +53,247 @@ def configure_jira(server=None, user=None, api_token=None):
     if not all([final_server, final_user, final_token]):
         raise ValueError("Jira credentials are not fully configured or provided.")
 
+    cache_key = (final_server.rstrip('/'), final_user, hashlib.sha256(final_token.encode()).hexdigest())
+    with _jira_clients_lock:
+        jira_client = _jira_clients.get(cache_key)
+    if jira_client is not None:
+        return jira_client
+
     try:
         jira_client = JIRA(server=final_server, basic_auth=(final_user, final_token))
         # Test connection
         jira_client.server_info()
-        return jira_client
     except Exception as e:
         raise Exception(f"Jira connection failed: {e}")
 
+    with _jira_clients_lock:
+        return _jira_clients.setdefault(cache_key, jira_client)
+
+# --- Rate-limited ALM calls ---
+
+ALM_MAX_RETRIES = int(os.environ.get("ALM_MAX_RETRIES", 5))
+
+def _retry_after_seconds(response):
+    """Reads a Retry-After header (in seconds) from an HTTP response, if present."""
+    if response is None:
+        return None
+    try:
+        return float(response.headers.get("Retry-After"))
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+def _call_with_backoff(func, *args, **kwargs):
+    """
+    Calls func, retrying with exponential backoff while the server answers 429 (rate limited).
+    A Retry-After header on the 429 response takes precedence over the backoff delay.
+    """
+    delay = 1.0
+    for attempt in range(ALM_MAX_RETRIES + 1):
+        try:
+            return func(*args, **kwargs)
+        except Exception as e:
+            response = getattr(e, "response", None)
+            status = getattr(e, "status_code", None) or getattr(response, "status_code", None)
+            if status != 429 or attempt == ALM_MAX_RETRIES:
+                raise
+            wait = _retry_after_seconds(response) or delay
+            print(f"Rate limited by ALM server, retrying in {wait:.1f}s (attempt {attempt + 1}/{ALM_MAX_RETRIES})")
+            time.sleep(wait)
+            delay = min(delay * 2, 60)
+
+def synced_ids(results, id_field="id"):
+    """Remote IDs of the items a sync created, updated or found unchanged."""
+    return [result[id_field] for result in results if result["status"] in ("created", "updated", "unchanged")]
+
 # --- Azure DevOps Configuration ---
 
+# Cached Azure DevOps connections keyed by (organization, token digest), plus the
+# authenticated HTTP session each one uses for $batch requests
+_azure_connections = {}
+_azure_batch_sessions = weakref.WeakKeyDictionary()
+_azure_connections_lock = threading.Lock()
+
+AZURE_DEVOPS_API_VERSION = "5.1"
+
 def configure_azure_devops(organization=None, personal_access_token=None):
-    """Connects to Azure DevOps using provided credentials."""
+    """
+    Connects to Azure DevOps using provided credentials.
+    Connections are cached per organization and token, so repeated syncs reuse them.
+    """
     final_org = organization or os.environ.get("AZURE_DEVOPS_ORGANIZATION")
     final_token = personal_access_token or os.environ.get("AZURE_DEVOPS_PAT")
 
     if not all([final_org, final_token]):
         raise ValueError("Azure DevOps credentials are not fully configured or provided.")
 
-    try:
-        credentials = BasicAuthentication('', final_token)
-        connection = Connection(base_url=f"https://dev.azure.com/{final_org}", creds=credentials)
+    cache_key = (final_org, hashlib.sha256(final_token.encode()).hexdigest())
+    with _azure_connections_lock:
+        connection = _azure_connections.get(cache_key)
+        if connection is not None:
+            return connection
+        try:
+            credentials = BasicAuthentication('', final_token)
+            connection = Connection(base_url=f"https://dev.azure.com/{final_org}", creds=credentials)
+        except Exception as e:
+            raise Exception(f"Azure DevOps connection failed: {e}")
+
+        session = requests.Session()
+        session.auth = ('', final_token)
+        _azure_batch_sessions[connection] = session
+        _azure_connections[cache_key] = connection
         return connection
-    except Exception as e:
-        raise Exception(f"Azure DevOps connection failed: {e}")
 
-def create_azure_devops_work_items(connection, gherkin_text, project=None):
-    """Creates work items in Azure DevOps from Gherkin scenarios."""
+def create_azure_devops_work_items(connection, test_cases, project=None, batch_size=None, ledger=None):
+    """
+    Creates one Azure DevOps work item per Gherkin scenario of the test cases
+    (test_cases may also be raw Gherkin text).
+
+    Work items are submitted through the work item $batch endpoint, batch_size
+    (AZURE_DEVOPS_BATCH_SIZE, default 200) per request. A failed scenario or batch does
+    not stop the others; each scenario gets a result dict with its title, status
+    ("created", "updated", "unchanged" or "failed"), work item id and error.
+    Scenarios already pushed unchanged (per the sync ledger) are skipped, changed ones are updated.
+    """
     final_project = project or os.environ.get("AZURE_DEVOPS_PROJECT")
     if not final_project:
         raise ValueError("Azure DevOps project is not configured.")
 
-    scenarios = re.split(r'(?=Scenario:|Scenario Outline:)', gherkin_text)
-    if len(scenarios) < 2:
+    titles = []
+    documents = []
+    identity_parts = []
+
+    for tc, feature, scenario in iter_scenarios(as_test_cases(test_cases)):
+        title = scenario.title
+        description = f"```gherkin\n{feature.render_scenario(scenario)}```"
+        
+        # Create work item document
+        work_item = {
+            "op": "add",
+            "path": "/fields/System.Title",
+            "value": title
+        }
+        
+        work_item_body = {
+            "op": "add",
+            "path": "/fields/System.Description",
+            "value": description
+        }
+        
+        work_item_additional = {
+            "op": "add",
+            "path": "/fields/System.WorkItemType",
+            "value": "Test Case"
+        }
+        
+        titles.append(title)
+        documents.append([work_item, work_item_body, work_item_additional])
+        identity_parts.append((tc.get('test_id'), title))
+
+    if not documents:
         print("No scenarios found in the generated text. Skipping Azure DevOps creation.")
         return []
 
-    feature_header = scenarios[0]
-    created_items = []
-    
+    ledger = ledger or get_sync_ledger()
+    target = f"azure:{connection.base_url}:{final_project}"
+    identities = sync_identities(identity_parts)
+    digests = [content_hash(document) for document in documents]
+    actions = ledger.plan(target, list(zip(identities, digests)))
+
+    results = [None] * len(titles)
+    pending = []
+    for i, (action, remote_key) in enumerate(actions):
+        if action == SYNC_UNCHANGED:
+            results[i] = {"title": titles[i], "status": "unchanged", "id": int(remote_key), "error": None}
+        else:
+            pending.append(i)
+    if len(pending) < len(titles):
+        print(f"Skipping {len(titles) - len(pending)} unchanged Azure DevOps work items")
+
+    session = _azure_batch_sessions.get(connection)
+    if session is None:
+        # Connection not built by configure_azure_devops: fall back to one SDK call per item
+        for i in pending:
+            results[i] = _push_azure_work_item(connection, final_project, titles[i], documents[i], actions[i][1])
+    else:
+        final_batch_size = batch_size or int(os.environ.get("AZURE_DEVOPS_BATCH_SIZE", 200))
+        for start in range(0, len(pending), final_batch_size):
+            indices = pending[start:start + final_batch_size]
+            batch_results = _push_azure_work_item_batch(
+                session, connection.base_url, final_project,
+                [(titles[i], documents[i], actions[i][1]) for i in indices]
+            )
+            for i, result in zip(indices, batch_results):
+                results[i] = result
+
+    ledger.record(target, [
+        (identities[i], digests[i], results[i]["id"]) for i in pending if results[i]["status"] != "failed"
+    ])
+    return results
+
+def _update_document(document):
+    """A work item's create document minus the type, which cannot change on update."""
+    return [op for op in document if op["path"] != "/fields/System.WorkItemType"]
+
+def _push_azure_work_item(connection, project, title, document, work_item_id=None):
+    """Creates a single work item, or updates work_item_id, through the SDK client."""
     try:
         wit_client = connection.clients.get_work_item_tracking_client()
-        
-        for scenario_text in scenarios[1:]:
-            title = scenario_text.splitlines()[0].strip()
-            description = f"```gherkin\n{feature_header}\n{scenario_text}\n```"
-            
-            # Create work item document
-            work_item = {
-                "op": "add",
-                "path": "/fields/System.Title",
-                "value": title
-            }
-            
-            work_item_body = {
-                "op": "add",
-                "path": "/fields/System.Description",
-                "value": description
-            }
-            
-            work_item_additional = {
-                "op": "add",
-                "path": "/fields/System.WorkItemType",
-                "value": "Test Case"
-            }
-            
-            document = [work_item, work_item_body, work_item_additional]
-            
-            result = wit_client.create_work_item(document=document, project=final_project, type="Test Case")
-            created_items.append(result.id)
-            print(f"Successfully created Azure DevOps work item: {result.id} - '{title}'")
+        if work_item_id:
+            result = wit_client.update_work_item(document=_update_document(document), id=int(work_item_id), project=project)
+            status = "updated"
+        else:
+            result = wit_client.create_work_item(document=document, project=project, type="Test Case")
+            status = "created"
+        print(f"Successfully {status} Azure DevOps work item: {result.id} - '{title}'")
+        return {"title": title, "status": status, "id": result.id, "error": None}
     except Exception as e:
-        print(f"Failed to create Azure DevOps work item: {e}")
-    
-    return created_items
+        print(f"Failed to sync Azure DevOps work item '{title}': {e}")
+        return {"title": title, "status": "failed", "id": None, "error": str(e)}
+
+def _push_azure_work_item_batch(session, base_url, project, items):
+    """
+    Creates or updates a batch of work items with a single $batch request.
+    items are (title, document, existing work item id or None); returns one result per item.
+    """
+    create_uri = f"/{requests.utils.quote(project)}/_apis/wit/workitems/$Test%20Case?api-version={AZURE_DEVOPS_API_VERSION}"
+    batch = [
+        {
+            "method": "PATCH",
+            "uri": f"/_apis/wit/workitems/{work_item_id}?api-version={AZURE_DEVOPS_API_VERSION}" if work_item_id else create_uri,
+            "headers": {"Content-Type": "application/json-patch+json"},
+            "body": _update_document(document) if work_item_id else document
+        }
+        for _, document, work_item_id in items
+    ]
+
+    try:
+        response = _call_with_backoff(_post_azure_batch, session, f"{base_url}/_apis/wit/$batch?api-version={AZURE_DEVOPS_API_VERSION}", batch)
+        responses = response.json().get("value", [])
+    except Exception as e:
+        print(f"Failed to sync batch of {len(items)} Azure DevOps work items: {e}")
+        return [{"title": title, "status": "failed", "id": None, "error": str(e)} for title, _, _ in items]
+
+    results = []
+    for index, (title, _, work_item_id) in enumerate(items):
+        item = responses[index] if index < len(responses) else {}
+        try:
+            body = json.loads(item.get("body") or "{}")
+        except ValueError:
+            body = {}
+        if 200 <= item.get("code", 0) < 300 and "id" in body:
+            status = "updated" if work_item_id else "created"
+            print(f"Successfully {status} Azure DevOps work item: {body['id']} - '{title}'")
+            results.append({"title": title, "status": status, "id": body["id"], "error": None})
+        else:
+            error = body.get("message") or f"HTTP {item.get('code', 'no response')}"
+            print(f"Failed to sync Azure DevOps work item '{title}': {error}")
+            results.append({"title": title, "status": "failed", "id": None, "error": error})
+    return results
+
+def _post_azure_batch(session, url, batch):
+    response = session.post(url, json=batch, timeout=60)
+    response.raise_for_status()
+    return response
 
 # --- GitHub Issues Configuration ---
 
@@ -121,25 +304,11 @@ def configure_github(token=None):
         raise ValueError("GitHub token is not configured or provided.")
     return {"token": final_token}
 
-def create_github_issues(github_config, test_cases, owner=None, repo=None):
-    """Creates GitHub issues from test cases."""
-    final_owner = owner or os.environ.get("GITHUB_OWNER")
-    final_repo = repo or os.environ.get("GITHUB_REPO")
-    
-    if not all([final_owner, final_repo]):
-        raise ValueError("GitHub owner and repo are not configured or provided.")
-    
-    headers = {
-        "Authorization": f"Bearer {github_config['token']}",
-        "Accept": "application/vnd.github.v3+json"
-    }
-    base_url = "https://api.github.com"
-    created_issues = []
-    
-    for tc in test_cases:
-        try:
-            title = f"Test Case: {tc.get('test_id', 'TC')}"
-            body = f"""## Test Case: {tc.get('test_id')}
+GITHUB_API_URL = "https://api.github.com"
+
+def _github_issue_data(tc):
+    title = f"Test Case: {tc.get('test_id', 'TC')}"
+    body = f"""## Test Case: {tc.get('test_id')}
 
 **Requirement Source**: {tc.get('requirement_source', '')}
 
@@ -155,45 +324,116 @@ def create_github_issues(github_config, test_cases, owner=None, repo=None):
 ### Compliance Tags
 {', '.join(tc.get('compliance_tags', []))}
 """
-            
-            issue_data = {
-                "title": title,
-                "body": body,
-                "labels": ["test-case", "generated"] + tc.get('compliance_tags', [])
-            }
-            
-            response = requests.post(
-                f"{base_url}/repos/{final_owner}/{final_repo}/issues",
-                json=issue_data,
-                headers=headers
-            )
-            
-            if response.status_code == 201:
-                issue = response.json()
-                created_issues.append(issue['number'])
-                print(f"Successfully created GitHub issue: #{issue['number']} - '{title}'")
-            elif response.status_code == 401:
-                error_msg = response.json().get('message', 'Bad credentials')
-                raise Exception(f"GitHub authentication failed: {error_msg}. Please check your token at https://github.com/settings/tokens")
-            elif response.status_code == 403:
-                error_msg = response.json().get('message', 'Access denied')
-                raise Exception(f"GitHub access denied: {error_msg}. Token needs 'repo' scope. Update token at https://github.com/settings/tokens")
-            elif response.status_code == 404:
-                raise Exception(f"Repository not found: {final_owner}/{final_repo}. Check owner and repo name are correct.")
-            else:
-                error_text = response.text[:200]
-                print(f"Failed to create GitHub issue: '{title}'. Error: {error_text}")
-                
-        except Exception as e:
-            # Re-raise critical errors
-            if "authentication" in str(e).lower() or "access denied" in str(e).lower() or "not found" in str(e).lower():
-                raise
-            print(f"Failed to create GitHub issue: '{title}'. Error: {e}")
+    return {
+        "title": title,
+        "body": body,
+        "labels": ["test-case", "generated"] + tc.get('compliance_tags', [])
+    }
+
+async def acreate_github_issues(github_config, test_cases, owner=None, repo=None, client=None, max_concurrency=None, ledger=None):
+    """
+    Creates GitHub issues from test cases concurrently over the shared pooled HTTP client.
+
+    Requests run under a semaphore (ALM_MAX_CONCURRENCY) and are paced by the token's
+    rate-limit headers. Returns one result per test case: test_id, title, status
+    ("created", "updated", "unchanged", "failed" or "skipped"), issue number and error.
+    Authentication, permission and missing-repository errors stop the remaining requests
+    and are raised.
+
+    Pushed test cases are remembered in the sync ledger, so unchanged ones are skipped and
+    changed ones are updated in place instead of being created again.
+    """
+    final_owner = owner or os.environ.get("GITHUB_OWNER")
+    final_repo = repo or os.environ.get("GITHUB_REPO")
+    
+    if not all([final_owner, final_repo]):
+        raise ValueError("GitHub owner and repo are not configured or provided.")
     
-    if len(created_issues) == 0 and len(test_cases) > 0:
+    headers = {
+        "Authorization": f"Bearer {github_config['token']}",
+        "Accept": "application/vnd.github.v3+json"
+    }
+    url = f"{GITHUB_API_URL}/repos/{final_owner}/{final_repo}/issues"
+    client = client or get_http_client()
+    throttle = get_throttle(GITHUB_API_URL, github_config['token'])
+    semaphore = asyncio.Semaphore(max_concurrency or get_alm_max_concurrency())
+    fatal_errors = []
+
+    issue_data_list = [_github_issue_data(tc) for tc in test_cases]
+    ledger = ledger or get_sync_ledger()
+    target = f"github:{final_owner}/{final_repo}"
+    identities = sync_identities([(tc.get('test_id'), tc.get('requirement_source')) for tc in test_cases])
+    digests = [content_hash(issue_data) for issue_data in issue_data_list]
+    actions = await run_blocking(ledger.plan, target, list(zip(identities, digests)))
+
+    async def sync(tc, issue_data, action, number):
+        title = issue_data["title"]
+        result = {"test_id": tc.get('test_id'), "title": title, "status": "failed", "number": None, "error": None}
+        if action == SYNC_UNCHANGED:
+            result.update(status="unchanged", number=int(number))
+            return result
+        async with semaphore:
+            if fatal_errors:
+                result.update(status="skipped", error="Skipped after a fatal GitHub error")
+                return result
+            try:
+                if number is not None:
+                    response = await send_throttled(client, throttle, "PATCH", f"{url}/{number}", json=issue_data, headers=headers)
+                    if response.status_code in (404, 410):
+                        # Issue was deleted or moved on GitHub: create it again
+                        number = None
+                if number is None:
+                    response = await send_throttled(client, throttle, "POST", url, json=issue_data, headers=headers)
+            except Exception as e:
+                print(f"Failed to create GitHub issue: '{title}'. Error: {e}")
+                result["error"] = str(e)
+                return result
+
+        if response.status_code in (200, 201):
+            issue = response.json()
+            status = "created" if response.status_code == 201 else "updated"
+            result.update(status=status, number=issue['number'])
+            print(f"Successfully {status} GitHub issue: #{issue['number']} - '{title}'")
+        elif response.status_code == 401:
+            error_msg = response.json().get('message', 'Bad credentials')
+            fatal_errors.append(f"GitHub authentication failed: {error_msg}. Please check your token at https://github.com/settings/tokens")
+        elif response.status_code == 403 and not is_rate_limited(response):
+            error_msg = response.json().get('message', 'Access denied')
+            fatal_errors.append(f"GitHub access denied: {error_msg}. Token needs 'repo' scope. Update token at https://github.com/settings/tokens")
+        elif response.status_code == 404:
+            fatal_errors.append(f"Repository not found: {final_owner}/{final_repo}. Check owner and repo name are correct.")
+        else:
+            result["error"] = response.text[:200]
+            print(f"Failed to create GitHub issue: '{title}'. Error: {result['error']}")
+        if fatal_errors and result["status"] == "failed" and result["error"] is None:
+            result["error"] = fatal_errors[-1]
+        return result
+
+    results = await asyncio.gather(*(
+        sync(tc, issue_data, action, number)
+        for tc, issue_data, (action, number) in zip(test_cases, issue_data_list, actions)
+    ))
+    await run_blocking(ledger.record, target, [
+        (identity, digest, result["number"])
+        for identity, digest, result in zip(identities, digests, results)
+        if result["status"] in ("created", "updated")
+    ])
+
+    # Re-raise critical errors
+    if fatal_errors:
+        raise Exception(fatal_errors[0])
+    
+    if not synced_ids(results, "number") and len(test_cases) > 0:
         raise Exception("No issues were created. Please check your GitHub token permissions and repository access.")
     
-    return created_issues
+    return results
+
+def create_github_issues(github_config, test_cases, owner=None, repo=None):
+    """Creates GitHub issues from test cases (blocking wrapper); returns the synced issue numbers."""
+    async def run():
+        async with create_http_client() as client:
+            return await acreate_github_issues(github_config, test_cases, owner=owner, repo=repo, client=client)
+    return synced_ids(asyncio.run(run()), "number")
 
 # --- GitLab Issues Configuration ---
 
@@ -207,24 +447,9 @@ def configure_gitlab(url=None, token=None):
     
     return {"url": final_url.rstrip('/'), "token": final_token}
 
-def create_gitlab_issues(gitlab_config, test_cases, project_id=None):
-    """Creates GitLab issues from test cases."""
-    final_project_id = project_id or os.environ.get("GITLAB_PROJECT_ID")
-    
-    if not final_project_id:
-        raise ValueError("GitLab project ID is not configured or provided.")
-    
-    headers = {
-        "PRIVATE-TOKEN": gitlab_config['token'],
-        "Content-Type": "application/json"
-    }
-    base_url = gitlab_config['url']
-    created_issues = []
-    
-    for tc in test_cases:
-        try:
-            title = f"Test Case: {tc.get('test_id', 'TC')}"
-            description = f"""## Test Case: {tc.get('test_id')}
+def _gitlab_issue_data(tc):
+    title = f"Test Case: {tc.get('test_id', 'TC')}"
+    description = f"""## Test Case: {tc.get('test_id')}
 
 **Requirement Source**: {tc.get('requirement_source', '')}
 
@@ -241,66 +466,145 @@ def create_gitlab_issues(gitlab_config, test_cases, project_id=None):
 ### Compliance Tags
 {', '.join(tc.get('compliance_tags', []))}
 """
+    
+    labels = ["test-case", "generated"] + tc.get('compliance_tags', [])
+    
+    return {
+        "title": title,
+        "description": description,
+        "labels": ",".join(labels)
+    }
+
+async def acreate_gitlab_issues(gitlab_config, test_cases, project_id=None, client=None, max_concurrency=None, ledger=None):
+    """
+    Creates GitLab issues from test cases concurrently over the shared pooled HTTP client.
+
+    Requests run under a semaphore (ALM_MAX_CONCURRENCY) and are paced by the token's
+    rate-limit headers. Returns one result per test case: test_id, title, status
+    ("created", "updated", "unchanged" or "failed"), issue iid and error.
+
+    Pushed test cases are remembered in the sync ledger, so unchanged ones are skipped and
+    changed ones are updated in place instead of being created again.
+    """
+    final_project_id = project_id or os.environ.get("GITLAB_PROJECT_ID")
+    
+    if not final_project_id:
+        raise ValueError("GitLab project ID is not configured or provided.")
+    
+    headers = {
+        "PRIVATE-TOKEN": gitlab_config['token'],
+        "Content-Type": "application/json"
+    }
+    base_url = gitlab_config['url']
+    url = f"{base_url}/api/v4/projects/{final_project_id}/issues"
+    client = client or get_http_client()
+    throttle = get_throttle(base_url, gitlab_config['token'])
+    semaphore = asyncio.Semaphore(max_concurrency or get_alm_max_concurrency())
+
+    issue_data_list = [_gitlab_issue_data(tc) for tc in test_cases]
+    ledger = ledger or get_sync_ledger()
+    target = f"gitlab:{base_url}:{final_project_id}"
+    identities = sync_identities([(tc.get('test_id'), tc.get('requirement_source')) for tc in test_cases])
+    digests = [content_hash(issue_data) for issue_data in issue_data_list]
+    actions = await run_blocking(ledger.plan, target, list(zip(identities, digests)))
+
+    async def sync(tc, issue_data, action, iid):
+        title = issue_data["title"]
+        result = {"test_id": tc.get('test_id'), "title": title, "status": "failed", "iid": None, "error": None}
+        if action == SYNC_UNCHANGED:
+            result.update(status="unchanged", iid=int(iid))
+            return result
+        try:
+            async with semaphore:
+                if iid is not None:
+                    response = await send_throttled(client, throttle, "PUT", f"{url}/{iid}", json=issue_data, headers=headers)
+                    if response.status_code == 404:
+                        # Issue was deleted on GitLab: create it again
+                        iid = None
+                if iid is None:
+                    response = await send_throttled(client, throttle, "POST", url, json=issue_data, headers=headers)
             
-            labels = ["test-case", "generated"] + tc.get('compliance_tags', [])
-            
-            issue_data = {
-                "title": title,
-                "description": description,
-                "labels": ",".join(labels)
-            }
-            
-            response = requests.post(
-                f"{base_url}/api/v4/projects/{final_project_id}/issues",
-                json=issue_data,
-                headers=headers
-            )
-            
-            if response.status_code == 201:
+            if response.status_code in (200, 201):
                 issue = response.json()
-                created_issues.append(issue['iid'])
-                print(f"Successfully created GitLab issue: !{issue['iid']} - '{title}'")
+                status = "created" if response.status_code == 201 else "updated"
+                result.update(status=status, iid=issue['iid'])
+                print(f"Successfully {status} GitLab issue: !{issue['iid']} - '{title}'")
             else:
+                result["error"] = response.text[:200]
                 print(f"Failed to create GitLab issue: '{title}'. Error: {response.text}")
                 
         except Exception as e:
+            result["error"] = str(e)
             print(f"Failed to create GitLab issue: '{title}'. Error: {e}")
+        return result
     
-    return created_issues
+    results = await asyncio.gather(*(
+        sync(tc, issue_data, action, iid)
+        for tc, issue_data, (action, iid) in zip(test_cases, issue_data_list, actions)
+    ))
+    await run_blocking(ledger.record, target, [
+        (identity, digest, result["iid"])
+        for identity, digest, result in zip(identities, digests, results)
+        if result["status"] in ("created", "updated")
+    ])
+    return list(results)
+
+def create_gitlab_issues(gitlab_config, test_cases, project_id=None):
+    """Creates GitLab issues from test cases (blocking wrapper); returns the synced issue iids."""
+    async def run():
+        async with create_http_client() as client:
+            return await acreate_gitlab_issues(gitlab_config, test_cases, project_id=project_id, client=client)
+    return synced_ids(asyncio.run(run()), "iid")
 
 # --- File Processing ---
 
 def read_requirement_file(file_path):
     """Reads the content of various requirement file types."""
     try:
-        if file_path.lower().endswith('.pdf'):
-            reader = PdfReader(file_path)
-            text = "".join(page.extract_text() or "" for page in reader.pages)
-        elif file_path.lower().endswith('.docx'):
-            doc = docx.Document(file_path)
-            text = "\n".join(para.text for para in doc.paragraphs)
-        elif file_path.lower().endswith('.xml'):
-            tree = ET.parse(file_path)
-            root = tree.getroot()
-            text = "\n".join(elem.text.strip() for elem in root.iter() if elem.text and elem.text.strip())
-        elif file_path.lower().endswith('.txt'):
-            with open(file_path, 'r', encoding='utf-8') as f:
-                text = f.read()
-        else:
-            raise ValueError("Unsupported file type")
-        return text
+        return "\n".join(iter_requirement_segments(file_path))
     except Exception as e:
         print(f"Error reading file: {e}")
         raise
 
 # --- AI Test Case Generation ---
 
-def generate_test_cases(requirement_text, domain="healthcare software"):
+MODEL_NAME = 'gemini-2.5-flash'
+
+# Bump whenever the generation prompt changes so cached responses are not reused
+PROMPT_VERSION = "1"
+
+# Prior test cases shown per similar context; titles only, to keep the prompt small
+PRIOR_TEST_CASES_PER_CONTEXT = 10
+
+def format_prior_contexts(prior_contexts):
     """
-    Generates structured test cases with a compliance audit and risk score using the Gemini AI.
-    Enhanced with GDPR compliance checks and deeper regulatory analysis.
+    Compact prompt section listing test cases (ID, requirement and scenario titles) and
+    reviewer feedback from similar prior contexts, or "" if there are none.
+    """
+    if not prior_contexts:
+        return ""
+    lines = [
+        "--- PRIOR ACCEPTED TEST CASES FOR SIMILAR REQUIREMENTS ---",
+        "Reuse and adapt these where they still apply, keep their style, and address the reviewer feedback."
+    ]
+    for prior in prior_contexts:
+        lines.append(f"[similarity {prior['similarity']:.2f}]")
+        for tc in prior["test_cases"][:PRIOR_TEST_CASES_PER_CONTEXT]:
+            titles = "; ".join(scenario.title for _, _, scenario in iter_scenarios([tc]))
+            lines.append(f"- {tc.get('test_id', '')} | {tc.get('requirement_source', '')} | {titles}")
+        for feedback in prior.get("feedback", []):
+            comments = feedback.get("comments") if isinstance(feedback, dict) else feedback
+            if comments:
+                lines.append(f"Reviewer feedback: {comments}")
+    lines.append("--- END PRIOR TEST CASES ---")
+    return "\n".join(lines) + "\n\n"
+
+def build_test_case_prompt(requirement_text, domain="healthcare software", prior_contexts=None):
     """
-    prompt = f"""You are a world-class QA expert, compliance auditor, and risk assessor specializing in {domain} (e.g., regulated standards like FDA, IEC 62304 for healthcare, HIPAA, ISO 13485, GDPR, or PCI-DSS for finance).
+    Builds the test case generation prompt for the given requirement and domain,
+    with test cases and feedback from similar prior contexts when given.
+    """
+    return f"""You are a world-class QA expert, compliance auditor, and risk assessor specializing in {domain} (e.g., regulated standards like FDA, IEC 62304 for healthcare, HIPAA, ISO 13485, GDPR, or PCI-DSS for finance).
 Analyze the provided software requirement and generate a comprehensive set of test cases.
 
 IMPORTANT: For healthcare domains, ensure GDPR and data privacy compliance is thoroughly addressed.
@@ -323,17 +627,73 @@ The value should be a list of test case objects, where each object has the follo
     - "checks": An array of specific GDPR compliance checks being validated (e.g., ["Right to Access", "Data Minimization", "Consent Management"]).
     - "risks": An array of potential GDPR violation risks (e.g., ["Unauthorized access to personal data", "Insufficient consent mechanisms"]).
 
---- REQUIREMENT TEXT ---
+{format_prior_contexts(prior_contexts)}--- REQUIREMENT TEXT ---
 {requirement_text}
 --- END REQUIREMENT TEXT ---
 
 Produce the JSON output now with comprehensive compliance analysis.
 """
 
+def test_case_cache_key(requirement_text, domain="healthcare software", prior_contexts=None):
+    """Content-addressed cache key for a generation request (including any prior-context examples)."""
+    parts = ["test_cases", normalize_text(requirement_text), normalize_text(domain).lower(), PROMPT_VERSION, MODEL_NAME]
+    if prior_contexts:
+        parts.append(format_prior_contexts(prior_contexts))
+    return make_cache_key(*parts)
+
+def generate_test_cases(requirement_text, domain="healthcare software", use_cache=True, prior_contexts=None):
+    """
+    Generates structured test cases with a compliance audit and risk score using the Gemini AI.
+    Enhanced with GDPR compliance checks and deeper regulatory analysis.
+    Successful responses are cached by requirement text, domain, prompt version and model,
+    so repeated requests are served without calling the model.
+    prior_contexts (from ContextManager.retrieve_prior_work) are included in the prompt as examples.
+    """
+    cache = get_response_cache() if use_cache else None
+    cache_key = test_case_cache_key(requirement_text, domain, prior_contexts)
+    if cache is not None:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    prompt = build_test_case_prompt(requirement_text, domain, prior_contexts)
+
     # Use the latest available model
-    model = genai.GenerativeModel('gemini-2.5-flash')
+    model = genai.GenerativeModel(MODEL_NAME)
     response = model.generate_content(prompt)
 
+    test_data = _parse_test_case_response(response)
+    if cache is not None and "error" not in test_data:
+        cache.set(cache_key, test_data)
+    return test_data
+
+async def agenerate_test_cases(requirement_text, domain="healthcare software", use_cache=True, prior_contexts=None):
+    """
+    Async variant of generate_test_cases using the SDK's async client,
+    so API handlers don't block the event loop for the duration of the model call.
+    Concurrent calls for the same requirement and domain are coalesced into one model call.
+    """
+    cache = get_response_cache() if use_cache else None
+    cache_key = test_case_cache_key(requirement_text, domain, prior_contexts)
+    if cache is not None:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    async def generate():
+        prompt = build_test_case_prompt(requirement_text, domain, prior_contexts)
+        model = genai.GenerativeModel(MODEL_NAME)
+        response = await model.generate_content_async(prompt)
+        return _parse_test_case_response(response)
+
+    # Identical concurrent requests share one model call
+    test_data = await get_single_flight("test_cases").do(cache_key, generate)
+    if cache is not None and "error" not in test_data:
+        cache.set(cache_key, test_data)
+    return test_data
+
+def _parse_test_case_response(response):
+    """Parses the model's JSON response, returning an error payload if it can't be decoded."""
     try:
         cleaned_response = response.text.strip().replace("```json", "").replace("```", "").strip()
         return json.loads(cleaned_response)
@@ -358,82 +718,122 @@ def save_output_to_file(content, file_path):
     except Exception as e:
         raise Exception(f"An error occurred while saving the file: {e}")
 
-def create_jira_issues(jira_client, gherkin_text, project_key=None, parent_issue_key=None):
-    """Parses Gherkin text and creates Jira issues, falling back to env for project key."""
+JIRA_BULK_BATCH_SIZE = 50  # Jira's bulk-create endpoint accepts at most 50 issues per request
+
+def create_jira_issues(jira_client, test_cases, project_key=None, parent_issue_key=None, max_concurrency=None, ledger=None):
+    """
+    Creates one Jira issue per Gherkin scenario of the test cases, falling back to env for project key.
+    test_cases may also be raw Gherkin text. Each issue describes its scenario together with
+    its own feature header and background.
+
+    Issues are created through Jira's bulk-create endpoint in batches of up to 50, with
+    batches sent concurrently (JIRA_MAX_CONCURRENCY, default 4) and backing off on 429 responses.
+
+    Pushed scenarios are remembered in the sync ledger: unchanged scenarios are skipped,
+    changed ones are updated in place and only new ones are created. Returns the issue keys
+    of every synced scenario in order.
+    """
     final_project_key = project_key or os.environ.get("JIRA_PROJECT_KEY")
     if not final_project_key:
         raise ValueError("JIRA_PROJECT_KEY is not configured or provided.")
 
-    scenarios = re.split(r'(?=Scenario:|Scenario Outline:)', gherkin_text)
-    if len(scenarios) < 2:
+    field_list = []
+    identity_parts = []
+    
+    for tc, feature, scenario in iter_scenarios(as_test_cases(test_cases)):
+        title = scenario.title
+        
+        issue_dict = {
+            'project': {'key': final_project_key},
+            'summary': title,
+            'description': f"{{code:gherkin}}\n{feature.render_scenario(scenario)}{{code}}",
+        }
+
+        if parent_issue_key:
+            issue_dict['parent'] = {'key': parent_issue_key}
+            issue_dict['issuetype'] = {'name': 'Sub-task'}
+        else:
+            issue_dict['issuetype'] = {'name': 'Task'}
+        
+        field_list.append(issue_dict)
+        identity_parts.append((tc.get('test_id'), title))
+
+    if not field_list:
         print("No scenarios found in the generated text. Skipping Jira creation.")
         return []
 
-    feature_header = scenarios[0]
-    created_issues = []
-    
-    for scenario_text in scenarios[1:]:
-        try:
-            title = scenario_text.splitlines()[0].strip()
-            
-            issue_dict = {
-                'project': {'key': final_project_key},
-                'summary': title,
-                'description': f"{{code:gherkin}}\n{feature_header}\n{scenario_text}{{code}}",
-            }
-
-            if parent_issue_key:
-                issue_dict['parent'] = {'key': parent_issue_key}
-                issue_dict['issuetype'] = {'name': 'Sub-task'}
-            else:
-                issue_dict['issuetype'] = {'name': 'Task'}
-            
-            new_issue = jira_client.create_issue(fields=issue_dict)
-            print(f"Successfully created Jira issue: {new_issue.key} - '{title}'")
-            created_issues.append(new_issue.key)
+    ledger = ledger or get_sync_ledger()
+    target = f"jira:{jira_client.server_url}:{final_project_key}:{parent_issue_key or ''}"
+    identities = sync_identities(identity_parts)
+    digests = [content_hash(fields) for fields in field_list]
+    actions = ledger.plan(target, list(zip(identities, digests)))
+    keys = [remote_key for _, remote_key in actions]
+
+    to_create = [i for i, (action, _) in enumerate(actions) if action == SYNC_CREATE]
+    to_update = [i for i, (action, _) in enumerate(actions) if action == SYNC_UPDATE]
+    unchanged = len(actions) - len(to_create) - len(to_update)
+    if unchanged:
+        print(f"Skipping {unchanged} unchanged Jira issues")
+
+    batches = [to_create[i:i + JIRA_BULK_BATCH_SIZE] for i in range(0, len(to_create), JIRA_BULK_BATCH_SIZE)]
+    workers = max_concurrency or int(os.environ.get("JIRA_MAX_CONCURRENCY", 4))
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(batches) + len(to_update)))) as executor:
+        created = executor.map(lambda batch: _create_jira_batch(jira_client, [field_list[i] for i in batch]), batches)
+        updated = executor.map(lambda i: _update_jira_issue(jira_client, keys[i], field_list[i]), to_update)
+        for batch, batch_keys in zip(batches, list(created)):
+            for i, key in zip(batch, batch_keys):
+                keys[i] = key
+        for i, ok in zip(to_update, list(updated)):
+            if not ok:
+                keys[i] = None
+
+    ledger.record(target, [
+        (identities[i], digests[i], keys[i]) for i in to_create + to_update if keys[i]
+    ])
+
+    # Results keep scenario order
+    return [key for key in keys if key]
+
+def _create_jira_batch(jira_client, field_list):
+    """
+    Creates one batch of issues with a single bulk-create request.
+    Returns one key per input (None where creation failed).
+    """
+    try:
+        results = _call_with_backoff(jira_client.create_issues, field_list=field_list, prefetch=False)
+    except Exception as e:
+        print(f"Failed to create batch of {len(field_list)} Jira issues. Error: {e}")
+        return [None] * len(field_list)
 
-        except Exception as e:
-            print(f"Failed to create Jira issue for scenario: '{title}'. Error: {e}")
-    
+    created_issues = []
+    for result in results:
+        title = result['input_fields'].get('summary')
+        if result['status'] == 'Success':
+            print(f"Successfully created Jira issue: {result['issue'].key} - '{title}'")
+            created_issues.append(result['issue'].key)
+        else:
+            print(f"Failed to create Jira issue for scenario: '{title}'. Error: {result['error']}")
+            created_issues.append(None)
     return created_issues
 
+def _update_jira_issue(jira_client, issue_key, fields):
+    """Updates the summary and description of a previously synced issue."""
+    try:
+        issue = _call_with_backoff(jira_client.issue, issue_key, fields='summary')
+        _call_with_backoff(issue.update, fields={'summary': fields['summary'], 'description': fields['description']})
+        print(f"Successfully updated Jira issue: {issue_key} - '{fields['summary']}'")
+        return True
+    except Exception as e:
+        print(f"Failed to update Jira issue {issue_key}: '{fields['summary']}'. Error: {e}")
+        return False
+
 # --- Requirements Traceability Matrix Generation ---
 
 def generate_traceability_matrix(requirement_text, test_cases):
     """
     Generates a Requirements Traceability Matrix (RTM) that maps requirements to test cases.
     This is critical for FDA, IEC 62304, and ISO 13485 compliance.
+    Every requirement in the document is listed; test cases are linked by requirement ID
+    or by similarity of their requirement_source (see core/traceability.py).
     """
-    matrix = {
-        "requirement_text": requirement_text,
-        "generation_timestamp": datetime.now().isoformat(),
-        "total_test_cases": len(test_cases),
-        "traceability_mapping": []
-    }
-    
-    # Extract key requirements from the requirement text
-    # Simple approach: split by sentences
-    requirements = [req.strip() for req in requirement_text.split('.') if len(req.strip()) > 50]
-    
-    for i, requirement in enumerate(requirements[:20], 1):  # Limit to 20 requirements
-        requirement_id = f"REQ-{i:03d}"
-        
-        # Find related test cases by checking requirement_source
-        related_tests = [
-            {
-                "test_id": tc.get("test_id", ""),
-                "compliance_status": tc.get("compliance_assessment", {}).get("status", "Unknown"),
-                "risk_score": tc.get("risk_and_priority", {}).get("score", 0)
-            }
-            for tc in test_cases 
-            if requirement_id in tc.get("requirement_source", "")[:100]  # Simple matching
-        ]
-        
-        matrix["traceability_mapping"].append({
-            "requirement_id": requirement_id,
-            "requirement_text": requirement[:200] + "..." if len(requirement) > 200 else requirement,
-            "related_test_cases": related_tests if related_tests else [{"test_id": "No direct mapping", "note": "Requirement not directly mapped to test cases"}],
-            "coverage_status": "Covered" if related_tests else "Not Covered"
-        })
-    
-    return matrix
+    return build_traceability_matrix(requirement_text, test_cases)
@@ -0,0 +1,146 @@
+"""
+Retrieval Module
+Offline BM25 index over stored requirement text, used to find prior contexts similar to a
+new requirement so their test cases and feedback can be fed into (or replace) generation.
+"""
+
+import re
+import math
+import heapq
+import threading
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+# Negations and modal verbs ("not", "must", "should") are kept: they change what a requirement means
+STOP_WORDS = frozenset(
+    "a an and are as at be by for from has have if in into is it its of on or "
+    "that the their then there these this to was when which with".split()
+)
+
+
+@lru_cache(maxsize=65536)
+def _stem(token: str) -> str:
+    """Light suffix stripping so "patients"/"patient" and "resetting"/"reset" share a term."""
+    if len(token) > 4 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 5 and token.endswith("ing"):
+        token = token[:-3]
+    elif len(token) > 4 and token.endswith("ed"):
+        token = token[:-2]
+    elif len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    else:
+        return token
+    # Undouble the consonant left behind ("resetting" -> "resett" -> "reset")
+    return token[:-1] if len(token) > 3 and token[-1] == token[-2] and token[-1] not in "aeiouls" else token
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase, lightly stemmed word tokens without stop words or single letters (numbers are kept)."""
+    return [_stem(token) for token in _TOKEN.findall((text or "").lower())
+            if (len(token) > 1 or token.isdigit()) and token not in STOP_WORDS]
+
+
+def _domain_key(domain: Optional[str]) -> str:
+    return " ".join((domain or "").lower().split())
+
+
+class BM25Index:
+    """
+    In-memory inverted index ranked with Okapi BM25.
+
+    search() ranks candidates by BM25 through the postings of the query terms only, then
+    reports a bounded similarity for each hit (cosine of idf-weighted term vectors, 1.0 for
+    identical text) that callers can compare against a fixed threshold.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[str, int]] = {}  # term -> {doc_id: term frequency}
+        self._doc_terms: Dict[str, Counter] = {}
+        self._doc_lengths: Dict[str, int] = {}
+        self._domains: Dict[str, str] = {}
+        self._total_length = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._doc_terms)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._doc_terms
+
+    def add(self, doc_id: str, text: str, domain: Optional[str] = None):
+        """Index a document, replacing any previous version with the same ID."""
+        terms = Counter(tokenize(text))
+        with self._lock:
+            self._remove(doc_id)
+            self._doc_terms[doc_id] = terms
+            self._doc_lengths[doc_id] = sum(terms.values())
+            self._domains[doc_id] = _domain_key(domain)
+            self._total_length += self._doc_lengths[doc_id]
+            for term, frequency in terms.items():
+                self._postings.setdefault(term, {})[doc_id] = frequency
+
+    def remove(self, doc_id: str):
+        with self._lock:
+            self._remove(doc_id)
+
+    def search(self, query: str, limit: int = 5, domain: Optional[str] = None,
+               exclude: Iterable[str] = ()) -> List[Tuple[str, float, float]]:
+        """
+        Best matching documents as (doc_id, bm25 score, similarity), best first.
+        With domain, only documents indexed under the same domain are considered.
+        """
+        query_terms = Counter(tokenize(query))
+        excluded = set(exclude)
+        domain_key = _domain_key(domain) if domain is not None else None
+        with self._lock:
+            if not query_terms or not self._doc_terms:
+                return []
+            average_length = self._total_length / len(self._doc_terms)
+            scores: Dict[str, float] = {}
+            for term in query_terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = self._idf(term)
+                for doc_id, frequency in postings.items():
+                    norm = self.k1 * (1 - self.b + self.b * self._doc_lengths[doc_id] / average_length)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * frequency * (self.k1 + 1) / (frequency + norm)
+
+            ranked = heapq.nlargest(limit, (
+                (score, doc_id) for doc_id, score in scores.items()
+                if doc_id not in excluded and (domain_key is None or self._domains[doc_id] == domain_key)
+            ))
+            return [(doc_id, score, self._similarity(query_terms, self._doc_terms[doc_id]))
+                    for score, doc_id in ranked]
+
+    def _idf(self, term: str) -> float:
+        document_frequency = len(self._postings.get(term, ()))
+        return math.log(1 + (len(self._doc_terms) - document_frequency + 0.5) / (document_frequency + 0.5))
+
+    def _similarity(self, query_terms: Counter, doc_terms: Counter) -> float:
+        weights = {term: self._idf(term) for term in set(query_terms) | set(doc_terms)}
+        dot = sum(frequency * doc_terms.get(term, 0) * weights[term] ** 2 for term, frequency in query_terms.items())
+        query_norm = math.sqrt(sum((frequency * weights[term]) ** 2 for term, frequency in query_terms.items()))
+        doc_norm = math.sqrt(sum((frequency * weights[term]) ** 2 for term, frequency in doc_terms.items()))
+        if not query_norm or not doc_norm:
+            return 0.0
+        return round(min(dot / (query_norm * doc_norm), 1.0), 4)
+
+    def _remove(self, doc_id: str):
+        terms = self._doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+        self._domains.pop(doc_id, None)
+        self._total_length -= self._doc_lengths.pop(doc_id)
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self._postings[term]
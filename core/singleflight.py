@@ -0,0 +1,61 @@
+"""
+Single-Flight Module
+Coalesces identical concurrent requests: callers with the same key await one shared
+in-flight call instead of each calling the model.
+"""
+
+import copy
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent async calls by key.
+
+    The first caller for a key starts the work as a task; later callers with the same key
+    await that task until it finishes. The shared task is shielded so a cancelled caller
+    (e.g. a disconnected client) does not cancel the work for everyone else. Every caller
+    receives its own copy of the result, so callers can freely mutate it.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._inflight = {}  # key -> asyncio.Task
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._inflight.get(key)
+        if task is None:
+            self.calls += 1
+            task = asyncio.ensure_future(func())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.coalesced += 1
+
+        result = await asyncio.shield(task)
+        return copy.deepcopy(result)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._inflight)
+        }
+
+
+# Global single-flight groups, one per kind of call
+_flights = {}
+
+def get_single_flight(name: str) -> SingleFlight:
+    """Factory function to get the shared single-flight group for a kind of call."""
+    if name not in _flights:
+        _flights[name] = SingleFlight(name)
+    return _flights[name]
+
+
+def single_flight_stats() -> Dict[str, Dict[str, Any]]:
+    """Coalescing counters for every single-flight group."""
+    return {name: flight.stats() for name, flight in _flights.items()}
@@ -0,0 +1,134 @@
+"""
+Streaming Generation Module
+Streams test cases out of the Gemini streaming response as soon as each one is complete,
+so clients can render the first test case long before the full JSON document arrives.
+"""
+
+import json
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import google.generativeai as genai
+
+from .cache import get_response_cache
+from .logic import MODEL_NAME, build_test_case_prompt, test_case_cache_key, _parse_test_case_response
+
+
+class TestCaseStreamParser:
+    """
+    Incremental parser that extracts test case objects from a partially received JSON document.
+
+    Works on both the expected {"test_cases": [{...}, ...]} shape and a bare [{...}, ...] array.
+    Only the text of the object currently being received is buffered.
+    """
+
+    def __init__(self):
+        self._stack = []          # open brackets/braces outside of strings
+        self._in_string = False
+        self._escaped = False
+        self._current = []        # characters of the object being collected
+        self._collecting = False
+
+    def feed(self, text: str) -> List[Dict[str, Any]]:
+        """Consume the next piece of streamed text and return any test cases completed by it."""
+        completed = []
+        for char in text:
+            if self._collecting:
+                self._current.append(char)
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if char == '"':
+                self._in_string = True
+            elif char in "{[":
+                if char == "{" and not self._collecting and self._is_test_case_level():
+                    self._collecting = True
+                    self._current = [char]
+                self._stack.append(char)
+            elif char in "}]":
+                if self._stack:
+                    self._stack.pop()
+                if self._collecting and char == "}" and self._is_test_case_level():
+                    self._collecting = False
+                    test_case = self._decode("".join(self._current))
+                    self._current = []
+                    if test_case is not None:
+                        completed.append(test_case)
+        return completed
+
+    def _is_test_case_level(self) -> bool:
+        """True when the innermost open container is the test case array."""
+        return bool(self._stack) and self._stack[-1] == "[" and len(self._stack) <= 2
+
+    @staticmethod
+    def _decode(raw: str):
+        try:
+            value = json.loads(raw)
+        except json.JSONDecodeError:
+            return None
+        return value if isinstance(value, dict) else None
+
+
+async def astream_test_cases(requirement_text: str, domain: str = "healthcare software",
+                             use_cache: bool = True,
+                             prior_contexts: Optional[List[Dict[str, Any]]] = None) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Yield test cases one by one as the model streams them, with test cases and feedback from
+    similar prior contexts in the prompt when given.
+
+    Cached results are replayed immediately. Once the stream finishes, the complete result
+    is stored in the response cache so later non-streaming calls can reuse it.
+    Raises ValueError if the model response contains no decodable test cases.
+    """
+    cache = get_response_cache() if use_cache else None
+    cache_key = test_case_cache_key(requirement_text, domain, prior_contexts)
+    if cache is not None:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            for test_case in cached.get("test_cases", []):
+                yield test_case
+            return
+
+    prompt = build_test_case_prompt(requirement_text, domain, prior_contexts)
+    model = genai.GenerativeModel(MODEL_NAME)
+    response = await model.generate_content_async(prompt, stream=True)
+
+    parser = TestCaseStreamParser()
+    test_cases = []
+    raw_chunks = []
+    async for chunk in response:
+        text = chunk.text or ""
+        raw_chunks.append(text)
+        for test_case in parser.feed(text):
+            test_cases.append(test_case)
+            yield test_case
+
+    if not test_cases:
+        # Fall back to decoding the whole response in case the incremental parse missed it
+        test_data = _parse_test_case_response(_RawResponse("".join(raw_chunks)))
+        if "error" in test_data:
+            raise ValueError(test_data["error"])
+        test_cases = test_data.get("test_cases", [])
+        for test_case in test_cases:
+            yield test_case
+
+    if cache is not None and test_cases:
+        cache.set(cache_key, {"test_cases": test_cases})
+
+
+def format_sse(event: str, data: Any) -> str:
+    """Format a Server-Sent Events message with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+class _RawResponse:
+    """Adapter giving accumulated stream text the .text attribute the response parser expects."""
+
+    def __init__(self, text: str):
+        self.text = text
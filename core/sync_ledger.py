@@ -0,0 +1,122 @@
+"""
+Sync Ledger Module
+Remembers what was pushed to each ALM target so repeated syncs are idempotent:
+unchanged test cases are skipped, changed ones are updated in place and only new ones are created.
+"""
+
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .cache import make_cache_key, normalize_text
+
+SYNC_CREATE = "create"
+SYNC_UPDATE = "update"
+SYNC_UNCHANGED = "unchanged"
+
+
+def sync_identity(*parts: Any) -> str:
+    """Stable key for a synced item (e.g. test ID plus requirement source), whitespace-insensitive."""
+    return make_cache_key(*(normalize_text(str(part or "")) for part in parts))
+
+
+def sync_identities(parts_list: List[Tuple[Any, ...]]) -> List[str]:
+    """sync_identity for a list of items; repeated parts are numbered by occurrence so each stays distinct."""
+    seen = {}
+    identities = []
+    for parts in parts_list:
+        identity = sync_identity(*parts)
+        seen[identity] = seen.get(identity, 0) + 1
+        identities.append(identity if seen[identity] == 1 else sync_identity(*parts, seen[identity]))
+    return identities
+
+
+def content_hash(payload: Any) -> str:
+    """Hash of the fields sent to the remote system; a change means the remote item needs an update."""
+    return make_cache_key(payload)
+
+
+class SyncLedger:
+    """
+    SQLite table of (target, item) -> (content hash, remote key).
+
+    A target names one remote destination, e.g. "github:owner/repo" or "jira:<server>:<project>".
+    """
+
+    def __init__(self, db_path: str = "sync_storage/ledger.db"):
+        self.db_path = db_path
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS sync_ledger ("
+            "target TEXT NOT NULL, item_key TEXT NOT NULL, content_hash TEXT NOT NULL, "
+            "remote_key TEXT NOT NULL, synced_at TEXT NOT NULL, "
+            "PRIMARY KEY (target, item_key))"
+        )
+        self._conn.commit()
+
+    def lookup(self, target: str, item_keys: Iterable[str]) -> Dict[str, Tuple[str, str]]:
+        """Map each known item key to its (content_hash, remote_key)."""
+        item_keys = list(item_keys)
+        found = {}
+        with self._lock:
+            # Stay well under SQLite's bound-parameter limit
+            for start in range(0, len(item_keys), 500):
+                batch = item_keys[start:start + 500]
+                placeholders = ", ".join("?" for _ in batch)
+                rows = self._conn.execute(
+                    f"SELECT item_key, content_hash, remote_key FROM sync_ledger "
+                    f"WHERE target = ? AND item_key IN ({placeholders})",
+                    (target, *batch)
+                ).fetchall()
+                found.update({row[0]: (row[1], row[2]) for row in rows})
+        return found
+
+    def plan(self, target: str, items: List[Tuple[str, str]]) -> List[Tuple[str, Optional[str]]]:
+        """
+        Decide what to do for each (item_key, content_hash) pair.
+
+        Returns one (action, remote_key) per item, in order: SYNC_CREATE with no remote key,
+        SYNC_UPDATE when the content changed, or SYNC_UNCHANGED when it was already pushed as is.
+        """
+        known = self.lookup(target, [item_key for item_key, _ in items])
+        actions = []
+        for item_key, digest in items:
+            if item_key not in known:
+                actions.append((SYNC_CREATE, None))
+            elif known[item_key][0] == digest:
+                actions.append((SYNC_UNCHANGED, known[item_key][1]))
+            else:
+                actions.append((SYNC_UPDATE, known[item_key][1]))
+        return actions
+
+    def record(self, target: str, entries: Iterable[Tuple[str, str, Any]]):
+        """Store (item_key, content_hash, remote_key) entries after a successful push."""
+        now = datetime.now().isoformat()
+        rows = [(target, item_key, digest, str(remote_key), now) for item_key, digest, remote_key in entries]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO sync_ledger (target, item_key, content_hash, remote_key, synced_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+
+
+# Global sync ledger instance
+_sync_ledger = None
+
+def get_sync_ledger() -> SyncLedger:
+    """Factory function to get the global sync ledger, stored at SYNC_LEDGER_PATH (default sync_storage/ledger.db)."""
+    global _sync_ledger
+    if _sync_ledger is None:
+        _sync_ledger = SyncLedger(os.environ.get("SYNC_LEDGER_PATH", "sync_storage/ledger.db"))
+    return _sync_ledger
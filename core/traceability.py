@@ -0,0 +1,231 @@
+"""
+Traceability Module
+Builds the Requirements Traceability Matrix: segments requirement documents into individual
+requirements and links each test case to them through an inverted index ranked by similarity.
+"""
+
+import re
+import math
+import heapq
+from operator import itemgetter
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from .retrieval import tokenize
+
+# Explicit requirement IDs such as "REQ-001", "FR_12" or "SRS-4.2"
+_REQUIREMENT_ID = re.compile(r"\b([A-Z]{2,}[-_]\d+(?:\.\d+)*)\b")
+# An ID only names a requirement when it leads the item, optionally bracketed: "[REQ-001] ..."
+_LEADING_ID = re.compile(r"^[\[(]?([A-Z]{2,}[-_]\d+(?:\.\d+)*)[\])]?(?=[\s:.)-]|$)")
+_LIST_MARKER = re.compile(r"^\s*(?:[-*•]\s+|\(?\d+(?:\.\d+)*[.)]\s+|\(?[a-zA-Z][.)]\s+)")
+_HEADING = re.compile(r"^\s*(?:#{1,6}\s+|[A-Z][A-Z0-9 /&-]{3,}:?\s*$)")
+_SENTENCE_END = re.compile(r"(?<=[.!?;])\s+(?=[A-Z0-9(\"'])")
+_ABBREVIATION = re.compile(r"\b(?:e\.g|i\.e|etc|vs|approx|fig|no|dr|mr|ms)\.$", re.IGNORECASE)
+
+# Requirements need at least this many content words; shorter fragments are headings or noise
+MIN_REQUIREMENT_TOKENS = 3
+
+
+class Requirement:
+    __slots__ = ("requirement_id", "text", "explicit_id")
+
+    def __init__(self, requirement_id: str, text: str, explicit_id: bool):
+        self.requirement_id = requirement_id
+        self.text = text
+        self.explicit_id = explicit_id
+
+
+def segment_requirements(text: str) -> List[Requirement]:
+    """
+    Split a requirement document into individual requirements.
+
+    A line led by an explicit ID (REQ-001, [FR_12], ...) starts a requirement that runs until the
+    next list item, heading or blank line. Other paragraphs and list items are split into
+    sentences, each numbered REQ-001, REQ-002, ... (skipping numbers used explicitly).
+    Headings and fragments under MIN_REQUIREMENT_TOKENS content words are dropped.
+    """
+    segments: List[Tuple[Optional[str], str]] = []
+    for block in _blocks(text or ""):
+        explicit = _LEADING_ID.match(block)
+        if explicit:
+            segments.append((explicit.group(1), block))
+        else:
+            segments.extend((None, sentence) for sentence in _sentences(block))
+
+    used_ids = {requirement_id for requirement_id, _ in segments if requirement_id}
+    requirements, by_id, number = [], {}, 0
+    for requirement_id, segment in segments:
+        if requirement_id in by_id:
+            # The same ID again continues that requirement
+            by_id[requirement_id].text += " " + segment
+            continue
+        if len(tokenize(segment)) < MIN_REQUIREMENT_TOKENS:
+            continue
+        if requirement_id is None:
+            number += 1
+            while f"REQ-{number:03d}" in used_ids:
+                number += 1
+            requirements.append(Requirement(f"REQ-{number:03d}", segment, explicit_id=False))
+        else:
+            by_id[requirement_id] = Requirement(requirement_id, segment, explicit_id=True)
+            requirements.append(by_id[requirement_id])
+    return requirements
+
+
+def _blocks(text: str) -> List[str]:
+    """Paragraphs and list items with their lines joined; headings end a block and are dropped."""
+    blocks, current = [], []
+    for line in text.splitlines():
+        stripped = line.strip()
+        starts_item = bool(_LIST_MARKER.match(line) or _LEADING_ID.match(stripped))
+        if not stripped or _HEADING.match(line) or starts_item:
+            if current:
+                blocks.append(" ".join(current))
+            current = [_LIST_MARKER.sub("", line, count=1).strip()] if starts_item else []
+        else:
+            current.append(stripped)
+    if current:
+        blocks.append(" ".join(current))
+    return blocks
+
+
+def _sentences(block: str) -> List[str]:
+    sentences = []
+    for piece in _SENTENCE_END.split(block):
+        if sentences and _ABBREVIATION.search(sentences[-1]):
+            sentences[-1] = f"{sentences[-1]} {piece}"
+        else:
+            sentences.append(piece)
+    return [sentence.strip() for sentence in sentences if sentence.strip()]
+
+
+def _features(text: str) -> Counter:
+    """Stemmed word tokens plus word-bigram shingles, which reward matching phrasing."""
+    tokens = tokenize(text)
+    features = Counter(tokens)
+    features.update(f"{first} {second}" for first, second in zip(tokens, tokens[1:]))
+    return features
+
+
+class TraceabilityIndex:
+    """
+    Inverted index of requirement features scored with TF-IDF cosine similarity.
+
+    Features found in more than max_df_ratio of the requirements (once there are at least
+    min_docs_for_pruning of them) carry almost no signal, so they are left out of the index;
+    a lookup then only walks the short postings lists of distinctive words and phrases.
+    """
+
+    def __init__(self, requirements: List[Requirement], max_df_ratio: float = 0.1,
+                 min_docs_for_pruning: int = 50):
+        self.requirements = requirements
+        doc_features = [_features(requirement.text) for requirement in requirements]
+        document_frequency = Counter(feature for features in doc_features for feature in features)
+
+        count = len(requirements)
+        max_df = max_df_ratio * count if count >= min_docs_for_pruning else count
+        self._idf = {
+            feature: math.log((count + 1) / (df + 1)) + 1
+            for feature, df in document_frequency.items() if df <= max_df
+        }
+        self._pruned = {feature for feature, df in document_frequency.items() if df > max_df}
+        self._unknown_idf = math.log(count + 1) + 1
+        # Postings hold weights already divided by the requirement's norm, so accumulated
+        # scores only need dividing by the query norm for the few results returned
+        self._postings: Dict[str, List[Tuple[int, float]]] = {}
+        for position, features in enumerate(doc_features):
+            weights = {feature: frequency * self._idf[feature]
+                       for feature, frequency in features.items() if feature in self._idf}
+            norm = math.sqrt(sum(weight * weight for weight in weights.values())) or 1.0
+            for feature, weight in weights.items():
+                self._postings.setdefault(feature, []).append((position, weight / norm))
+        self._by_id = {requirement.requirement_id: position for position, requirement in enumerate(requirements)}
+
+    def position(self, requirement_id: str) -> Optional[int]:
+        return self._by_id.get(requirement_id)
+
+    def match(self, text: str, limit: int = 3) -> List[Tuple[int, float]]:
+        """Best matching requirements for a text as (position, similarity 0-1), best first."""
+        scores: Dict[int, float] = defaultdict(float)
+        query_squared = 0.0
+        idfs, postings = self._idf, self._postings
+        for feature, frequency in _features(text).items():
+            idf = idfs.get(feature)
+            if idf is None:
+                if feature not in self._pruned:
+                    # Words the requirements never use still make the texts less alike
+                    query_squared += (frequency * self._unknown_idf) ** 2
+                continue
+            weight = frequency * idf
+            query_squared += weight * weight
+            for position, doc_weight in postings[feature]:
+                scores[position] += weight * doc_weight
+        if not scores:
+            return []
+        query_norm = math.sqrt(query_squared)
+        return [(position, round(min(score / query_norm, 1.0), 4))
+                for position, score in heapq.nlargest(limit, scores.items(), key=itemgetter(1))]
+
+
+def build_traceability_matrix(requirement_text: str, test_cases: List[Dict[str, Any]],
+                              min_similarity: float = 0.2, relative_cutoff: float = 0.75,
+                              max_links_per_test: int = 3) -> Dict[str, Any]:
+    """
+    Map every segmented requirement to the test cases that validate it.
+
+    A test case is linked to the requirements named by ID in its requirement_source, or else
+    to its best match by similarity (at least min_similarity) plus any other requirement
+    scoring within relative_cutoff of that best match, up to max_links_per_test.
+    """
+    requirements = segment_requirements(requirement_text)
+    index = TraceabilityIndex(requirements)
+    related: List[List[Dict[str, Any]]] = [[] for _ in requirements]
+    unmapped = []
+
+    links_by_source: Dict[str, List[Tuple[int, float]]] = {}  # test cases often share a source
+    for tc in test_cases:
+        source = tc.get("requirement_source") or ""
+        links = links_by_source.get(source)
+        if links is None:
+            links = [(index.position(requirement_id), 1.0) for requirement_id in _REQUIREMENT_ID.findall(source)]
+            links = [(position, similarity) for position, similarity in links if position is not None]
+            if not links:
+                matches = index.match(source, limit=max_links_per_test)
+                if matches and matches[0][1] >= min_similarity:
+                    cutoff = max(min_similarity, matches[0][1] * relative_cutoff)
+                    links = [(position, similarity) for position, similarity in matches if similarity >= cutoff]
+            links_by_source[source] = links
+        if not links:
+            unmapped.append(tc.get("test_id", ""))
+            continue
+        for position, similarity in links[:max_links_per_test]:
+            related[position].append({
+                "test_id": tc.get("test_id", ""),
+                "compliance_status": tc.get("compliance_assessment", {}).get("status", "Unknown"),
+                "risk_score": tc.get("risk_and_priority", {}).get("score", 0),
+                "similarity": similarity
+            })
+
+    mapping = []
+    for requirement, tests in zip(requirements, related):
+        tests.sort(key=lambda test: test["similarity"], reverse=True)
+        text = requirement.text
+        mapping.append({
+            "requirement_id": requirement.requirement_id,
+            "requirement_text": text[:200] + "..." if len(text) > 200 else text,
+            "related_test_cases": tests if tests else [{"test_id": "No direct mapping", "note": "Requirement not directly mapped to test cases"}],
+            "coverage_status": "Covered" if tests else "Not Covered"
+        })
+
+    covered = sum(1 for tests in related if tests)
+    return {
+        "requirement_text": requirement_text,
+        "generation_timestamp": datetime.now().isoformat(),
+        "total_test_cases": len(test_cases),
+        "total_requirements": len(requirements),
+        "covered_requirements": covered,
+        "coverage_percentage": round(100 * covered / len(requirements), 1) if requirements else 0.0,
+        "traceability_mapping": mapping,
+        "unmapped_test_cases": unmapped
+    }
@@ -352,12 +352,53 @@ const extractGherkinInfo = (gherkinText) => {
   return { feature, scenario };
 };
 
+// Helper function to consume a Server-Sent Events response from a POST request.
+// Calls onEvent(eventName, data) for every event as soon as it arrives.
+const streamEvents = async (url, options, onEvent) => {
+  const response = await fetch(url, options);
+  if (!response.ok) {
+    let detail = `HTTP error! status: ${response.status}`;
+    try {
+      detail = (await response.json()).detail || detail;
+    } catch (e) {
+      // Non-JSON error body; keep the status message
+    }
+    throw new Error(detail);
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+
+    let boundary = buffer.indexOf('\n\n');
+    while (boundary !== -1) {
+      const rawEvent = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+      boundary = buffer.indexOf('\n\n');
+
+      let eventName = 'message';
+      let data = '';
+      rawEvent.split('\n').forEach(line => {
+        if (line.startsWith('event:')) eventName = line.substring(6).trim();
+        else if (line.startsWith('data:')) data += line.substring(5).trim();
+      });
+      if (data) onEvent(eventName, JSON.parse(data));
+    }
+  }
+};
+
 function App() {
   const [file, setFile] = useState(null);
   const [requirementText, setRequirementText] = useState('');
   const [domain] = useState('Healthcare'); // Fixed domain value
   const [testData, setTestData] = useState(null);
   const [loading, setLoading] = useState(false);
+  const [streaming, setStreaming] = useState(false);
   const [error, setError] = useState('');
   const [integrationLoading, setIntegrationLoading] = useState(false);
   const [integrationError, setIntegrationError] = useState('');
@@ -451,27 +492,43 @@ function App() {
       return;
     }
     setLoading(true);
+    setStreaming(true);
     setError('');
     setTestData(null);
     setIntegrationSuccess('');
     setIntegrationError('');
 
+    // Test cases are rendered as they stream in; the spinner only shows until the first one arrives
+    const handleEvent = (eventName, data) => {
+      if (eventName === 'test_case') {
+        setTestData(prev => ({ ...prev, test_cases: [...(prev?.test_cases || []), data] }));
+        setLoading(false);
+      } else if (eventName === 'error') {
+        throw new Error(data.detail);
+      } else if (eventName !== 'done') {
+        setTestData(prev => ({ ...prev, [eventName]: data }));
+      }
+    };
+
     try {
-      let response;
       if (requirementText.trim()) {
         const payload = { requirement_text: requirementText, domain: domain };
-        response = await axios.post(`${API_BASE_URL}/api/generate-from-text`, payload);
+        await streamEvents(`${API_BASE_URL}/api/generate-from-text/stream`, {
+          method: 'POST',
+          headers: { 'Content-Type': 'application/json' },
+          body: JSON.stringify(payload),
+        }, handleEvent);
       } else {
         const formData = new FormData();
         formData.append('requirement_file', file);
         formData.append('domain', domain);
-        response = await axios.post(`${API_BASE_URL}/api/generate`, formData, { headers: { 'Content-Type': 'multipart/form-data' } });
+        await streamEvents(`${API_BASE_URL}/api/generate/stream`, { method: 'POST', body: formData }, handleEvent);
       }
-      setTestData(response.data);
     } catch (err) {
-      setError(err.response?.data?.detail || 'An unexpected error occurred.');
+      setError(err.message || 'An unexpected error occurred.');
     } finally {
       setLoading(false);
+      setStreaming(false);
     }
   };
 
@@ -1194,6 +1251,7 @@ function App() {
                   }}>
                     Generated Test Cases
                   </Typography>
+                  {streaming && <CircularProgress size={18} sx={{ color: '#3B82F6' }} />}
                 </Box>
                 
                 {/* Export Actions */}
@@ -1232,7 +1290,7 @@ function App() {
                     variant="contained"
                     startIcon={integrationLoading ? <CircularProgress size={16} sx={{ color: '#FAFAFA' }} /> : <ConfirmationNumber sx={{ fontSize: { xs: '16px', sm: '20px' } }} />}
                     onClick={handleIntegrationSubmit}
-                    disabled={integrationLoading}
+                    disabled={integrationLoading || streaming}
                     fullWidth={false}
                     sx={{
                       background: 'linear-gradient(135deg, #3B82F6 0%, #9333EA 100%)',
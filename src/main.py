@@ -10,6 +10,7 @@ from core.logic import (
     save_output_to_file,
     create_jira_issues
 )
+from core.chunking import generate_test_cases_chunked
 
 def main():
     """Wraps the main execution logic for the command-line interface."""
@@ -19,6 +20,7 @@ def main():
     parser.add_argument("--domain", default="healthcare software", help="The industry domain for the requirements (e.g., 'finance', 'e-commerce').")
     parser.add_argument("--jira", action='store_true', help="If set, create issues in Jira for each test scenario.")
     parser.add_argument("--parent-issue", help="Jira key of the parent issue for sub-tasks.")
+    parser.add_argument("--max-parallel", type=int, help="Concurrent AI calls when a large document is split into chunks.")
     args = parser.parse_args()
 
     try:
@@ -34,7 +36,8 @@ def main():
         print("\n--- Generating Test Cases ---")
         # Note: The core generate_test_cases function returns a dictionary.
         # The CLI tool previously worked with raw text, so we'll adapt.
-        generated_data = generate_test_cases(requirement_text, args.domain)
+        # Large documents are split into chunks and generated concurrently.
+        generated_data = generate_test_cases_chunked(requirement_text, args.domain, max_parallel=args.max_parallel)
 
         if 'error' in generated_data:
             raise Exception(f"Failed to generate test cases: {generated_data['error']}")
@@ -56,7 +59,7 @@ def main():
             print("\n--- Creating Jira Issues ---")
             jira_client = configure_jira()
             print("Jira connection successful.")
-            create_jira_issues(jira_client, full_gherkin_output, args.parent_issue)
+            create_jira_issues(jira_client, generated_data['test_cases'], parent_issue_key=args.parent_issue)
 
     except Exception as e:
         print(f"\nAn error occurred during execution: {e}")
@@ -0,0 +1,25 @@
+"""
+Shared test setup: makes the repository root importable so tests can use core and app.
+Tests stub Gemini and HTTP clients; nothing here calls external services.
+Tests marked benchmark assert wall-clock times and only run with RUN_BENCHMARKS=1.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "benchmark: wall-clock benchmark, only run with RUN_BENCHMARKS=1")
+
+
+def pytest_collection_modifyitems(config, items):
+    if os.environ.get("RUN_BENCHMARKS") == "1":
+        return
+    skip = pytest.mark.skip(reason="wall-clock benchmark; set RUN_BENCHMARKS=1 to run")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
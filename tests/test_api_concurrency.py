@@ -0,0 +1,92 @@
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+
+import app as app_module
+import core.logic as logic
+from core.cache import ResponseCache
+
+MODEL_LATENCY = 1.0
+GENERATIONS = 5
+
+
+class SlowModel:
+    """Stands in for Gemini: every async generation takes MODEL_LATENCY seconds."""
+    in_flight = 0
+    peak_in_flight = 0
+
+    def __init__(self, name):
+        pass
+
+    async def generate_content_async(self, prompt):
+        SlowModel.in_flight += 1
+        SlowModel.peak_in_flight = max(SlowModel.peak_in_flight, SlowModel.in_flight)
+        try:
+            await asyncio.sleep(MODEL_LATENCY)
+        finally:
+            SlowModel.in_flight -= 1
+        return type("Response", (), {"text": json.dumps({"test_cases": [{"test_id": "TC_001"}]})})()
+
+
+@pytest.fixture
+def slow_model(monkeypatch):
+    monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+    SlowModel.in_flight = SlowModel.peak_in_flight = 0
+    monkeypatch.setattr(logic.genai, "GenerativeModel", SlowModel)
+    cache = ResponseCache()
+    monkeypatch.setattr(logic, "get_response_cache", lambda: cache)
+
+
+def _probe_health_during_generations():
+    """
+    Fire GENERATIONS generations, then poll /api/health until they finish. Returns the
+    generation responses, (latency, generations finished) per health probe and the total time.
+    """
+    async def scenario():
+        transport = httpx.ASGITransport(app=app_module.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            started = time.perf_counter()
+            generations = [asyncio.create_task(client.post("/api/generate-from-text", json={
+                "requirement_text": f"Requirement {i}: the system shall log every access.",
+                "chunked": False,
+                "use_prior_contexts": False
+            })) for i in range(GENERATIONS)]
+            await asyncio.sleep(0.1)
+
+            probes = []
+            while not all(task.done() for task in generations):
+                probe = time.perf_counter()
+                response = await client.get("/api/health")
+                assert response.status_code == 200
+                probes.append((time.perf_counter() - probe, sum(task.done() for task in generations)))
+                await asyncio.sleep(0.1)
+
+            responses = await asyncio.gather(*generations)
+            return responses, probes, time.perf_counter() - started
+
+    return asyncio.run(scenario())
+
+
+def test_health_answers_while_generations_are_in_flight(slow_model):
+    responses, probes, _ = _probe_health_during_generations()
+
+    assert all(response.status_code == 200 for response in responses)
+    # Health checks are answered before any of the slow generations has finished
+    assert probes and probes[0][1] == 0
+    # and the generations call the model concurrently instead of queueing behind each other
+    assert SlowModel.peak_in_flight == GENERATIONS
+
+
+@pytest.mark.benchmark
+def test_health_stays_fast_while_generations_are_in_flight(slow_model):
+    responses, probes, elapsed = _probe_health_during_generations()
+    print(f"{len(probes)} health checks, slowest {max(latency for latency, _ in probes) * 1000:.0f} ms; "
+          f"{GENERATIONS} generations in {elapsed:.2f}s")
+
+    assert len(probes) >= 5
+    assert max(latency for latency, _ in probes) < 0.2
+    # The generations overlap instead of queueing behind each other
+    assert elapsed < MODEL_LATENCY * 2
@@ -0,0 +1,90 @@
+import asyncio
+
+import core.chunking as chunking
+
+DOCUMENT = "\n\n".join(
+    f"REQ-{number:03d} The system shall record event {number} in the audit log with a timestamp."
+    for number in range(1, 9)
+)
+
+
+def test_closing_the_stream_cancels_pending_chunks(monkeypatch):
+    started, cancelled = [], []
+
+    async def fake_generate(chunk, domain, prior_contexts=None):
+        started.append(chunk)
+        try:
+            if len(started) > 1:
+                await asyncio.sleep(30)
+            return {"test_cases": [{"gherkin_feature": f"Feature: {chunk}\n  Scenario: S\n    Given {chunk}"}]}
+        except asyncio.CancelledError:
+            cancelled.append(chunk)
+            raise
+
+    monkeypatch.setattr(chunking, "agenerate_test_cases", fake_generate)
+
+    async def consume_one():
+        stream = chunking.astream_test_cases_chunked(DOCUMENT, "Healthcare", max_parallel=2, max_chars=100)
+        first = await stream.__anext__()
+        await stream.aclose()
+        for _ in range(3):
+            await asyncio.sleep(0)
+        # Checked before asyncio.run tears the loop down and cancels whatever is left
+        return first, len(started), len(cancelled)
+
+    first, started_count, cancelled_count = asyncio.run(consume_one())
+    assert first["test_id"] == "TC-001"
+    # Chunks still calling the model were stopped and the rest never started
+    assert started_count < len(chunking.split_requirement_document(DOCUMENT, 100))
+    assert cancelled_count == started_count - 1
+
+
+def test_stream_uses_prior_contexts_like_the_non_streaming_path(monkeypatch):
+    calls = []
+
+    async def fake_generate(chunk, domain, prior_contexts=None):
+        calls.append(prior_contexts)
+        return {"test_cases": [{"gherkin_feature": f"Feature: {chunk}\n  Scenario: S\n    Given {chunk}"}]}
+
+    monkeypatch.setattr(chunking, "agenerate_test_cases", fake_generate)
+    prior = [{"context_id": "ctx_1"}]
+
+    async def collect(max_chars):
+        stream = chunking.astream_test_cases_chunked(DOCUMENT, "Healthcare", max_chars=max_chars, prior_contexts=prior)
+        return [tc async for tc in stream]
+
+    asyncio.run(collect(max_chars=len(DOCUMENT)))
+    assert calls == [prior]
+    # Retrieved for the whole document, so not shown to individual chunks
+    calls.clear()
+    asyncio.run(collect(max_chars=100))
+    assert len(calls) > 1 and all(contexts is None for contexts in calls)
+
+
+def _test_case(gherkin):
+    return {"test_id": "TC_001", "gherkin_feature": gherkin}
+
+
+def test_merge_drops_scenarios_repeated_under_another_feature():
+    first = _test_case("Feature: Audit logging\n  Scenario: Record login\n    Given a user\n    When they log in\n    Then an audit entry is written")
+    repeated = _test_case("Feature: Security events\n\n  Scenario:  Record login\n    Given a user\n    When  they log in\n    Then an audit entry is written")
+    partly_new = _test_case(
+        "Feature: Security events\n"
+        "  Scenario: Record login\n    Given a user\n    When they log in\n    Then an audit entry is written\n\n"
+        "  Scenario: Record logout\n    Given a user\n    When they log out\n    Then an audit entry is written"
+    )
+
+    merged = chunking.merge_chunk_results([{"test_cases": [first]}, {"test_cases": [repeated, partly_new]}])
+
+    assert [tc["test_id"] for tc in merged["test_cases"]] == ["TC-001", "TC-002"]
+    kept = merged["test_cases"][1]["gherkin_feature"]
+    assert kept.startswith("Feature: Security events")
+    assert "Scenario: Record logout" in kept
+    assert "Scenario: Record login" not in kept
+
+
+def test_merge_keeps_scenarios_with_different_steps():
+    login = _test_case("Feature: A\n  Scenario: Login\n    Given a user\n    When they log in")
+    locked = _test_case("Feature: A\n  Scenario: Login\n    Given a locked user\n    When they log in")
+    merged = chunking.merge_chunk_results([{"test_cases": [login]}, {"test_cases": [locked]}])
+    assert len(merged["test_cases"]) == 2
@@ -0,0 +1,25 @@
+from core.context_store import JSONContextStore
+
+
+def _context(context_id):
+    return {"context_id": context_id, "requirement_text": "REQ-001", "domain": "Healthcare",
+            "metadata": {}, "created_at": "2026-01-01T00:00:00", "version": 1}
+
+
+def test_append_after_torn_journal_line_is_not_lost(tmp_path):
+    store = JSONContextStore(str(tmp_path), fsync_interval=0)
+    store.create(_context("ctx_1"))
+    store.append_update("ctx_1", {"step": 1}, "2026-01-01T00:00:01")
+
+    # A writer crashed halfway through its line
+    with open(tmp_path / "ctx_1.journal", "ab") as f:
+        f.write(b'{"op": "update", "entry": {"timest')
+
+    store.append_update("ctx_1", {"step": 2}, "2026-01-01T00:00:02")
+    store.append_feedback("ctx_1", {"rating": 5}, "2026-01-01T00:00:03")
+
+    context = JSONContextStore(str(tmp_path)).load("ctx_1")
+    assert [update["info"]["step"] for update in context["updates"]] == [1, 2]
+    assert context["version"] == 3
+    assert context["feedback"][0]["feedback"] == {"rating": 5}
+    assert store.revision("ctx_1") == 3
@@ -0,0 +1,105 @@
+import json
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+
+import docx
+import pytest
+
+from core.export_manager import ExportManager
+
+TEST_CASES = 10000
+
+
+def _test_case(i):
+    return {
+        "test_id": f"TC_{i:05d}",
+        "requirement_source": f"REQ-{i:05d} The system shall log access to record {i}.",
+        "gherkin_feature": f"Feature: Audit {i}\n  Scenario: Access is logged\n    Given a clinician\n"
+                           f"    When they open record {i}\n    Then an audit entry is written\n",
+        "compliance_assessment": {"status": "Compliant", "reasoning": "Covers the audit trail requirement. " * 5},
+        "compliance_tags": ["HIPAA", "FDA 21 CFR Part 11"],
+        "risk_and_priority": {"score": i % 10, "reasoning": "Audit gaps are reportable. " * 5}
+    }
+
+
+def _test_cases(count):
+    return (_test_case(i) for i in range(count))
+
+
+def _in_memory_json(test_cases):
+    """The previous export path: the whole document built with json.dumps."""
+    test_cases = list(test_cases)
+    return json.dumps({"test_cases": test_cases, "total_tests": len(test_cases)}, indent=2)
+
+
+def _in_memory_xml(test_cases):
+    """The previous export path: an ElementTree of every test case, indented and serialized at once."""
+    root = ET.Element("testcases", version="1.0")
+    for tc in list(test_cases):
+        element = ET.SubElement(root, "testcase", id=tc["test_id"])
+        ET.SubElement(element, "requirement").text = tc["requirement_source"]
+        ET.SubElement(element, "gherkin").text = tc["gherkin_feature"]
+        compliance = ET.SubElement(element, "compliance", status=tc["compliance_assessment"]["status"])
+        tags = ET.SubElement(compliance, "tags")
+        for tag in tc["compliance_tags"]:
+            ET.SubElement(tags, "tag").text = tag
+        ET.SubElement(element, "risk", score=str(tc["risk_and_priority"]["score"]))
+    tree = ET.ElementTree(root)
+    ET.indent(tree, space="  ")
+    return ET.tostring(root, encoding="unicode")
+
+
+def _peak_memory(func, *args):
+    tracemalloc.start()
+    try:
+        func(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+@pytest.mark.parametrize("format, in_memory", [("json", _in_memory_json), ("xml", _in_memory_xml)])
+def test_streaming_export_peak_memory_is_flat(tmp_path, format, in_memory):
+    path = str(tmp_path / f"export.{format}")
+    quarter_peak = _peak_memory(ExportManager().export, _test_cases(TEST_CASES // 4), format, path)
+    streamed_peak = _peak_memory(ExportManager().export, _test_cases(TEST_CASES), format, path)
+    in_memory_peak = _peak_memory(in_memory, _test_cases(TEST_CASES))
+    print(f"{format}: streamed peak {quarter_peak / 2**20:.1f} MiB ({TEST_CASES // 4} tests), "
+          f"{streamed_peak / 2**20:.1f} MiB ({TEST_CASES} tests), in-memory peak {in_memory_peak / 2**20:.1f} MiB")
+
+    # Four times the test cases without more memory, while the old path grows with the export
+    assert streamed_peak < 1.5 * quarter_peak
+    assert streamed_peak * 5 < in_memory_peak
+
+
+def test_streamed_json_matches_test_cases(tmp_path):
+    path = str(tmp_path / "export.json")
+    ExportManager().export(_test_cases(100), "json", path)
+    with open(path, encoding="utf-8") as f:
+        exported = json.load(f)
+    assert exported["test_cases"] == list(_test_cases(100))
+    assert exported["total_tests"] == 100
+
+
+def test_docx_export_renders_every_test_case():
+    count = 1000
+    document = docx.Document(ExportManager().render(_test_cases(count), "docx"))
+
+    assert len(document.tables) == count
+    headings = [p.text for p in document.paragraphs if p.text.startswith("Test ID:")]
+    assert headings == [f"Test ID: TC_{i:05d}" for i in range(count)]
+    assert document.tables[-1].cell(0, 1).text == _test_case(count - 1)["requirement_source"]
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("count", [1000, 10000])
+def test_docx_export_render_time(count):
+    started = time.perf_counter()
+    buffer = ExportManager().render(_test_cases(count), "docx")
+    elapsed = time.perf_counter() - started
+    print(f"docx: {count} test cases in {elapsed:.2f}s, {len(buffer.getvalue()) / 2**20:.1f} MiB")
+
+    # About a millisecond per test case at most
+    assert elapsed < count / 1000
+    assert len(docx.Document(buffer).tables) == count
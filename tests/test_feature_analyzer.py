@@ -0,0 +1,80 @@
+import json
+
+import pytest
+
+import core.feature_analyzer as feature_analyzer
+from core.cache import ResponseCache
+
+FULL_ANALYSIS = {
+    "overall_coverage_score": 60,
+    "missing_features": [{"feature": "Audit log", "severity": "high", "reason": "r", "recommended_test_type": "t"}],
+    "compliance_gaps": [],
+    "recommendations": ["Add audit tests"],
+    "priority_actions": []
+}
+DELTA_ANALYSIS = {
+    "overall_coverage_score": 80,
+    "resolved_features": ["Audit log"],
+    "missing_features": [{"feature": "Export", "severity": "low", "reason": "r", "recommended_test_type": "t"}],
+    "recommendations": ["Add export tests"]
+}
+
+
+class FakeModel:
+    prompts = []
+
+    def __init__(self, name):
+        pass
+
+    def generate_content(self, prompt):
+        FakeModel.prompts.append(prompt)
+        analysis = DELTA_ANALYSIS if "PREVIOUS ANALYSIS" in prompt else FULL_ANALYSIS
+        return type("Response", (), {"text": json.dumps(analysis)})()
+
+
+@pytest.fixture
+def model(monkeypatch):
+    FakeModel.prompts = []
+    monkeypatch.setattr(feature_analyzer.genai, "GenerativeModel", FakeModel)
+    cache = ResponseCache()
+    monkeypatch.setattr(feature_analyzer, "get_response_cache", lambda: cache)
+    return FakeModel
+
+
+def _tests(count, prefix="TC"):
+    return [{"test_id": f"{prefix}_{i:03d}", "requirement_source": f"REQ-{i:03d}",
+             "gherkin_feature": f"Feature: F{i}\n  Scenario: S{i}\n    Given step {i}"} for i in range(count)]
+
+
+def test_renumbered_tests_hit_the_cache(model):
+    first = feature_analyzer.analyze_feature_gaps("REQ text", _tests(10), "Healthcare")
+    again = feature_analyzer.analyze_feature_gaps("REQ text", list(reversed(_tests(10, prefix="TEST"))), "Healthcare")
+    assert len(model.prompts) == 1
+    assert again == first
+
+
+def test_small_change_is_analyzed_incrementally_and_merged(model):
+    feature_analyzer.analyze_feature_gaps("REQ text", _tests(10), "Healthcare")
+    changed = _tests(10, prefix="NEW")[1:] + [{"test_id": "NEW_X", "requirement_source": "REQ-100",
+                                                 "gherkin_feature": "Feature: Audit\n  Scenario: Log"}]
+    analysis = feature_analyzer.analyze_feature_gaps("REQ text", changed, "Healthcare")
+
+    assert analysis["analysis_mode"] == "incremental"
+    assert analysis["delta"] == {"added_tests": 1, "removed_tests": 1}
+    assert [feature["feature"] for feature in analysis["missing_features"]] == ["Export"]
+    assert analysis["recommendations"] == ["Add audit tests", "Add export tests"]
+    # Only the changed tests were sent
+    assert "REQ-100" in model.prompts[1] and "REQ-005" not in model.prompts[1]
+
+
+def test_incremental_result_does_not_keep_stale_baseline_fields(model, monkeypatch):
+    monkeypatch.setitem(FULL_ANALYSIS, "coverage_summary", "Audit logging is untested")
+    feature_analyzer.analyze_feature_gaps("REQ text", _tests(10), "Healthcare")
+    changed = _tests(10)[1:] + [{"test_id": "TC_X", "requirement_source": "REQ-100",
+                                 "gherkin_feature": "Feature: Audit\n  Scenario: Log"}]
+    analysis = feature_analyzer.analyze_feature_gaps("REQ text", changed, "Healthcare")
+
+    assert analysis["analysis_mode"] == "incremental"
+    assert analysis["overall_coverage_score"] == 80
+    assert "coverage_summary" not in analysis
+    assert "resolved_features" not in analysis
@@ -0,0 +1,66 @@
+import xml.etree.ElementTree as ET
+
+from core.export_manager import ExportManager
+from core.gherkin import parse_gherkin
+
+FEATURE = """# generated for REQ-001
+@smoke
+Feature: Login
+  Users log in with their credentials.
+
+  Background:
+    Given the app is open
+
+  # happy path
+  @fast
+  Scenario: Valid login
+    Only active accounts can log in.
+    Given a registered user
+    When they log in
+    Then they see the dashboard
+
+  Rule: Lockout
+    Background:
+      Given 3 failed attempts
+
+    Scenario: Locked account
+      When they try again
+      Then the account is locked
+"""
+
+
+def test_feature_renders_as_written():
+    [feature] = parse_gherkin(FEATURE)
+    assert feature.render() == FEATURE
+    assert [scenario.title for scenario in feature.scenarios] == ["Scenario: Valid login", "Scenario: Locked account"]
+    assert [step.text for step in feature.scenarios[0].steps] == ["a registered user", "they log in", "they see the dashboard"]
+
+
+def test_scenario_keeps_comments_description_and_rule():
+    [feature] = parse_gherkin(FEATURE)
+    first, second = feature.scenarios
+
+    first_text = feature.render_scenario(first)
+    assert "# happy path" in first_text
+    assert "Only active accounts can log in." in first_text
+    assert "Rule: Lockout" not in first_text
+
+    second_text = feature.render_scenario(second)
+    assert second_text.startswith("# generated for REQ-001\n@smoke\nFeature: Login")
+    assert "  Rule: Lockout\n    Background:\n      Given 3 failed attempts" in second_text
+    assert "Then the account is locked" in second_text
+
+
+def test_exports_emit_generated_text_verbatim():
+    test_cases = [{"test_id": "TC_001", "gherkin_feature": FEATURE}, {"test_id": "TC_002", "gherkin_feature": FEATURE}]
+    assert ExportManager().export(test_cases, "gherkin") == FEATURE + "\n\n" + FEATURE
+
+
+def test_xml_export_runs_feature_then_rule_background():
+    xml = ExportManager().export([{"test_id": "TC_001", "gherkin_feature": FEATURE}], "xml")
+    root = ET.fromstring(xml)
+    steps = {scenario.get("name"): [step.text for step in scenario.iter("step")] for scenario in root.iter("scenario")}
+    assert steps == {
+        "Valid login": ["the app is open", "a registered user", "they log in", "they see the dashboard"],
+        "Locked account": ["the app is open", "3 failed attempts", "they try again", "the account is locked"]
+    }
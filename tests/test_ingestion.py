@@ -0,0 +1,167 @@
+import io
+import os
+import time
+import tracemalloc
+
+import pytest
+from fastapi.testclient import TestClient
+from reportlab.pdfgen import canvas
+
+import app as app_module
+import core.document_cache as document_cache
+import core.ingestion as ingestion
+from core.document_cache import DocumentCache
+from core.ingestion import iter_requirement_segments
+
+PDF_PAGES = 300
+
+
+def _xml_document(requirements):
+    body = "".join(
+        f"<requirement id='REQ-{i}'><title>Requirement {i}</title>"
+        f"<text>The system shall process record {i}.</text></requirement>"
+        for i in range(requirements)
+    )
+    return f"<srs><intro>Scope</intro>{body}</srs>".encode()
+
+
+def _timed_segments(source, filename=None):
+    """(segments, seconds to the first segment, seconds in total)"""
+    started = time.perf_counter()
+    segments = iter_requirement_segments(source, filename)
+    first = next(segments)
+    first_at = time.perf_counter() - started
+    segments = [first, *segments]
+    return segments, first_at, time.perf_counter() - started
+
+
+def _serial_segments(monkeypatch, source, filename=None):
+    """_timed_segments with page-parallel extraction turned off."""
+    with monkeypatch.context() as patch:
+        patch.setenv("PDF_PARALLEL_MIN_PAGES", str(PDF_PAGES + 1))
+        return _timed_segments(source, filename)
+
+
+@pytest.fixture(scope="module")
+def large_pdf(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("ingestion") / "srs.pdf")
+    pdf = canvas.Canvas(path)
+    for page in range(PDF_PAGES):
+        for line in range(40):
+            pdf.drawString(72, 800 - line * 18, f"REQ-{page:03d}.{line:02d} The system shall record audit event {line}.")
+        pdf.showPage()
+    pdf.save()
+    return path
+
+
+class RecordingExecutor:
+    """Wraps the process pool, recording each submitted page range and the order results are awaited in."""
+
+    def __init__(self, executor):
+        self.executor = executor
+        self.submitted = []
+        self.awaited = []
+
+    def submit(self, func, *args):
+        index = len(self.submitted)
+        self.submitted.append(args)
+        return _RecordedFuture(self.executor.submit(func, *args), lambda: self.awaited.append(index))
+
+
+class _RecordedFuture:
+    def __init__(self, future, on_result):
+        self._future = future
+        self._on_result = on_result
+
+    def result(self):
+        self._on_result()
+        return self._future.result()
+
+    def cancel(self):
+        return self._future.cancel()
+
+
+@pytest.fixture
+def recording_executor(monkeypatch):
+    executor = RecordingExecutor(ingestion.get_process_executor())
+    monkeypatch.setattr(ingestion, "get_process_executor", lambda: executor)
+    return executor
+
+
+def _peak_memory(document):
+    tracemalloc.start()
+    try:
+        count = sum(1 for _ in iter_requirement_segments(io.BytesIO(document), "srs.xml"))
+        return count, tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def test_xml_texts_in_document_order():
+    document = b"<a>intro<b>first</b><c>second<d>third</d></c></a>"
+    assert list(iter_requirement_segments(io.BytesIO(document), "srs.xml")) == ["intro", "first", "second", "third"]
+
+
+def test_xml_memory_does_not_grow_with_document_size():
+    small_count, small_peak = _peak_memory(_xml_document(5000))
+    large_count, large_peak = _peak_memory(_xml_document(50000))
+    assert (small_count, large_count) == (1 + 2 * 5000, 1 + 2 * 50000)
+    # Ten times the elements, but closed elements are released as the parse goes
+    assert large_peak < 2 * small_peak
+
+
+def test_large_pdf_pages_stream_in_order(large_pdf, monkeypatch, recording_executor):
+    serial, _, _ = _serial_segments(monkeypatch, large_pdf)
+    segments = iter_requirement_segments(large_pdf)
+    first = next(segments)
+    # Downstream generation gets the first page before later page ranges are waited for
+    assert recording_executor.awaited == [0]
+    parallel = [first, *segments]
+
+    assert len(parallel) == PDF_PAGES
+    assert parallel == serial
+    assert all(f"REQ-{page:03d}.00" in text for page, text in enumerate(parallel))
+    assert recording_executor.awaited == list(range(len(recording_executor.submitted)))
+
+
+@pytest.mark.benchmark
+def test_large_pdf_first_page_arrives_early(large_pdf, monkeypatch):
+    _, _, serial_seconds = _serial_segments(monkeypatch, large_pdf)
+    _, first_at, parallel_seconds = _timed_segments(large_pdf)
+    print(f"{PDF_PAGES} pages: serial {serial_seconds:.2f}s, parallel {parallel_seconds:.2f}s, "
+          f"first page after {first_at:.2f}s")
+
+    assert first_at < parallel_seconds / 4
+
+
+@pytest.mark.benchmark
+@pytest.mark.skipif((os.cpu_count() or 1) < 4, reason="page-parallel speedup needs several cores")
+def test_large_pdf_parallel_extraction_is_faster(large_pdf, monkeypatch):
+    _, _, serial_seconds = _serial_segments(monkeypatch, large_pdf)
+    _, _, parallel_seconds = _timed_segments(large_pdf)
+    assert parallel_seconds < serial_seconds * 0.6
+
+
+def test_uploaded_pdf_is_extracted_in_the_process_pool(large_pdf, monkeypatch, tmp_path, recording_executor):
+    serial, _, _ = _serial_segments(monkeypatch, large_pdf)
+    received = {}
+
+    async def generate_from_segments(segments, domain, max_parallel=None):
+        received["segments"] = list(segments)
+        return {"test_cases": []}
+
+    monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+    monkeypatch.setattr(document_cache, "get_document_cache", lambda: DocumentCache(str(tmp_path / "cache")))
+    monkeypatch.setattr(app_module, "agenerate_test_cases_from_segments", generate_from_segments)
+
+    with open(large_pdf, "rb") as handle:
+        response = TestClient(app_module.app).post(
+            "/api/generate", files={"requirement_file": ("srs.pdf", handle, "application/pdf")})
+
+    assert response.status_code == 200
+    assert received["segments"] == serial
+    # The upload stays in memory, so it is spilled to one temp file for the workers and removed after
+    submitted = recording_executor.submitted
+    assert len(submitted) == -(-PDF_PAGES // ingestion.get_pdf_pages_per_task())
+    assert len({path for path, _, _ in submitted}) == 1
+    assert not os.path.exists(submitted[0][0])
@@ -0,0 +1,113 @@
+import asyncio
+import json
+import time
+import uuid
+
+import httpx
+import pytest
+
+from core.logic import acreate_github_issues, acreate_gitlab_issues
+from core.sync_ledger import SyncLedger
+
+REQUEST_LATENCY = 0.02
+TEST_CASES = 500
+MAX_CONCURRENCY = 16
+
+
+class StubIssueServer:
+    """Creates issues after REQUEST_LATENCY seconds, optionally rate limiting or rejecting some requests."""
+
+    def __init__(self, rate_limited=0, rejected_titles=()):
+        self.rate_limited = rate_limited
+        self.rejected_titles = set(rejected_titles)
+        self.requests = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.next_number = 0
+
+    async def handle(self, request):
+        self.requests += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(REQUEST_LATENCY)
+        finally:
+            self.in_flight -= 1
+        if self.rate_limited > 0:
+            self.rate_limited -= 1
+            return httpx.Response(429, headers={"Retry-After": "0"}, json={"message": "Rate limited"})
+        if json.loads(request.content)["title"] in self.rejected_titles:
+            return httpx.Response(422, json={"message": "Validation Failed"})
+        self.next_number += 1
+        return httpx.Response(201, json={"number": self.next_number, "iid": self.next_number})
+
+    def client(self):
+        return httpx.AsyncClient(transport=httpx.MockTransport(self.handle))
+
+
+def _test_cases(count):
+    return [{"test_id": f"TC_{i:04d}", "requirement_source": f"REQ-{i:04d}",
+             "gherkin_feature": f"Feature: F{i}\n  Scenario: S{i}\n    Given step {i}"} for i in range(count)]
+
+
+def _sync_github(server, test_cases, tmp_path):
+    async def run():
+        async with server.client() as client:
+            return await acreate_github_issues({"token": uuid.uuid4().hex}, test_cases, "owner", "repo", client=client,
+                                               max_concurrency=MAX_CONCURRENCY,
+                                               ledger=SyncLedger(str(tmp_path / "ledger.db")))
+    started = time.perf_counter()
+    results = asyncio.run(run())
+    return results, time.perf_counter() - started
+
+
+def _sync_gitlab(server, test_cases, tmp_path):
+    async def run():
+        async with server.client() as client:
+            return await acreate_gitlab_issues({"url": "https://gitlab.test", "token": uuid.uuid4().hex},
+                                               test_cases, "42", client=client, max_concurrency=MAX_CONCURRENCY,
+                                               ledger=SyncLedger(str(tmp_path / "ledger.db")))
+    started = time.perf_counter()
+    results = asyncio.run(run())
+    return results, time.perf_counter() - started
+
+
+def test_github_sync_of_500_test_cases_runs_concurrently(tmp_path):
+    server = StubIssueServer()
+    results, _ = _sync_github(server, _test_cases(TEST_CASES), tmp_path)
+
+    assert [result["test_id"] for result in results] == [f"TC_{i:04d}" for i in range(TEST_CASES)]
+    assert all(result["status"] == "created" and result["error"] is None for result in results)
+    assert len({result["number"] for result in results}) == TEST_CASES
+    assert server.requests == TEST_CASES
+    assert server.peak_in_flight == MAX_CONCURRENCY
+
+
+def test_gitlab_sync_of_500_test_cases_runs_concurrently(tmp_path):
+    server = StubIssueServer()
+    results, _ = _sync_gitlab(server, _test_cases(TEST_CASES), tmp_path)
+
+    assert [result["test_id"] for result in results] == [f"TC_{i:04d}" for i in range(TEST_CASES)]
+    assert all(result["status"] == "created" for result in results)
+    assert len({result["iid"] for result in results}) == TEST_CASES
+    assert server.requests == TEST_CASES
+    assert server.peak_in_flight == MAX_CONCURRENCY
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("provider, sync", [("GitHub", _sync_github), ("GitLab", _sync_gitlab)])
+def test_sync_of_500_test_cases_beats_sequential_requests(tmp_path, provider, sync):
+    _, elapsed = sync(StubIssueServer(), _test_cases(TEST_CASES), tmp_path)
+    print(f"{provider}: {TEST_CASES} issues in {elapsed:.2f}s (sequential floor {TEST_CASES * REQUEST_LATENCY:.0f}s)")
+
+    assert elapsed < TEST_CASES * REQUEST_LATENCY / 4
+
+
+def test_rate_limited_requests_are_retried_and_failures_reported(tmp_path):
+    server = StubIssueServer(rate_limited=5, rejected_titles={"Test Case: TC_0003"})
+    results, _ = _sync_github(server, _test_cases(20), tmp_path)
+
+    assert server.requests == 20 + 5
+    assert [result["status"] for result in results] == ["created"] * 3 + ["failed"] + ["created"] * 16
+    assert "Validation Failed" in results[3]["error"]
+    assert results[3]["number"] is None
@@ -0,0 +1,109 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from jira import JIRA
+
+from core.logic import create_jira_issues
+from core.sync_ledger import SyncLedger
+
+REQUEST_LATENCY = 0.01
+SCENARIOS = 150
+
+
+class MockJiraHandler(BaseHTTPRequestHandler):
+    """Answers Jira's issue and bulk-create endpoints after REQUEST_LATENCY seconds."""
+
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        time.sleep(REQUEST_LATENCY)
+        with server.lock:
+            server.requests.append(self.path)
+            if self.path.endswith("/issue/bulk") and server.rate_limited > 0:
+                server.rate_limited -= 1
+                return self._reply(429, {"errorMessages": ["Rate limited"]}, {"Retry-After": "0"})
+            updates = body["issueUpdates"] if self.path.endswith("/issue/bulk") else [body]
+            issues = []
+            for _ in updates:
+                server.next_id += 1
+                issues.append({"id": str(server.next_id), "key": f"TEST-{server.next_id}",
+                               "self": f"{server.url}/rest/api/2/issue/{server.next_id}"})
+        if self.path.endswith("/issue/bulk"):
+            return self._reply(201, {"issues": issues, "errors": []})
+        return self._reply(201, issues[0])
+
+    def _reply(self, status, payload, headers=None):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def jira_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MockJiraHandler)
+    server.lock = threading.Lock()
+    server.requests = []
+    server.rate_limited = 0
+    server.next_id = 0
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _client(server):
+    return JIRA(server=server.url, basic_auth=("user", "token"), get_server_info=False, max_retries=0)
+
+
+def _test_cases(scenarios, per_feature=10):
+    test_cases = []
+    for feature in range(scenarios // per_feature):
+        steps = "\n".join(
+            f"  Scenario: Record audit event {feature}.{i}\n    Given a user\n    Then event {i} is logged"
+            for i in range(per_feature)
+        )
+        test_cases.append({"test_id": f"TC_{feature:03d}", "gherkin_feature": f"Feature: Audit {feature}\n{steps}"})
+    return test_cases
+
+
+def test_bulk_create_is_ten_times_faster_than_per_issue_calls(jira_server, tmp_path):
+    client = _client(jira_server)
+
+    started = time.perf_counter()
+    for i in range(SCENARIOS):
+        client.create_issue(fields={"project": {"key": "TEST"}, "summary": f"Scenario {i}",
+                                    "issuetype": {"name": "Task"}}, prefetch=False)
+    sequential_seconds = time.perf_counter() - started
+
+    jira_server.requests.clear()
+    started = time.perf_counter()
+    keys = create_jira_issues(client, _test_cases(SCENARIOS), "TEST", ledger=SyncLedger(str(tmp_path / "ledger.db")))
+    bulk_seconds = time.perf_counter() - started
+    print(f"{SCENARIOS} issues: per-issue {sequential_seconds:.2f}s, bulk {bulk_seconds:.2f}s")
+
+    assert len(keys) == len(set(keys)) == SCENARIOS
+    assert len(jira_server.requests) == SCENARIOS // 50
+    assert bulk_seconds * 10 <= sequential_seconds
+
+
+def test_bulk_create_retries_rate_limited_batches(jira_server, tmp_path):
+    jira_server.rate_limited = 2
+
+    keys = create_jira_issues(_client(jira_server), _test_cases(100), "TEST",
+                              ledger=SyncLedger(str(tmp_path / "ledger.db")))
+
+    assert len(keys) == 100
+    assert jira_server.requests.count("/rest/api/2/issue/bulk") == 2 + 2
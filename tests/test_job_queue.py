@@ -0,0 +1,147 @@
+import asyncio
+import time
+
+import pytest
+
+import core.job_queue as job_queue
+from core.job_queue import JOB_COMPLETED, JOB_RUNNING, JobLeaseLostError, JobQueue, JobStore
+
+
+def test_live_lease_is_not_recovered_but_expired_lease_is(tmp_path):
+    db_path = str(tmp_path / "jobs.db")
+    first, second = JobStore(db_path), JobStore(db_path)
+    job_id = first.create({"requirement_text": "REQ-001"})
+
+    assert first.claim(job_id, "worker-a", lease_seconds=0.2)
+    assert job_id not in second.pending_job_ids()
+    assert not second.claim(job_id, "worker-b", lease_seconds=0.2)
+
+    time.sleep(0.3)
+    assert second.pending_job_ids() == [job_id]
+    assert second.claim(job_id, "worker-b", lease_seconds=60)
+    # The first worker lost its lease: it can neither renew nor overwrite the job
+    assert not first.renew(job_id, "worker-a", lease_seconds=60)
+    assert not first.update(job_id, status=JOB_COMPLETED, owner="worker-a")
+    assert second.get(job_id)["status"] == JOB_RUNNING
+
+
+def test_worker_survives_store_errors(tmp_path, monkeypatch):
+    store = JobStore(str(tmp_path / "jobs.db"))
+    failures = {"left": 1}
+    claim = store.claim
+
+    def flaky_claim(*args):
+        if failures["left"]:
+            failures["left"] -= 1
+            raise RuntimeError("database is locked")
+        return claim(*args)
+
+    async def fake_job(job_id, request, store, owner=None, context_id=None):
+        return {"test_cases": [{"test_id": request["requirement_text"]}]}
+
+    monkeypatch.setattr(store, "claim", flaky_claim)
+    monkeypatch.setattr(job_queue, "run_generation_job", fake_job)
+
+    async def scenario():
+        queue = JobQueue(store, workers=1, lease_seconds=0.3)
+        await queue.start()
+        first = await queue.submit({"requirement_text": "first"})
+        second = await queue.submit({"requirement_text": "second"})
+        for _ in range(100):
+            if store.get(second)["status"] == JOB_COMPLETED:
+                break
+            await asyncio.sleep(0.02)
+        # The first job hit the store error; the sweep re-enqueues it once it is still queued
+        for _ in range(100):
+            if store.get(first)["status"] == JOB_COMPLETED:
+                break
+            await asyncio.sleep(0.02)
+        await queue.stop()
+        return store.get(first), store.get(second)
+
+    first, second = asyncio.run(scenario())
+    assert second["status"] == JOB_COMPLETED
+    assert first["status"] == JOB_COMPLETED
+    assert first["result"] == {"test_cases": [{"test_id": "first"}]}
+
+
+def test_partial_results_are_written_in_batches(tmp_path, monkeypatch):
+    store = JobStore(str(tmp_path / "jobs.db"))
+    job_id = store.create({"requirement_text": "REQ-001"})
+    result_writes = []
+    update = store.update
+
+    def counting_update(job_id, **fields):
+        if fields.get("result") is not None:
+            result_writes.append(len(fields["result"]["test_cases"]))
+        return update(job_id, **fields)
+
+    async def fake_stream(requirement_text, domain, prior_contexts=None):
+        for i in range(25):
+            yield {"test_id": f"TC_{i:03d}"}
+
+    monkeypatch.setattr(store, "update", counting_update)
+    monkeypatch.setattr(job_queue, "configure_ai", lambda: None)
+    monkeypatch.setattr(job_queue, "astream_test_cases", fake_stream)
+
+    request = {"requirement_text": "REQ-001", "use_prior_contexts": False}
+    result = asyncio.run(job_queue.run_generation_job(job_id, request, store))
+
+    assert len(result["test_cases"]) == 25
+    assert result_writes == [10, 20, 25]
+    assert len(store.get(job_id)["result"]["test_cases"]) == 25
+
+
+def test_worker_that_lost_its_lease_stops_writing_progress(tmp_path, monkeypatch):
+    store = JobStore(str(tmp_path / "jobs.db"))
+    job_id = store.create({"requirement_text": "REQ-001"})
+    assert store.claim(job_id, "worker-a", lease_seconds=0.1)
+    time.sleep(0.2)
+    assert store.claim(job_id, "worker-b", lease_seconds=60)
+    assert store.update(job_id, result={"test_cases": [{"test_id": "TC_B"}]}, owner="worker-b")
+
+    async def fake_stream(requirement_text, domain, prior_contexts=None):
+        for i in range(25):
+            yield {"test_id": f"TC_A{i:03d}"}
+
+    monkeypatch.setattr(job_queue, "configure_ai", lambda: None)
+    monkeypatch.setattr(job_queue, "astream_test_cases", fake_stream)
+
+    request = {"requirement_text": "REQ-001", "use_prior_contexts": False}
+    with pytest.raises(JobLeaseLostError):
+        asyncio.run(job_queue.run_generation_job(job_id, request, store, owner="worker-a"))
+    assert store.get(job_id)["result"] == {"test_cases": [{"test_id": "TC_B"}]}
+
+
+def test_retried_job_reuses_its_context(tmp_path, monkeypatch):
+    store = JobStore(str(tmp_path / "jobs.db"))
+    job_id = store.create({"requirement_text": "REQ-001"})
+    created = []
+    attempts = {"count": 0}
+
+    class FakeContextManager:
+        def create_context(self, requirement_text, domain):
+            created.append(requirement_text)
+            return f"ctx_{len(created)}"
+
+        def record_test_cases(self, context_id, test_cases):
+            pass
+
+    async def flaky_stream(requirement_text, domain, prior_contexts=None):
+        attempts["count"] += 1
+        if attempts["count"] == 1:
+            raise RuntimeError("worker died")
+        yield {"test_id": "TC_001"}
+
+    monkeypatch.setattr(job_queue, "configure_ai", lambda: None)
+    monkeypatch.setattr(job_queue, "astream_test_cases", flaky_stream)
+    monkeypatch.setattr(job_queue, "get_context_manager", FakeContextManager)
+
+    request = {"requirement_text": "REQ-001", "create_context": True, "use_prior_contexts": False}
+    with pytest.raises(RuntimeError):
+        asyncio.run(job_queue.run_generation_job(job_id, request, store))
+    context_id = store.get(job_id)["context_id"]
+    result = asyncio.run(job_queue.run_generation_job(job_id, request, store, context_id=context_id))
+
+    assert created == ["REQ-001"]
+    assert result["context_id"] == context_id == "ctx_1"
@@ -0,0 +1,37 @@
+from core.context_manager import ContextManager
+from core.retrieval import BM25Index, tokenize
+
+
+def test_tokenize_keeps_negations_modals_and_numbers():
+    tokens = tokenize("The system must not store more than 5 records")
+    assert "must" in tokens
+    assert "not" in tokens
+    assert "5" in tokens
+
+
+def test_negated_or_changed_requirement_is_not_identical():
+    index = BM25Index()
+    index.add("a", "The system must encrypt patient data at rest")
+    index.add("b", "Session times out after 5 minutes of inactivity")
+
+    [(_, _, negated)] = index.search("The system must not encrypt patient data at rest", limit=1)
+    [(_, _, changed)] = index.search("Session times out after 30 minutes of inactivity", limit=1)
+    [(_, _, same)] = index.search("Session times out after 5 minutes of inactivity", limit=1)
+
+    assert negated < 0.9
+    assert changed < 0.9
+    assert same == 1.0
+
+
+def test_only_exact_requirement_text_is_reused(tmp_path):
+    manager = ContextManager(str(tmp_path))
+    context_id = manager.create_context("Session times out after 5 minutes of inactivity", "Healthcare")
+    manager.record_test_cases(context_id, [{"test_id": "TC_001"}])
+
+    match, prior = manager.retrieve_prior_work("Session times out after 30 minutes of inactivity", "Healthcare")
+    assert match is None
+    assert [context["context_id"] for context in prior] == [context_id]
+
+    match, _ = manager.retrieve_prior_work("Session  times out after 5 minutes\nof inactivity", "Healthcare")
+    assert match is not None
+    assert match["context_id"] == context_id
@@ -0,0 +1,61 @@
+import random
+import time
+
+import pytest
+
+from core.traceability import build_traceability_matrix
+
+REQUIREMENTS = 1000
+TEST_CASES = 5000
+
+
+def _corpus(seed=7):
+    """A document of REQUIREMENTS numbered requirements and TEST_CASES tests tracing them by ID or by paraphrase."""
+    rng = random.Random(seed)
+    vocabulary = ["".join(rng.choice("bcdfghjklmnprstvz") + rng.choice("aeiou") for _ in range(3)) for _ in range(4000)]
+    requirement_words = [rng.sample(vocabulary, 8) for _ in range(REQUIREMENTS)]
+    document = "\n".join(f"REQ-{i:04d} The system shall {' '.join(words)}." for i, words in enumerate(requirement_words))
+
+    test_cases, expected = [], {}
+    for t in range(TEST_CASES):
+        i = t % REQUIREMENTS
+        # Odd tests name their requirement; even ones only paraphrase part of it
+        source = f"REQ-{i:04d}" if t % 2 else " ".join(rng.sample(requirement_words[i], 5))
+        test_cases.append({"test_id": f"TC_{t:05d}", "requirement_source": source})
+        expected[f"TC_{t:05d}"] = f"REQ-{i:04d}"
+    return document, test_cases, expected
+
+
+def test_large_matrix_links_every_test():
+    document, test_cases, expected = _corpus()
+    matrix = build_traceability_matrix(document, test_cases)
+
+    assert matrix["total_requirements"] == REQUIREMENTS
+    assert matrix["coverage_percentage"] == 100.0
+    assert matrix["unmapped_test_cases"] == []
+    links = [(test["test_id"], row["requirement_id"])
+             for row in matrix["traceability_mapping"] for test in row["related_test_cases"]]
+    assert sorted(links) == sorted(expected.items())
+
+
+@pytest.mark.benchmark
+def test_large_matrix_builds_in_under_a_second():
+    document, test_cases, _ = _corpus()
+
+    started = time.perf_counter()
+    build_traceability_matrix(document, test_cases)
+    elapsed = time.perf_counter() - started
+    print(f"{REQUIREMENTS} requirements x {TEST_CASES} tests in {elapsed:.2f}s")
+
+    assert elapsed < 1.0
+
+
+def test_unrelated_tests_stay_unmapped():
+    matrix = build_traceability_matrix(
+        "REQ-1 The system shall encrypt patient records at rest.\n"
+        "REQ-2 The system shall export audit logs as CSV files.",
+        [{"test_id": "TC_001", "requirement_source": "Patient records are encrypted at rest"},
+         {"test_id": "TC_002", "requirement_source": "Dashboard colour theme"}]
+    )
+    assert [row["coverage_status"] for row in matrix["traceability_mapping"]] == ["Covered", "Not Covered"]
+    assert matrix["unmapped_test_cases"] == ["TC_002"]